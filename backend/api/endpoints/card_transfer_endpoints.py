@@ -15,6 +15,8 @@ from typing import List, Optional
 
 from api.security.auth import jwt_auth
 from apps.sale.models import SalePayment
+from apps.sale.services.payment.payment_service import PaymentService
+from apps.user.services.permission_registry import has_perm
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 from ninja import Router, Schema
@@ -73,8 +75,8 @@ def list_card_transfers(
     - limit: Max number of transfers to return (default: 50)
     """
     # Check permission - only superusers or users with specific permission can view
-    if not request.auth.is_superuser and not request.auth.has_perm(
-        "sale.view_card_transfers"
+    if not request.auth.is_superuser and not has_perm(
+        request.auth, "sale.view_card_transfers"
     ):
         raise PermissionDenied("You don't have permission to view card transfers")
 
@@ -160,8 +162,8 @@ def confirm_card_transfer(request, transfer_id: int):
     Only superusers or users with specific permission can confirm transfers.
     """
     # Check permission
-    if not request.auth.is_superuser and not request.auth.has_perm(
-        "sale.confirm_card_transfers"
+    if not request.auth.is_superuser and not has_perm(
+        request.auth, "sale.confirm_card_transfers"
     ):
         raise PermissionDenied("You don't have permission to confirm card transfers")
 
@@ -181,8 +183,7 @@ def confirm_card_transfer(request, transfer_id: int):
         )
 
     # Confirm the transfer
-    payment.confirmed = True
-    payment.save(update_fields=["confirmed"])
+    PaymentService.set_confirmed(payment, True)
 
     return ConfirmTransferResponse(
         id=payment.pk,
@@ -226,8 +227,7 @@ def unconfirm_card_transfer(request, transfer_id: int):
         )
 
     # Unconfirm the transfer
-    payment.confirmed = False
-    payment.save(update_fields=["confirmed"])
+    PaymentService.set_confirmed(payment, False)
 
     return ConfirmTransferResponse(
         id=payment.pk,
@@ -263,8 +263,8 @@ def bulk_confirm_card_transfers(request, payload: BulkTransferRequest):
     No second confirmation dialog needed.
     """
     # Check permission
-    if not request.auth.is_superuser and not request.auth.has_perm(
-        "sale.confirm_card_transfers"
+    if not request.auth.is_superuser and not has_perm(
+        request.auth, "sale.confirm_card_transfers"
     ):
         raise PermissionDenied("You don't have permission to confirm card transfers")
 
@@ -282,8 +282,7 @@ def bulk_confirm_card_transfers(request, payload: BulkTransferRequest):
 
     for transfer in transfers:
         if not transfer.confirmed:
-            transfer.confirmed = True
-            transfer.save(update_fields=["confirmed"])
+            PaymentService.set_confirmed(transfer, True)
             success_count += 1
         else:
             failed_count += 1  # Already confirmed
@@ -329,8 +328,7 @@ def bulk_unconfirm_card_transfers(request, payload: BulkTransferRequest):
 
     for transfer in transfers:
         if transfer.confirmed:
-            transfer.confirmed = False
-            transfer.save(update_fields=["confirmed"])
+            PaymentService.set_confirmed(transfer, False)
             success_count += 1
         else:
             failed_count += 1  # Already unconfirmed
@@ -119,24 +119,28 @@ def get_extra_products(request):
     - Lazy-loaded: Only fetched when needed
     - Lightweight: Only id, name, price fields
     - Filtered: Only active RAW/PROCESSED products
+    - Batch-priced: a handful of queries regardless of catalogue size
 
     Returns:
         list[ProductExtraSchema]: Available extra products
     """
-    extras = (
+    extras = list(
         Product.objects.filter(
             type__in=[Product.ProductType.RAW, Product.ProductType.PROCESSED],
             is_active=True,
         )
         .order_by("name")
-        .values("id", "name", "last_purchased_price")
+        .only("id", "name", "active_recipe", "last_purchased_price")
     )
 
+    # Priced together: settings, FIFO heads and recipes are read once
+    prices = MenuItemService.extra_req_prices(extras)
+
     return [
         ProductExtraSchema(
-            id=extra["id"],
-            name=extra["name"],
-            price=MenuItemService.extra_req_price(extra["id"])[0],
+            id=extra.pk,
+            name=extra.name,
+            price=prices[extra.pk][0],
         )
         for extra in extras
     ]
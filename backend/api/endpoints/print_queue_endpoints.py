@@ -3,16 +3,24 @@ Print Queue API Endpoints
 
 Provides endpoints for managing the print queue
 - POST /print-queue/ - Add a print job to the queue.
-- GET /print-queue/pending/ - Get pending print jobs (for cafe PC monitoring).
+- GET /print-queue/pending/{bar,kitchen}/ - Get pending print jobs.
+- GET /print-queue/wait/{bar,kitchen}/ - Long-poll until pending jobs exist.
+- POST /print-queue/claim/{bar,kitchen}/ - Lease a batch of jobs to one agent.
+- POST /print-queue/ack/{bar,kitchen}/ - Settle an agent's claimed jobs in one call.
+- GET /print-queue/{id}/escpos/ - Ready-to-send ESC/POS bytes of a job.
 - PUT /print-queue/{id}/printed/ - Mark a print job as printed
 - PUT /print-queue/{id}/failed/ - Mark a print job as failed
 - DELETE /print-queue/{id}/ - Delete a print job.
 """
 
-from typing import List
+from typing import List, Literal
 
 from api.schemas.print_queue_schemas import (
     ErrorResponse,
+    PrintJobAckRequest,
+    PrintJobAckResponse,
+    PrintJobClaimRequest,
+    PrintJobClaimResponse,
     PrintJobCreateRequest,
     PrintJobResponse,
     PrintJobUpdateResponse,
@@ -20,8 +28,11 @@ from api.schemas.print_queue_schemas import (
 from api.security.auth import jwt_auth
 from apps.sale.models import PrintQueue, Sale
 from apps.sale.policies import require_printer
+from apps.sale.services import PrintQueueService
+from apps.sale.services.print_queue import ReceiptRenderer
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from ninja import Router
+from ninja import Query, Router
 
 router = Router(tags=["Print Queue"], auth=jwt_auth)
 
@@ -39,9 +50,10 @@ def create_print_job(request, payload: PrintJobCreateRequest):
     if payload.sale_id:
         sale = get_object_or_404(Sale, id=payload.sale_id)
 
-    # Create print job
-    print_job = PrintQueue.objects.create(
+    # Create print job (wakes waiting agents on commit)
+    print_job = PrintQueueService.enqueue(
         sale=sale,
+        printer_target=payload.printer_target,
         print_type=payload.print_type,
         print_data=payload.print_data,
     )
@@ -61,24 +73,102 @@ def create_print_job(request, payload: PrintJobCreateRequest):
 def get_bar_jobs(request):
     require_printer(request.auth, "bar")
 
-    jobs = PrintQueue.objects.filter(
-        status=PrintQueue.PrintStatus.PENDING,
-        printer_target=PrintQueue.PrinterTarget.BAR,
-    ).order_by("created_at")
-
-    return jobs
+    return PrintQueueService.pending(PrintQueue.PrinterTarget.BAR)
 
 
 @router.get("/pending/kitchen/", response=List[PrintJobResponse])
 def get_kitchen_jobs(request):
     require_printer(request.auth, "kitchen")
 
-    jobs = PrintQueue.objects.filter(
-        status=PrintQueue.PrintStatus.PENDING,
-        printer_target=PrintQueue.PrinterTarget.KITCHEN,
-    ).order_by("created_at")
+    return PrintQueueService.pending(PrintQueue.PrinterTarget.KITCHEN)
+
+
+@router.get("/wait/{printer}/", response=List[PrintJobResponse])
+def wait_for_jobs(
+    request,
+    printer: Literal["bar", "kitchen"],
+    after: int = 0,
+    timeout: int = Query(25, ge=1, le=55),
+):
+    """
+    Long-poll for pending jobs of one printer.
+
+    Returns pending jobs with ``id > after`` as soon as there are any,
+    otherwise blocks until a job is queued or ``timeout`` seconds pass
+    (then returns ``[]``). Agents pass the last id they received as
+    ``after`` and call again immediately.
+    """
+    require_printer(request.auth, printer)
+
+    return PrintQueueService.wait_for_jobs(
+        PrintQueue.PrinterTarget(printer.upper()), after_id=after, timeout=timeout
+    )
+
+
+@router.post("/claim/{printer}/", response=List[PrintJobClaimResponse])
+def claim_jobs(
+    request, printer: Literal["bar", "kitchen"], payload: PrintJobClaimRequest
+):
+    """
+    Lease a batch of jobs to one printer agent.
+
+    Safe with several agents per printer: each job goes to exactly one of
+    them. Jobs not acknowledged within ``lease_seconds`` are handed out
+    again. With ``wait`` > 0 blocks while nothing is claimable.
+    """
+    require_printer(request.auth, printer)
+
+    return PrintQueueService.claim(
+        PrintQueue.PrinterTarget(printer.upper()),
+        agent=payload.agent,
+        limit=payload.limit,
+        lease_seconds=payload.lease_seconds,
+        timeout=payload.wait,
+    )
+
+
+@router.post("/ack/{printer}/", response=PrintJobAckResponse)
+def acknowledge_jobs(
+    request, printer: Literal["bar", "kitchen"], payload: PrintJobAckRequest
+):
+    """
+    Mark an agent's claimed jobs as printed / failed in one request.
+
+    Counts only jobs of this printer the agent still holds; jobs whose
+    lease expired and were re-claimed are left to their new holder.
+    """
+    require_printer(request.auth, printer)
+
+    result = PrintQueueService.acknowledge(
+        PrintQueue.PrinterTarget(printer.upper()),
+        agent=payload.agent,
+        printed=payload.printed,
+        failed={f.id: f.error_message for f in payload.failed},
+    )
+    return {"printed": result.printed, "failed": result.failed}
+
+
+@router.get("/{job_id}/escpos/", response={404: ErrorResponse, 422: ErrorResponse})
+def get_job_escpos(
+    request, job_id: int, width: Literal[32, 48] = 48, codepage: str = "cp864"
+):
+    """
+    Rendered receipt for a job, as raw ESC/POS bytes.
+
+    Agents write the body straight to the printer. ``width`` is the
+    printer's column count (48 for 80 mm paper, 32 for 58 mm).
+    """
+    print_job = get_object_or_404(
+        PrintQueue.objects.select_related("sale__table"), id=job_id
+    )
+    require_printer(request.auth, print_job.printer_target)
+
+    try:
+        payload = ReceiptRenderer.render_job(print_job, width=width, codepage=codepage)
+    except ValueError as exc:
+        return 422, {"detail": str(exc)}
 
-    return jobs
+    return HttpResponse(payload, content_type="application/octet-stream")
 
 
 @router.put(
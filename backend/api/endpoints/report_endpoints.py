@@ -5,15 +5,19 @@ Endpoints:
 - POST /report/create - Create a new daily report
 - GET /report/{id} - Get report details
 - GET /report/ - List all reports
+- GET /report/range - Totals of a week / month / Jalali month (JSON, CSV, XLSX)
 - POST /report/{id}/sync - Modify a draft report
 - POST /report/{id}/approve - Approve a report
 """
 
-from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+from typing import List, Literal, Optional
 
 from api.schemas.report_schemas import (
     CreateReportRequest,
     CreateReportResponse,
+    RangeReportResponse,
     ReportDetailsResponse,
     SyncDailyReportRequest,
 )
@@ -29,9 +33,19 @@ from apps.sale.services.report.create_daily_report_service import (
 from apps.sale.services.report.modify_daily_report_service import (
     ModifyDailyReportService,
 )
+from apps.sale.services.report.range_report_service import COLUMNS, RangeReportService
+from apps.utils.tabular_export import (
+    CSV_CONTENT_TYPE,
+    XLSX_CONTENT_TYPE,
+    stream_csv,
+    stream_xlsx,
+)
 from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from ninja import Router, Schema
+from ninja import Query, Router, Schema
 
 router = Router(tags=["Reports"], auth=jwt_auth)
 
@@ -115,11 +129,11 @@ def get_report_details(request, report_id: int):
     except PermissionDenied as e:
         return 422, {"detail": str(e)}
 
-    report = get_object_or_404(DailyReport, id=report_id)
+    report = get_object_or_404(DailyReport.objects.with_details(), id=report_id)
 
     return ReportDetailsResponse(
         report_date=report.jalali_report_date,
-        creator=report.created_by.get_full_name() or report.created_by.username,
+        creator=report.created_by.get_full_name() or report.created_by.mobile,
         status=report.status,
         opening_float=report.opening_float,
         closing_cash_counted=report.closing_cash_counted,
@@ -132,7 +146,7 @@ def get_report_details(request, report_id: int):
         total_expenses=report.total_expenses,
         notes=report.notes,
         approved_by=(
-            report.approved_by.get_full_name() or report.approved_by.username
+            report.approved_by.get_full_name() or report.approved_by.mobile
             if report.approved_by
             else None
         ),
@@ -167,7 +181,15 @@ def list_reports(request, status: Optional[str] = None, limit: int = 30):
     except PermissionDenied as e:
         return 422, {"detail": str(e)}
 
-    qs = DailyReport.objects.select_related("created_by").order_by("-report_date")
+    qs = (
+        DailyReport.objects.select_related("created_by")
+        .annotate(
+            variance_total=Coalesce(
+                Sum("payment_methods__variance"), Value(Decimal("0.0000"))
+            )
+        )
+        .order_by("-report_date")
+    )
 
     if status:
         qs = qs.filter(status=status.upper())
@@ -179,9 +201,9 @@ def list_reports(request, status: Optional[str] = None, limit: int = 30):
             id=report.pk,
             report_date=report.jalali_report_date,
             status=report.status,
-            created_by=report.created_by.get_full_name() or report.created_by.username,
+            created_by=report.created_by.get_full_name() or report.created_by.mobile,
             total_revenue=str(report.total_revenue),
-            total_variance=str(report.total_variance),
+            total_variance=str(report.variance_total),
         )
         for report in qs
     ]
@@ -189,6 +211,63 @@ def list_reports(request, status: Optional[str] = None, limit: int = 30):
     return ReportListResponse(reports=reports, total_count=len(reports))
 
 
+# ---------------------------------------------------------------------
+# Range Report
+# ---------------------------------------------------------------------
+
+
+@router.get("/range", response={200: RangeReportResponse, 422: ErrorResponse})
+def range_report(
+    request,
+    period: Optional[Literal["week", "month", "jalali_month"]] = None,
+    anchor: Optional[date] = Query(None, alias="date"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    export: Literal["json", "csv", "xlsx"] = Query("json", alias="format"),
+):
+    """
+    Financial totals over several business days.
+
+    Query params:
+    - period: week (Saturday to Friday), month or jalali_month
+    - date: Any day inside the period (default: today)
+    - start / end: Explicit range instead of a period (max 366 days)
+    - format: json (totals + days), csv or xlsx (one row per day, streamed)
+    """
+    try:
+        can_view_daily_report(request.auth)
+        date_range = RangeReportService.resolve_range(
+            period=period, anchor=anchor, start=start, end=end
+        )
+        RangeReportService.prepare(date_range)
+    except PermissionDenied as e:
+        return 422, {"detail": str(e)}
+    except ValidationError as e:
+        return 422, {"detail": str(e)}
+
+    if export == "json":
+        return RangeReportResponse(
+            start=date_range.start,
+            end=date_range.end,
+            totals=RangeReportService.totals(date_range),
+            days=list(RangeReportService.iter_days(date_range)),
+        )
+
+    header = [label for _key, label in COLUMNS]
+    rows = RangeReportService.iter_table(date_range)
+    if export == "csv":
+        response = StreamingHttpResponse(
+            stream_csv(header, rows), content_type=CSV_CONTENT_TYPE
+        )
+    else:
+        response = StreamingHttpResponse(
+            stream_xlsx(header, rows), content_type=XLSX_CONTENT_TYPE
+        )
+    filename = f"report-{date_range.start}-{date_range.end}.{export}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 # ---------------------------------------------------------------------
 # Modify Draft Report
 # ---------------------------------------------------------------------
@@ -7,7 +7,9 @@
 # 5. Extract permission checks into decorator functions
 # 6. Add comprehensive docstrings for all endpoints
 
-from typing import Dict, List, Set
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Tuple
 
 from api.schemas.sale_schemas import (
     AddPaymentsRequest,
@@ -17,20 +19,18 @@ from api.schemas.sale_schemas import (
     CloseSaleRequest,
     CloseSaleResponse,
     ErrorResponse,
-    ExtraDetailSchema,
     OpenSaleRequest,
     OpenSaleResponse,
     PaymentDetailExtendedSchema,
     SaleDashboardItemSchema,
     SaleDashboardResponse,
     SaleDetailResponse,
-    SaleItemDetailSchema,
     SyncSaleRequest,
 )
 from api.security.auth import jwt_auth
 from apps.inventory.models import Product, Table
 from apps.menu.models import Menu
-from apps.sale.models import Sale, SaleItem
+from apps.sale.models import Sale
 from apps.sale.policies import (
     can_cancel_sale,
     can_modify_sale,
@@ -42,11 +42,14 @@ from apps.sale.services.sale.cancel_sale import CancelSaleService
 from apps.sale.services.sale.close_sale import CloseSaleService
 from apps.sale.services.sale.modify_sale import ModifySaleService
 from apps.sale.services.sale.open_sale import OpenSaleService
+from apps.sale.services.sale.sale_detail import REVENUE_FIELDS, SaleDetailService
+from apps.user.services.permission_registry import has_perm
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django_ratelimit.decorators import ratelimit
-from ninja import Router
+from ninja import Query, Router
 
 User = get_user_model()
 router = Router(tags=["Sales"], auth=jwt_auth)
@@ -78,7 +81,8 @@ def open_sale(request, payload: OpenSaleRequest):
 
     # Bulk Fetch (2 DB Queries total, regardless of item count)
     menus_map = {
-        m.pk: m for m in Menu.objects.filter(id__in=menu_ids).select_related("name")
+        m.pk: m
+        for m in Menu.objects.filter(id__in=menu_ids).select_related("name", "category")
     }
     products_map = {p.pk: p for p in Product.objects.filter(id__in=extra_product_ids)}
 
@@ -137,7 +141,8 @@ def sync_sale_items(request, sale_id: int, payload: SyncSaleRequest):
     - Optionally updating sale_type, table_id, guest_id, guest_count
     """
 
-    sale = get_object_or_404(Sale, id=sale_id)
+    sale = get_object_or_404(Sale.objects.select_related("table"), id=sale_id)
+    previous_table = sale.table  # for the table-move line of edit tickets
 
     can_modify_sale(request.auth, sale)
 
@@ -181,12 +186,24 @@ def sync_sale_items(request, sale_id: int, payload: SyncSaleRequest):
 
         if metadata_updated:
             sale.modified_by = request.auth
-            sale.save()
+            sale.save(
+                update_fields=[
+                    "sale_type",
+                    "table",
+                    "guest",
+                    "guest_count",
+                    "modified_by",
+                    "updated_at",
+                ]
+            )
 
         # We pass the Schema directly. The Service handles the efficient
         # bulk fetching and mapping internally.
         updated_sale = ModifySaleService.sync_items(
-            sale=sale, items_payload=payload.items, performer=request.auth
+            sale=sale,
+            items_payload=payload.items,
+            performer=request.auth,
+            previous_table=previous_table,
         )
     except ValidationError as e:
         return 422, {"detail": e.messages}
@@ -204,228 +221,61 @@ def get_sale_detail(request, sale_id: int):
     Fetches the full structure of a Sale.
     - Resolves hierarchical relationships (Parents vs Extras).
     - Maps underlying Products back to Menu IDs for the UI.
-    - Optimized to run in minimal DB queries (O(1)).
+    - CLOSED sales are served from their stored snapshot (one query).
     """
     can_see_sale_details(request.auth)
 
-    # 1. Fetch Sale with all necessary relations
-    #    - select_related: Follows ForeignKeys (Single object)
-    #    - prefetch_related: Follows Reverse Relations (Many objects)
-    sale = get_object_or_404(
-        Sale.objects.select_related(
-            "table",
-            "guest",
-            "opened_by",
-            "modified_by",
-            "closed_by",
-            "canceled_by",
-        ).prefetch_related(
-            "items",
-            "items__product",  # Fetch product details for names/prices
-            "items__payment_records",  # Fetch payment records for quantity tracking
-            "items__payment_records__payment",  # Fetch related payment for status check
-            "payments",  # Fetch payments
-            "payments__destination_account",  # Fetch payment account details
-            "payments__received_by",  # Fetch payment received by staff
-            "payments__payment_items",  # Fetch through model for item quantities
-        ),
-        id=sale_id,
-    )
-
-    # 2. Separation of Concerns: Split Items into Parents and Children
-    all_items: List[SaleItem] = list(sale.items.all())
-
-    # 2.5 Calculate paid quantities for each item
-    item_paid_quantities: Dict[int, int] = {}
-    for item in all_items:
-        paid_qty = sum(
-            pr.quantity_paid
-            for pr in item.payment_records.all()
-            if pr.payment.status == "COMPLETED"
-        )
-        item_paid_quantities[item.pk] = paid_qty
-
-    parents: List[SaleItem] = [i for i in all_items if i.parent_item_id is None]
-    children: List[SaleItem] = [i for i in all_items if i.parent_item_id is not None]
-
-    # 3. Lookup Strategy: Map Products -> Menu IDs
-    #    We collect all Product IDs from parent items to find which Menu they belong to.
-    parent_product_ids: Set[int] = {p.product_id for p in parents}
-
-    #    Fetch only the ID and Name_ID (Product FK) to keep query light.
-    #    Logic: "Find Menus where the 'name' (Product) matches our items"
-    menu_lookup_qs = Menu.objects.filter(name_id__in=parent_product_ids).values(
-        "id", "name_id"
-    )
-
-    #    Create Dictionary: { product_id: menu_id }
-    product_to_menu_map: Dict[int, int] = {
-        entry["name_id"]: entry["id"] for entry in menu_lookup_qs
-    }
-
-    # 4. Construction: Build the Response Hierarchy
-    response_items = []
-
-    for parent in parents:
-        # Find extras belonging to this specific parent
-        my_extras = [
-            ExtraDetailSchema(
-                id=child.pk,
-                product_id=child.product.id,
-                product_name=child.product.name,
-                quantity=child.quantity,
-                unit_price=child.unit_price,
-                total=child.quantity * child.unit_price,
-            )
-            for child in children
-            if child.parent_item.id == parent.pk
-        ]
+    try:
+        detail = SaleDetailService.get(sale_id)
+    except Sale.DoesNotExist:
+        raise Http404
 
-        # Resolve the Menu ID
-        linked_menu_id = product_to_menu_map.get(parent.product.id)
-
-        # Calculate paid quantities
-        qty_paid = item_paid_quantities.get(parent.pk, 0)
-        qty_remaining = parent.quantity - qty_paid
-
-        response_items.append(
-            SaleItemDetailSchema(
-                id=parent.pk,
-                menu_id=linked_menu_id,
-                product_name=parent.product.name,
-                quantity=parent.quantity,
-                unit_price=parent.unit_price,
-                total=parent.quantity * parent.unit_price,
-                extras=my_extras,
-                quantity_paid=qty_paid,
-                quantity_remaining=qty_remaining,
-            )
-        )
+    # COGS & revenue only with permission
+    if not has_perm(request.auth, "sale.view_revenue_data"):
+        detail = {**detail, **dict.fromkeys(REVENUE_FIELDS)}
 
-    # 5. Build payment history with extended details
-    payment_list = []
-    for payment in sale.payments.all():
-        # Get covered items with quantities from through model
-        covered_items = [
-            {"item_id": pi.sale_item_id, "quantity_paid": pi.quantity_paid}
-            for pi in payment.payment_items.all()
-        ]
-        # Keep covered_item_ids for backwards compatibility
-        covered_item_ids = [ci["item_id"] for ci in covered_items]
+    return detail
 
-        payment_data = PaymentDetailExtendedSchema(
-            id=payment.pk,
-            method=payment.method,
-            amount_total=payment.amount_total,
-            amount_applied=payment.amount_applied,
-            tip_amount=payment.tip_amount,
-            destination_account_id=(
-                payment.destination_account.pk if payment.destination_account else None
-            ),
-            destination_card_number=(
-                payment.destination_account.card_number
-                if payment.destination_account
-                else None
-            ),
-            destination_account_owner=(
-                payment.destination_account.account_owner
-                if payment.destination_account
-                else None
-            ),
-            destination_bank_name=(
-                payment.destination_account.bank_name
-                if payment.destination_account
-                else None
-            ),
-            received_by_name=payment.received_by.get_full_name()
-            or payment.received_by.username,
-            received_at=payment.received_at,
-            status=payment.status,
-            covered_items=covered_items,
-            covered_item_ids=covered_item_ids,
-        )
-        payment_list.append(payment_data)
-
-    # 6. Check permissions for revenue data
-    can_view_revenue = request.auth.has_perm("sale.view_revenue_data")
-
-    # 7. Build response with conditional COGS data
-    response_data = {
-        # ---- Sale Metadata ----
-        "id": sale.pk,
-        "state": sale.state,
-        "sale_type": sale.sale_type,
-        "table_id": sale.table.id if sale.table else None,
-        "table_name": sale.table.name if sale.table else None,
-        "guest_id": sale.guest_id,
-        "guest_name": (
-            sale.guest.get_full_name() or sale.guest.username if sale.guest else None
-        ),
-        "guest_count": sale.guest_count,
-        "note": sale.note,
-        "opened_at": sale.opened_at,
-        "opened_by_name": sale.opened_by.get_full_name() or sale.opened_by.username,
-        "modified_by_name": (
-            sale.modified_by.get_full_name() or sale.modified_by.username
-            if sale.modified_by
-            else None
-        ),
-        # ---- Financial Data ----
-        "subtotal_amount": sale.subtotal_amount,
-        "discount_amount": sale.discount_amount,
-        "tax_amount": sale.tax_amount,
-        "total_amount": sale.total_amount,
-        # ---- Invoice Data (when CLOSED) ----
-        "payment_status": sale.payment_status if sale.is_closed else None,
-        "closed_at": sale.closed_at,
-        "closed_by_name": (
-            sale.closed_by.get_full_name() or sale.closed_by.username
-            if sale.closed_by
-            else None
-        ),
-        # ---- Payment Tracking (always show - needed for payment page) ----
-        "total_paid": sale.total_paid,
-        "balance_due": sale.balance_due,
-        "is_fully_paid": sale.is_fully_paid,
-        # ---- COGS & Revenue (only if has permission) ----
-        "total_cost": sale.total_cost if can_view_revenue else None,
-        "gross_profit": sale.gross_profit if can_view_revenue else None,
-        "gross_margin_percent": sale.gross_margin_percent if can_view_revenue else None,
-        # ---- Cancellation (when CANCELED) ----
-        "canceled_at": sale.canceled_at,
-        "canceled_by_name": (
-            sale.canceled_by.get_full_name() or sale.canceled_by.username
-            if sale.canceled_by
-            else None
-        ),
-        "cancel_reason": sale.cancel_reason,
-        # ---- Items ----
-        "items": response_items,
-        # ---- Payments ----
-        "payments": payment_list,
-    }
 
-    return response_data
+def _encode_cursor(sale: Sale) -> str:
+    raw = f"{sale.opened_at.isoformat()}|{sale.pk}"
+    return urlsafe_b64encode(raw.encode()).decode()
 
 
-@router.get("/", response=SaleDashboardResponse)
-def sale_dashboard(request, state: str = None):
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        opened_at, pk = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(opened_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid cursor")
+
+
+@router.get("/", response={200: SaleDashboardResponse, 422: ErrorResponse})
+def sale_dashboard(
+    request,
+    state: str = None,
+    cursor: str = None,
+    limit: int = Query(100, ge=1, le=200),
+):
     """
     Operational Dashboard: Lists sales filtered by state.
 
     Query Parameters:
         state: Filter by sale state (OPEN, CLOSED, CANCELED). Default: OPEN only.
                Pass 'all' to see all states (requires permission).
+        cursor: ``next_cursor`` from the previous page.
+        limit: Page size.
 
     Performance:
-    - O(1) Queries: Uses select_related to fetch Table and Staff info in 1 query.
+    - Single query per page: totals come from the sale ledger columns and
+      display names are annotated in SQL (see SaleQuerySet.for_dashboard).
+    - Keyset pagination on (opened_at, id), so deep pages cost the same.
     - Lightweight: Does NOT fetch line items (products/extras).
     """
     can_see_sale_list(request.auth)
 
     # 1. Base Query with optional state filter
-    #    We need Table info and the Staff member who opened it.
-    qs = Sale.objects.select_related("table", "guest", "opened_by")
+    qs = Sale.objects.for_dashboard()
 
     # Apply state filter
     if state and state.upper() == "ALL":
@@ -439,41 +289,46 @@ def sale_dashboard(request, state: str = None):
         # Default: only OPEN sales
         qs = qs.filter(state=Sale.SaleState.OPEN)
 
-    qs = qs.order_by("-opened_at")  # Newest orders first
+    # 2. Keyset pagination (newest orders first)
+    if cursor:
+        try:
+            qs = qs.before(*_decode_cursor(cursor))
+        except ValidationError as e:
+            return 422, {"detail": e.messages}
 
-    # # 2. Aggregations (Optional, but very useful for Dashboards)
-    # #    Calculates total pending revenue in database (faster than Python loop)
-    # aggregates = qs.aggregate(total_rev=Sum("total_amount"))
-    # total_revenue = aggregates["total_rev"] or Decimal("0.00")
+    # Fetch one extra row to know whether another page exists
+    page = list(qs[: limit + 1])
+    next_cursor = _encode_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
 
     # only superuser can see total_amount
     can_see_total = request.auth.is_superuser
     # 3. Serialization
-    #    We map the ORM objects to the lightweight Schema
+    #    We map the annotated rows to the lightweight Schema
     dashboard_items = [
         SaleDashboardItemSchema(
             id=sale.pk,
             state=sale.state,
-            table=sale.table.name if sale.table else None,
-            guest_name=(
-                sale.guest.get_full_name() or sale.guest.username
-                if sale.guest
-                else None
-            ),
-            total_amount=sale.total_amount if can_see_total else None,
-            opened_by_name=sale.opened_by.get_full_name() or sale.opened_by.username,
+            table=sale.table_name,
+            guest_name=sale.guest_name,
+            total_amount=sale.total_due if can_see_total else None,
+            opened_by_name=sale.opened_by_name,
             opened_at=sale.opened_at,
             # Invoice/payment data (when CLOSED)
-            payment_status=sale.payment_status if sale.is_closed else None,
-            balance_due=sale.balance_due if sale.is_closed else None,
+            payment_status=(
+                sale.payment_status if sale.state == Sale.SaleState.CLOSED else None
+            ),
+            balance_due=(
+                sale.remaining if sale.state == Sale.SaleState.CLOSED else None
+            ),
         )
-        for sale in qs
+        for sale in page
     ]
 
     return SaleDashboardResponse(
         active_sales=dashboard_items,
         total_count=len(dashboard_items),
-        # total_revenue_pending=total_revenue,
+        next_cursor=next_cursor,
     )
 
 
@@ -5,15 +5,17 @@ Defines request/response schemas for the print queue endpoints.
 """
 
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Literal, Optional
 
-from ninja import Schema
+from ninja import Field, Schema
 
 
 class PrintJobCreateRequest(Schema):
     """Request schema for creating a new print job."""
 
     sale_id: Optional[int] = None
+    # Anything else would never be matched by a printer's wait / claim
+    printer_target: Literal["BAR", "KITCHEN"]
     print_type: str  # "STANDARD" or "EDIT_DIFF"
     print_data: Dict  # JSON data matching PrintSaleData or PrintEditData interface
 
@@ -38,6 +40,37 @@ class PrintJobUpdateResponse(Schema):
     message: str
 
 
+class PrintJobClaimRequest(Schema):
+    """Request schema for leasing a batch of jobs to one printer agent."""
+
+    agent: str = Field(..., min_length=1, max_length=64)
+    limit: int = Field(20, ge=1, le=100)
+    lease_seconds: int = Field(60, ge=5, le=600)
+    wait: int = Field(0, ge=0, le=55)  # long-poll seconds while nothing is claimable
+
+
+class PrintJobClaimResponse(PrintJobResponse):
+    lease_expires_at: Optional[datetime]
+
+
+class PrintJobFailure(Schema):
+    id: int
+    error_message: str = ""
+
+
+class PrintJobAckRequest(Schema):
+    """Request schema for settling an agent's claimed jobs in one call."""
+
+    agent: str = Field(..., min_length=1, max_length=64)
+    printed: List[int] = []
+    failed: List[PrintJobFailure] = []
+
+
+class PrintJobAckResponse(Schema):
+    printed: int
+    failed: int
+
+
 class ErrorResponse(Schema):
     """Generic error response."""
 
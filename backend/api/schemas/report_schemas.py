@@ -1,6 +1,6 @@
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from ninja import Schema
 
@@ -67,3 +67,37 @@ class SyncDailyReportRequest(Schema):
 
 class ApproveReportRequest(Schema):
     id: int
+
+
+class RangeReportTotals(Schema):
+    """
+    Financial totals of a range of business days.
+    """
+
+    sales_count: int
+    gross_sales: Decimal
+    discounts: Decimal
+    tax: Decimal
+    total_sales: Decimal
+    total_refunds: Decimal
+    net_revenue: Decimal
+    cogs: Decimal
+    gross_profit: Decimal
+    expenses: Decimal
+    cash_net: Decimal
+    pos_net: Decimal
+    card_transfer_net: Decimal
+    card_transfer_confirmed: Decimal
+    tips: Decimal
+
+
+class RangeReportDay(RangeReportTotals):
+    business_date: date
+    jalali_date: str
+
+
+class RangeReportResponse(Schema):
+    start: date
+    end: date
+    totals: RangeReportTotals
+    days: List[RangeReportDay]
@@ -179,6 +179,8 @@ class SaleDashboardResponse(Schema):
 
     active_sales: List[SaleDashboardItemSchema]
     total_count: int
+    # Opaque keyset cursor; pass back as ?cursor= to fetch the next page
+    next_cursor: Optional[str] = None
     # total_revenue_pending: Decimal
 
 
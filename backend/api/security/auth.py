@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 import jwt
+from apps.user.services.permission_registry import PermissionRegistry, TokenPermissions
+from apps.user.services.principal_service import PrincipalService
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from ninja.security import HttpBearer
@@ -43,16 +45,23 @@ class JWTAuth(HttpBearer):
             if datetime.utcnow().timestamp() > payload.get("exp", 0):
                 return None
 
-            # Fetch user
-            user = User.objects.get(id=payload.get("user_id"))
+            # Fetch user (cached with its permissions, see PrincipalService)
+            user = PrincipalService.get(payload.get("user_id"))
 
             # Check if user is active
-            if not user.is_active:
+            if user is None or not user.is_active:
                 return None
 
+            # Permission snapshot: roles changed since issue -> 401, so the
+            # client refreshes and gets a token with current permissions
+            if "pv" in payload:
+                if payload["pv"] != user.permission_version:
+                    return None
+                user.token_permissions = TokenPermissions.from_claims(payload)
+
             return user
 
-        except (jwt.InvalidTokenError, User.DoesNotExist, KeyError):
+        except (jwt.InvalidTokenError, KeyError):
             return None
 
 
@@ -70,12 +79,15 @@ class TokenService:
     REFRESH_TOKEN_LIFETIME = timedelta(days=7)
 
     @staticmethod
-    def generate_access_token(user: User) -> str:
+    def generate_access_token(user: User, with_permissions: bool = True) -> str:
         """
         Creates a short-lived access token for API requests.
 
         Args:
             user: Django User instance
+            with_permissions: Embed the permission snapshot (``perms`` bitset,
+                ``su`` flag and ``pv`` version, see ``PermissionRegistry``)
+                so policies can be checked without the database
 
         Returns:
             JWT access token string
@@ -88,6 +100,9 @@ class TokenService:
             "iat": now,
             "exp": now + TokenService.ACCESS_TOKEN_LIFETIME,
         }
+        if with_permissions:
+            principal = PrincipalService.get(user.pk, fresh=True)
+            payload.update(PermissionRegistry.claims(principal))
         return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
     @staticmethod
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreSettingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core_setting"
+
+    def ready(self):
+        from . import signals  # noqa: F401
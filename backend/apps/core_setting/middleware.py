@@ -0,0 +1,15 @@
+from .services import SiteSettingsService
+
+
+class SiteSettingsSnapshotMiddleware:
+    """Pin one ``SiteSettings`` snapshot for the duration of each request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = SiteSettingsService.begin_request()
+        try:
+            return self.get_response(request)
+        finally:
+            SiteSettingsService.end_request(token)
@@ -89,7 +89,12 @@ class SiteSettings(models.Model):
 
     @classmethod
     def get(cls) -> "SiteSettings":
-        obj, _ = cls.objects.get_or_create(singleton_key="default")
+        """Shared, read-only snapshot; created with defaults on first use."""
+        from .services import SiteSettingsService
+
+        obj = SiteSettingsService.current()
+        if obj is None:
+            obj, _ = cls.objects.get_or_create(singleton_key="default")
         return obj
 
     @classmethod
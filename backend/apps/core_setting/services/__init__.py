@@ -0,0 +1,3 @@
+from .site_settings import SiteSettingsService
+
+__all__ = ("SiteSettingsService",)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from time import monotonic
+from typing import Optional, Tuple
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "core_setting:site_settings:version"
+
+# A per-process cache never hears other workers' invalidations, so there
+# the snapshot is only trusted for this many seconds
+LOCAL_SNAPSHOT_TIMEOUT = 60
+
+# (version, settings, loaded at) last loaded by this process
+_process_snapshot: Tuple[Optional[str], object, float] = (None, None, 0.0)
+
+# Per-request scope, opened by ``SiteSettingsSnapshotMiddleware``
+_request_scope: ContextVar[Optional[dict]] = ContextVar(
+    "site_settings_scope", default=None
+)
+
+
+class SiteSettingsService:
+    """
+    Read-mostly snapshot of the ``SiteSettings`` singleton.
+
+    Every process keeps the last loaded row in memory together with the
+    *version* stamp it was loaded under. The stamp lives in the shared cache
+    and is replaced whenever settings (or a bank account they point to)
+    change, so each worker reloads on its next read. Without a shared
+    cache other workers never see that stamp move, so there the snapshot
+    is also reloaded once it is ``LOCAL_SNAPSHOT_TIMEOUT`` seconds old.
+
+    Inside a request the first lookup is pinned for the rest of that
+    request: one version check per request, and a consistent view of the
+    settings while it runs.
+
+    The returned instance is shared – treat it as read-only and use
+    ``SiteSettings.get_for_update()`` to write.
+    """
+
+    # --------------------------------------------------------------------- #
+    # Public API
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def current():
+        """
+        Return the settings row, or ``None`` if it was never created.
+
+        Costs no database query when this process already holds the current
+        version.
+        """
+        scope = _request_scope.get()
+        if scope is not None and "settings" in scope:
+            return scope["settings"]
+
+        global _process_snapshot
+        version = cache.get_or_set(VERSION_KEY, SiteSettingsService._new_version, None)
+        loaded_version, site_settings, loaded_at = _process_snapshot
+        if loaded_version != version or SiteSettingsService._expired(loaded_at):
+            site_settings = SiteSettingsService._load()
+            _process_snapshot = (version, site_settings, monotonic())
+
+        if scope is not None:
+            scope["settings"] = site_settings
+        return site_settings
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Publish a new version so every process reloads.
+
+        Bumped immediately and again on commit: a worker that reloads
+        between the two would otherwise keep pre-commit data under the new
+        stamp.
+        """
+        SiteSettingsService._bump()
+        transaction.on_commit(SiteSettingsService._bump)
+
+    @staticmethod
+    def begin_request() -> Token:
+        return _request_scope.set({})
+
+    @staticmethod
+    def end_request(token: Token) -> None:
+        _request_scope.reset(token)
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _new_version() -> str:
+        return uuid4().hex
+
+    @staticmethod
+    def _expired(loaded_at: float) -> bool:
+        if settings.SHARED_CACHE:
+            return False
+        return monotonic() - loaded_at > LOCAL_SNAPSHOT_TIMEOUT
+
+    @staticmethod
+    def _bump() -> None:
+        global _process_snapshot
+        _process_snapshot = (None, None, 0.0)
+        cache.set(VERSION_KEY, SiteSettingsService._new_version(), None)
+
+    @staticmethod
+    def _load():
+        from ..models import SiteSettings
+
+        return (
+            SiteSettings.objects.select_related("default_pos_account")
+            .filter(singleton_key="default")
+            .first()
+        )
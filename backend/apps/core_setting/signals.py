@@ -0,0 +1,21 @@
+"""
+Invalidation for the cached ``SiteSettings`` snapshot.
+
+The snapshot carries the default POS account, so bank account edits count
+as settings changes too.
+"""
+
+from apps.user.models import BankAccount
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import SiteSettings
+from .services import SiteSettingsService
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+@receiver(post_save, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount)
+def invalidate_site_settings(sender, **kwargs):
+    SiteSettingsService.invalidate()
@@ -0,0 +1,97 @@
+from time import monotonic
+
+import pytest
+from apps.core_setting.models import SiteSettings
+from apps.core_setting.services import SiteSettingsService
+from apps.core_setting.services.site_settings import LOCAL_SNAPSHOT_TIMEOUT, VERSION_KEY
+from apps.core_setting.tests.factories import SiteSettingsFactory
+from apps.user.tests.factories import BankAccountFactory
+from django.core.cache import cache
+
+
+@pytest.mark.django_db
+class TestSiteSettingsSnapshot:
+    def test_warm_read_hits_no_database(self, django_assert_num_queries):
+        SiteSettingsFactory(tax_rate=9)
+        SiteSettingsService.current()
+
+        with django_assert_num_queries(0):
+            assert SiteSettings.get().tax_rate == 9
+
+    def test_missing_row(self):
+        assert SiteSettingsService.current() is None
+        assert SiteSettings.get().singleton_key == "default"
+
+    def test_save_invalidates(self):
+        settings = SiteSettingsFactory(tax_rate=9)
+        SiteSettingsService.current()
+
+        settings.tax_rate = 12
+        settings.save()
+
+        assert SiteSettingsService.current().tax_rate == 12
+
+    def test_other_process_bump_is_picked_up(self):
+        SiteSettingsFactory(tax_rate=9)
+        SiteSettingsService.current()
+
+        # Another worker wrote the row and published a new stamp
+        SiteSettings.objects.update(tax_rate=15)
+        cache.set(VERSION_KEY, "elsewhere", None)
+
+        assert SiteSettingsService.current().tax_rate == 15
+
+    def test_request_scope_pins_one_snapshot(self, django_assert_num_queries):
+        SiteSettingsFactory(tax_rate=9)
+
+        token = SiteSettingsService.begin_request()
+        try:
+            SiteSettingsService.current()
+            SiteSettings.objects.update(tax_rate=15)
+            cache.set(VERSION_KEY, "elsewhere", None)
+
+            with django_assert_num_queries(0):
+                assert SiteSettingsService.current().tax_rate == 9
+        finally:
+            SiteSettingsService.end_request(token)
+
+        assert SiteSettingsService.current().tax_rate == 15
+
+    def test_pos_account_change_invalidates(self):
+        account = BankAccountFactory()
+        SiteSettingsFactory(default_pos_account=account)
+        SiteSettingsService.current()
+
+        account.bank_name = "Renamed"
+        account.save()
+
+        assert SiteSettingsService.current().default_pos_account.bank_name == "Renamed"
+
+    def test_local_cache_snapshot_expires(self, monkeypatch, settings):
+        settings.SHARED_CACHE = False
+        SiteSettingsFactory(tax_rate=9)
+        SiteSettingsService.current()
+
+        # Another worker saved, but its stamp only moved in its own cache
+        SiteSettings.objects.update(tax_rate=15)
+        assert SiteSettingsService.current().tax_rate == 9
+
+        later = monotonic() + LOCAL_SNAPSHOT_TIMEOUT + 1
+        monkeypatch.setattr(
+            "apps.core_setting.services.site_settings.monotonic", lambda: later
+        )
+        assert SiteSettingsService.current().tax_rate == 15
+
+    def test_shared_cache_snapshot_does_not_expire(
+        self, monkeypatch, settings, django_assert_num_queries
+    ):
+        settings.SHARED_CACHE = True
+        SiteSettingsFactory(tax_rate=9)
+        SiteSettingsService.current()
+
+        later = monotonic() + LOCAL_SNAPSHOT_TIMEOUT + 1
+        monkeypatch.setattr(
+            "apps.core_setting.services.site_settings.monotonic", lambda: later
+        )
+        with django_assert_num_queries(0):
+            assert SiteSettingsService.current().tax_rate == 9
@@ -1,5 +1,6 @@
 from .adjustment_report_session import AdjustmentReportSessionAdmin
 from .expiry_purchase_item import ExpiryPurchaseItemAdmin
+from .inventory_position import InventoryPositionAdmin
 from .item_production import ItemProductionAdmin
 from .product import ProductAdmin
 from .product_adjustment_report import ProductAdjustmentReportInline
@@ -30,4 +31,5 @@ __all__ = (
     "ProductAdjustmentReportInline",
     "AdjustmentReportSessionAdmin",
     "TableAdmin",
+    "InventoryPositionAdmin",
 )
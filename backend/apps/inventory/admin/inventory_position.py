@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from ..models import InventoryPosition
+
+
+@admin.register(InventoryPosition)
+class InventoryPositionAdmin(admin.ModelAdmin):
+    """Read-only: rows are derived from Stock by InventoryPositionService."""
+
+    list_display = (
+        "product",
+        "on_hand",
+        "head_unit_price",
+        "max_unit_price",
+        "last_movement_at",
+    )
+    list_select_related = ("product",)
+    search_fields = ("product__name",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,13 +1,10 @@
-import re
-from datetime import timedelta
-
 from django import forms
 from django.contrib import admin
 from jalali_date.admin import ModelAdminJalaliMixin
 from jalali_date.widgets import AdminJalaliDateWidget
-from persiantools.jdatetime import JalaliDate
 
 from ...utils.jalali_date_list_filter import JalaliDateFieldListFilter
+from ...utils.jalali_period import parse_jalali_period
 from ..models import PurchaseInvoice
 from ..services import (
     ExpiryPurchaseItemService,
@@ -81,34 +78,10 @@ class PurchaseInvoiceAdmin(ModelAdminJalaliMixin, admin.ModelAdmin):
 
                 StockService.add_to_stock(product, price, quantity)
 
-    #
-    def _parse_jalali_range(self, term: str):
-        term = term.strip()
-        m = re.match(r"^(\d{4})(?:[\/-](\d{1,2})(?:[\/-](\d{1,2}))?)?$", term)
-        if not m:
-            return None
-        y = int(m.group(1))
-        mm = m.group(2)
-        dd = m.group(3)
-        if mm is None:
-            start = JalaliDate(y, 1, 1).to_gregorian()
-            end = JalaliDate(y + 1, 1, 1).to_gregorian()
-        elif dd is None:
-            month = int(mm)
-            start = JalaliDate(y, month, 1).to_gregorian()
-            if month == 12:
-                end = JalaliDate(y + 1, 1, 1).to_gregorian()
-            else:
-                end = JalaliDate(y, month + 1, 1).to_gregorian()
-        else:
-            start = JalaliDate(y, int(mm), int(dd)).to_gregorian()
-            end = start + timedelta(days=1)
-        return start, end
-
     def get_search_results(self, request, queryset, search_term):
         qs, use_distinct = super().get_search_results(request, queryset, search_term)
 
-        r = self._parse_jalali_range(search_term)
+        r = parse_jalali_period(search_term)
         if r:
             start, end = r
             qs |= queryset.filter(issue_date__gte=start, issue_date__lt=end)
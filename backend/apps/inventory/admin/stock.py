@@ -1,8 +1,11 @@
 from django.contrib import admin
+from django.db import transaction
+from django.utils.timezone import now
 from jalali_date.admin import ModelAdminJalaliMixin
 
 from ..forms import StockForm
 from ..models import Stock
+from ..services import InventoryPositionService
 
 
 @admin.register(Stock)
@@ -19,3 +22,23 @@ class StockAdmin(ModelAdminJalaliMixin, admin.ModelAdmin):
     ordering = ("create_at",)
     list_select_related = ("stored_product",)
     search_fields = ("stored_product__name",)
+
+    # Manual lot edits bypass StockService: rebuild the affected positions
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        old_product_id = form.initial.get("stored_product")
+        super().save_model(request, obj, form, change)
+        InventoryPositionService.refresh(
+            {obj.stored_product_id, old_product_id} - {None}, moved_at=now()
+        )
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        InventoryPositionService.refresh([obj.stored_product_id], moved_at=now())
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        product_ids = set(queryset.values_list("stored_product_id", flat=True))
+        super().delete_queryset(request, queryset)
+        InventoryPositionService.refresh(product_ids, moved_at=now())
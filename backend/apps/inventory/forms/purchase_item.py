@@ -122,10 +122,7 @@ class PurchaseItemInlineForm(forms.ModelForm):
 
             from ...core_setting.models import SiteSettings
 
-            _ratio = SiteSettings.objects.get(
-                singleton_key="default"
-            ).purchase_valid_change_ratio
-            _ratio = Decimal(_ratio)
+            _ratio = Decimal(SiteSettings.get().purchase_valid_change_ratio)
 
             if not _service.within_change_ratio(_product, _unit_price, _ratio):
                 raise ValidationError(
@@ -0,0 +1,88 @@
+"""
+Reconcile materialized inventory positions with Stock lots.
+
+Usage:
+    python manage.py inventory_positions                 # report drift
+    python manage.py inventory_positions --rebuild       # fix drift
+    python manage.py inventory_positions --product 4 7   # limit to products
+"""
+
+from apps.inventory.models import InventoryPosition, Product
+from apps.inventory.services import InventoryPositionService
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+CHECKED_FIELDS = ("on_hand", "head_unit_price", "max_unit_price")
+
+
+class Command(BaseCommand):
+    help = "Verify (and optionally rebuild) inventory positions against stock."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Overwrite drifted or missing positions with recomputed values.",
+        )
+        parser.add_argument(
+            "--product",
+            nargs="+",
+            type=int,
+            dest="product_ids",
+            help="Only check these product IDs.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of products recomputed per round trip.",
+        )
+
+    def handle(self, *args, rebuild, product_ids, batch_size, **options):
+        qs = Product.objects.filter(is_stock_traceable=True).order_by("pk")
+        if product_ids:
+            qs = qs.filter(pk__in=product_ids)
+
+        ids = list(qs.values_list("pk", flat=True))
+        drifted = 0
+        for start in range(0, len(ids), batch_size):
+            drifted += self._process(ids[start : start + batch_size], rebuild)
+
+        verb = "Rebuilt" if rebuild else "Found"
+        self.stdout.write(f"Checked {len(ids)} products. {verb} {drifted} drifted.")
+
+        if drifted and not rebuild:
+            raise CommandError(
+                "Inventory position drift detected; run with --rebuild to fix."
+            )
+
+    def _process(self, product_ids, rebuild: bool) -> int:
+        with transaction.atomic():
+            stored = InventoryPosition.objects.in_bulk(product_ids)
+            expected = InventoryPositionService.compute(product_ids)
+
+            drifted = []
+            for product_id in product_ids:
+                position = stored.get(product_id)
+                if position is None:
+                    # Rows are built lazily; only a missing row hiding stock counts
+                    if expected[product_id].on_hand:
+                        self.stdout.write(f"Product #{product_id}: missing position")
+                        drifted.append(product_id)
+                    continue
+
+                diff = {
+                    f: (getattr(position, f), getattr(expected[product_id], f))
+                    for f in CHECKED_FIELDS
+                    if getattr(position, f) != getattr(expected[product_id], f)
+                }
+                if diff:
+                    details = ", ".join(
+                        f"{f}: {s} != {e}" for f, (s, e) in diff.items()
+                    )
+                    self.stdout.write(f"Product #{product_id}: {details}")
+                    drifted.append(product_id)
+
+            if rebuild and drifted:
+                InventoryPositionService.refresh(drifted)
+        return len(drifted)
@@ -1,4 +1,5 @@
+from .purchase_invoice import PurchaseInvoiceManager
 from .stock import StockManager
 from .supplier import SupplierManager
 
-__all__ = ("SupplierManager", "StockManager")
+__all__ = ("PurchaseInvoiceManager", "SupplierManager", "StockManager")
@@ -0,0 +1,12 @@
+from django.db import models
+
+from ...utils.jalali_period import JalaliManagerMixin, JalaliQuerySetMixin
+
+
+class PurchaseInvoiceQuerySet(JalaliQuerySetMixin, models.QuerySet):
+    jalali_date_field = "issue_date"
+
+
+class PurchaseInvoiceManager(JalaliManagerMixin, models.Manager):
+    def get_queryset(self):
+        return PurchaseInvoiceQuerySet(model=self.model, using=self._db)
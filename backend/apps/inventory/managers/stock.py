@@ -18,6 +18,19 @@ class StockQuerySet(models.QuerySet):
             .select_for_update(skip_locked=True)
         )
 
+    def lock_lots(self, product_ids):
+        """
+        Lock every live lot of ``product_ids`` in one statement.
+
+        Rows are locked in a fixed (product, created_at, id) order so two
+        transactions consuming overlapping products can't deadlock.
+        """
+        return (
+            self.filter(stored_product_id__in=product_ids, remaining_quantity__gt=0)
+            .order_by("stored_product_id", "create_at", "id")
+            .select_for_update()
+        )
+
     def get_total(self, product):
         """Returns all amount of product"""
         return (
@@ -46,6 +59,9 @@ class StockManager(models.Manager):
         """
         return self.get_queryset().first_in(product=product)
 
+    def lock_lots(self, product_ids):
+        return self.get_queryset().lock_lots(product_ids)
+
     def get_total(self, product):
         return self.get_queryset().get_total(product)
 
@@ -1,5 +1,6 @@
 from .adjustment_report_session import AdjustmentReportSession
 from .expiry_purchase_item import ExpiryPurchaseItem
+from .inventory_position import InventoryPosition
 from .item_production import ItemProduction
 from .product import Product
 from .product_adjustment_report import ProductAdjustmentReport
@@ -22,6 +23,7 @@ __all__ = (
     "PurchaseItem",
     "ExpiryPurchaseItem",
     "Stock",
+    "InventoryPosition",
     "Recipe",
     "RecipeComponent",
     "ItemProduction",
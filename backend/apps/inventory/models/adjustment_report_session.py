@@ -3,7 +3,8 @@ from django.db import models
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from persiantools.jdatetime import JalaliDate
+
+from ...utils.jalali_period import format_jalali_date
 
 
 class AdjustmentReportSession(models.Model):
@@ -21,7 +22,7 @@ class AdjustmentReportSession(models.Model):
     # Property
     @cached_property
     def jalali_report_date(self):
-        return JalaliDate(self.report_date).strftime("%c", locale="fa")
+        return format_jalali_date(self.report_date)
 
     # Method
     def __str__(self) -> str:
@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class InventoryPosition(models.Model):
+    """
+    Materialized on-hand summary of a product, one row per product.
+
+    Derived from ``Stock`` and maintained by ``InventoryPositionService`` in
+    the same transaction as every stock movement, so readers never have to
+    aggregate lots.
+    """
+
+    # Fields
+    product = models.OneToOneField(
+        "inventory.Product",
+        models.CASCADE,
+        primary_key=True,
+        related_name="position",
+        verbose_name=_("Product"),
+    )
+    on_hand = models.DecimalField(
+        _("On hand"), max_digits=12, decimal_places=2, default=Decimal("0")
+    )
+    head_unit_price = models.DecimalField(
+        _("FIFO head unit price"),
+        max_digits=10,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        help_text=_("Unit price of the oldest lot with remaining quantity"),
+    )
+    max_unit_price = models.DecimalField(
+        _("Max unit price"), max_digits=10, decimal_places=4, default=Decimal("0")
+    )
+    last_movement_at = models.DateTimeField(_("Last movement"), null=True, blank=True)
+
+    # Methods
+    def __str__(self) -> str:
+        return f"{self.product}: {self.on_hand}"
+
+    # Meta
+    class Meta:
+        verbose_name = _("Inventory position")
+        verbose_name_plural = _("Inventory positions")
@@ -3,7 +3,9 @@ from django.db import models
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from persiantools.jdatetime import JalaliDate
+
+from ...utils.jalali_period import format_jalali_date
+from ..managers import PurchaseInvoiceManager
 
 
 class PurchaseInvoice(models.Model):
@@ -32,10 +34,12 @@ class PurchaseInvoice(models.Model):
         blank=True,
     )
 
+    objects = PurchaseInvoiceManager()
+
     # Property
     @cached_property
     def jalali_issue_date(self):
-        return JalaliDate(self.issue_date).strftime("%c", locale="fa")
+        return format_jalali_date(self.issue_date)
 
     @cached_property
     def total_cost(self):
@@ -1,4 +1,6 @@
+from .bill_of_materials import BillOfMaterialsService
 from .expiry_purchase_item import ExpiryPurchaseItemService
+from .inventory_position import InventoryPositionService
 from .item_production import ItemProductionService
 from .product import ProductService
 from .product_adjustment_report import ProductAdjustmentService
@@ -18,4 +20,6 @@ __all__ = (
     "RecipeComponentService",
     "ItemProductionService",
     "ProductAdjustmentService",
+    "BillOfMaterialsService",
+    "InventoryPositionService",
 )
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from ..models import RecipeComponent
+from .recipe import RecipeService
+
+BOM_VERSION_KEY = "inventory:bom:version"
+BOM_TIMEOUT = 60 * 60 * 24
+
+# A per-process cache never hears other workers' invalidations, so there
+# an entry only lives long enough to absorb bursts of stock checks
+BOM_LOCAL_TIMEOUT = 60
+
+# ``{recipe_id: [RecipeComponent, ...]}``, see ``load_components``
+ComponentsMemo = Dict[int, List[RecipeComponent]]
+
+
+class BillOfMaterialsService:
+    """
+    Exploded (flattened) bill of materials per recipe – cached.
+
+    A recipe is flattened into ``{leaf_product_id: ratio}`` where every leaf
+    is stock-traceable and ``ratio`` is the exact quantity needed per one
+    unit of output, phantoms resolved through their active recipes.
+
+    Cache entries are keyed by a global *generation* stamp. Any change to a
+    recipe, a component or a product's ``active_recipe`` /
+    ``is_stock_traceable`` bumps the stamp (see ``inventory.signals``), so a
+    change deep in a phantom chain can never leave a parent's entry stale.
+    """
+
+    # --------------------------------------------------------------------- #
+    # Public API
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def get_ratios(
+        recipe_id: int, components: Optional[ComponentsMemo] = None
+    ) -> Dict[int, Decimal]:
+        """
+        Return ``{leaf_product_id: ratio_per_unit_output}`` for a recipe.
+
+        One cache lookup when warm; otherwise the tree is walked once and
+        stored. ``components`` is a ``load_components`` memo the walk reads
+        from and adds to.
+
+        Raises:
+            ValidationError: If a phantom has no active recipe or the tree
+                contains a cycle. Failures are never cached.
+        """
+        key = BillOfMaterialsService._key(recipe_id)
+        ratios = cache.get(key)
+        if ratios is None:
+            ratios = BillOfMaterialsService.build(recipe_id, components)
+            timeout = BOM_TIMEOUT if settings.SHARED_CACHE else BOM_LOCAL_TIMEOUT
+            cache.set(key, ratios, timeout)
+        return ratios
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Drop every cached BOM by moving to a new generation.
+
+        The stamp moves now and once more when the writing transaction
+        commits, so a request that rebuilt a BOM from the pre-commit rows
+        in the meantime leaves nothing reachable behind.
+        """
+        BillOfMaterialsService._bump()
+        transaction.on_commit(BillOfMaterialsService._bump)
+
+    @staticmethod
+    def build(
+        recipe_id: int, components: Optional[ComponentsMemo] = None
+    ) -> Dict[int, Decimal]:
+        """Walk the recipe tree from the database, bypassing the cache."""
+        ratios: Dict[int, Decimal] = defaultdict(Decimal)
+        BillOfMaterialsService._explode(
+            recipe_id=recipe_id,
+            multiplier=Decimal("1"),
+            seen_recipes=set(),
+            ratios=ratios,
+            components={} if components is None else components,
+        )
+        return dict(ratios)
+
+    @staticmethod
+    def load_components(
+        recipe_ids: Iterable[int], known: Optional[ComponentsMemo] = None
+    ) -> ComponentsMemo:
+        """
+        ``{recipe_id: [component, ...]}`` (``consume_product`` loaded) in one
+        query.
+
+        ``known`` is a memo shared by several reads of one operation (e.g.
+        stock check, then pricing of the same cart): recipes already in it
+        are not fetched again, and fetched ones are added to it.
+        """
+        recipe_ids = set(recipe_ids)
+        if known is None:
+            known = {}
+
+        wanted = recipe_ids - known.keys()
+        if wanted:
+            known.update((recipe_id, []) for recipe_id in wanted)
+            for comp in RecipeComponent.objects.filter(
+                recipe_id__in=wanted
+            ).select_related("consume_product"):
+                known[comp.recipe_id].append(comp)
+        return {pk: known[pk] for pk in recipe_ids}
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _key(recipe_id: int) -> str:
+        version = cache.get_or_set(
+            BOM_VERSION_KEY, BillOfMaterialsService._new_version, None
+        )
+        return f"inventory:bom:{version}:{recipe_id}"
+
+    @staticmethod
+    def _new_version() -> str:
+        # Random, not a counter: after an eviction a restarted count would
+        # point back at old entries
+        return uuid4().hex
+
+    @staticmethod
+    def _bump() -> None:
+        cache.set(BOM_VERSION_KEY, BillOfMaterialsService._new_version(), None)
+
+    @staticmethod
+    def _explode(
+        recipe_id: int,
+        multiplier: Decimal,
+        seen_recipes: Set[int],
+        ratios: Dict[int, Decimal],
+        components: ComponentsMemo,
+    ) -> None:
+        if recipe_id in seen_recipes:
+            raise ValidationError(_("Recipe cycle detected."))
+
+        seen_recipes.add(recipe_id)
+
+        rows = BillOfMaterialsService.load_components([recipe_id], components)
+        for comp in rows[recipe_id]:
+            product = comp.consume_product
+            required = BillOfMaterialsService._exact_ratio(comp.quantity) * multiplier
+
+            if product.is_stock_traceable:
+                ratios[product.pk] += required
+            elif product.active_recipe_id is None:
+                raise ValidationError(
+                    _(f"No active recipe for phantom product: {product}")
+                )
+            else:
+                BillOfMaterialsService._explode(
+                    recipe_id=product.active_recipe_id,
+                    multiplier=required,
+                    seen_recipes=seen_recipes,
+                    ratios=ratios,
+                    components=components,
+                )
+
+        seen_recipes.remove(recipe_id)
+
+    @staticmethod
+    def _exact_ratio(raw_quantity: Decimal) -> Decimal:
+        """Map rounded thirds/sixths back to exact fractions."""
+        raw = raw_quantity.quantize(Decimal("0.001"))
+        num, den = RecipeService.FRACTION_MAP.get(raw, (None, None))
+        if num and den:
+            return Decimal(num) / Decimal(den)
+        return Decimal(raw)
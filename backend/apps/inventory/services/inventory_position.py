@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Mapping, Optional
+
+from django.utils import timezone
+
+from ..models import InventoryPosition, Product, Stock
+
+ZERO = Decimal("0")
+POSITION_FIELDS = ("on_hand", "head_unit_price", "max_unit_price", "last_movement_at")
+
+
+class InventoryPositionService:
+    """
+    Maintains and reads the ``InventoryPosition`` summary.
+
+    Rules:
+        - Writers call this service inside the transaction that moves stock.
+        - Consumers lock positions *before* lots (see ``StockService``) so a
+          concurrent receipt can't be overwritten.
+        - Readers get O(1) rows; a missing row is built from ``Stock`` once.
+    """
+
+    # --------------------------------------------------------------------- #
+    # Reads
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def get(product: Product) -> InventoryPosition:
+        return InventoryPositionService.get_many([product.pk])[product.pk]
+
+    @staticmethod
+    def get_many(
+        product_ids: Iterable[int],
+        known: Optional[Dict[int, InventoryPosition]] = None,
+    ) -> Dict[int, InventoryPosition]:
+        """
+        ``{product_id: position}`` for every id, building missing rows.
+
+        ``known`` is a memo shared by several reads of one operation (e.g.
+        stock check, then pricing of the same cart): ids already in it are
+        not fetched again, and fetched rows are added to it.
+        """
+        product_ids = set(product_ids)
+        if known is None:
+            known = {}
+
+        wanted = product_ids - known.keys()
+        if wanted:
+            positions = InventoryPosition.objects.in_bulk(wanted)
+            missing = wanted - positions.keys()
+            if missing:
+                positions.update(InventoryPositionService.refresh(missing))
+            known.update(positions)
+        return {pk: known[pk] for pk in product_ids}
+
+    # --------------------------------------------------------------------- #
+    # Writes
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def lock(product_ids: Iterable[int]) -> Dict[int, InventoryPosition]:
+        """Row-lock positions in product order (deadlock-safe)."""
+        return {
+            position.pk: position
+            for position in InventoryPosition.objects.filter(product_id__in=product_ids)
+            .order_by("product_id")
+            .select_for_update()
+        }
+
+    @staticmethod
+    def record_receipt(
+        product: Product, quantity: Decimal, unit_price: Decimal
+    ) -> None:
+        """Account a new lot of ``product``, already saved to ``Stock``."""
+        position = (
+            InventoryPosition.objects.select_for_update()
+            .filter(product=product)
+            .first()
+        )
+        if position is None:
+            # First movement ever: the new lot is already in Stock
+            InventoryPositionService.refresh([product.pk], moved_at=timezone.now())
+            return
+
+        position.on_hand += quantity
+        position.max_unit_price = max(position.max_unit_price, unit_price)
+        if position.head_unit_price is None:
+            position.head_unit_price = unit_price
+        position.last_movement_at = timezone.now()
+        position.save(update_fields=POSITION_FIELDS)
+
+    @staticmethod
+    def sync_from_lots(lots_by_product: Mapping[int, Iterable[Stock]]) -> None:
+        """
+        Overwrite positions from the full, FIFO-ordered live lots of each
+        product, as already held in memory by a locking consumer.
+        """
+        now = timezone.now()
+        InventoryPositionService._save(
+            [
+                InventoryPositionService._from_lots(product_id, lots, now)
+                for product_id, lots in lots_by_product.items()
+            ],
+            with_movement=True,
+        )
+
+    @staticmethod
+    def refresh(
+        product_ids: Iterable[int], moved_at: Optional[datetime] = None
+    ) -> Dict[int, InventoryPosition]:
+        """
+        Recompute positions from ``Stock`` and store them.
+
+        ``last_movement_at`` is only touched when ``moved_at`` is given.
+        """
+        positions = InventoryPositionService.compute(product_ids)
+        for position in positions.values():
+            position.last_movement_at = moved_at
+        InventoryPositionService._save(
+            list(positions.values()), with_movement=moved_at is not None
+        )
+        return positions
+
+    @staticmethod
+    def compute(product_ids: Iterable[int]) -> Dict[int, InventoryPosition]:
+        """Unsaved positions computed from live lots (one query)."""
+        product_ids = list(product_ids)
+        lots = defaultdict(list)
+        for lot in (
+            Stock.objects.filter(
+                stored_product_id__in=product_ids, remaining_quantity__gt=0
+            )
+            .order_by("stored_product_id", "create_at", "id")
+            .only("stored_product_id", "remaining_quantity", "unit_price")
+        ):
+            lots[lot.stored_product_id].append(lot)
+
+        return {
+            product_id: InventoryPositionService._from_lots(
+                product_id, lots[product_id], None
+            )
+            for product_id in product_ids
+        }
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _from_lots(
+        product_id: int, lots: Iterable[Stock], moved_at: Optional[datetime]
+    ) -> InventoryPosition:
+        live = [lot for lot in lots if lot.remaining_quantity > 0]
+        return InventoryPosition(
+            product_id=product_id,
+            on_hand=sum((lot.remaining_quantity for lot in live), ZERO),
+            head_unit_price=live[0].unit_price if live else None,
+            max_unit_price=max((lot.unit_price for lot in live), default=ZERO),
+            last_movement_at=moved_at,
+        )
+
+    @staticmethod
+    def _save(positions: list[InventoryPosition], with_movement: bool) -> None:
+        if not positions:
+            return
+        fields = POSITION_FIELDS if with_movement else POSITION_FIELDS[:-1]
+        InventoryPosition.objects.bulk_create(
+            positions,
+            update_conflicts=True,
+            unique_fields=["product"],
+            update_fields=fields,
+        )
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from decimal import Decimal
-from typing import Set, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from ..models import Product, Recipe
-from .recipe import RecipeService
+from .bill_of_materials import BillOfMaterialsService, ComponentsMemo
 from .stock import StockService
 
 
@@ -16,10 +17,11 @@ class ItemProductionService:
     """
     Production cost calculation with **recursive phantom (non-stock-traceable) resolution**.
 
-    - If a component is stock-traceable → reserve FIFO.
-    - If not → find its **active recipe** and recurse.
-    - Supports arbitrary depth.
-    - Fully atomic, type-safe, and cycle-safe.
+    - Recipes are flattened to stock-traceable leaves by
+      ``BillOfMaterialsService`` (cached, phantoms resolved via their
+      **active recipe**, arbitrary depth, cycle-safe).
+    - All leaves are reserved FIFO in one batch at the end.
+    - Fully atomic and type-safe.
     """
 
     @staticmethod
@@ -40,98 +42,69 @@ class ItemProductionService:
         Raises:
             ValidationError: If quantity <= 0 or no active recipe for phantom.
         """
-        if used_qt <= 0:
-            raise ValidationError(_("Requested quantity must be greater than zero."))
+        return ItemProductionService.get_batch_total_cost([(recipe.pk, used_qt)])
 
-        total_cost = Decimal("0")
-        seen_recipes: Set[int] = set()
-
-        # Start recursion
-        total_cost += ItemProductionService._resolve_and_reserve(
-            recipe=recipe,
-            multiplier=used_qt,
-            seen_recipes=seen_recipes,
-        )
-
-        return total_cost
-
-    # --------------------------------------------------------------------- #
-    # Private recursive resolver
-    # --------------------------------------------------------------------- #
     @staticmethod
-    def _resolve_and_reserve(
-        recipe: Recipe,
-        multiplier: Decimal,
-        seen_recipes: Set[int],
-    ) -> Decimal:
+    @transaction.atomic
+    def get_batch_total_cost(batch: Iterable[Tuple[int, Decimal]]) -> Decimal:
         """
-        Recursively resolve one recipe level and return its total cost.
-
-        Args:
-            recipe: Current recipe to resolve.
-            multiplier: How much of this recipe's output is needed (e.g. 2.5).
-            seen_recipes: Set of recipe IDs already visited (prevents cycles).
+        Produce several ``(recipe_id, quantity)`` pairs and return their total cost.
 
-        Returns:
-            Total cost for this level (sum of all leaf reservations).
+        Leaf requirements of the whole batch are merged first, then consumed
+        with a single ``StockService.consume_fifo`` call.
         """
-        if recipe.pk in seen_recipes:
-            raise ValidationError(_("Recipe cycle detected."))
-
-        seen_recipes.add(recipe.pk)
-
-        total_cost = Decimal("0")
-
-        # Get components: List[(Product, ratio_per_unit_output)]
-        com_rao = ItemProductionService._get_components_and_ratio(recipe)
-        for product, ratio in com_rao:
-            required_qty = ratio * multiplier
-
-            if product.is_stock_traceable:
-                # Leaf: reserve from stock
-                total_cost += StockService.reserve_fifo(product, required_qty)
-            else:
-                # Phantom: resolve its active recipe
-                active_recipe = product.active_recipe
-                if active_recipe is None:
-                    raise ValidationError(
-                        _(f"No active recipe for phantom product: {product}")
-                    )
-
-                # Recurse
-                total_cost += ItemProductionService._resolve_and_reserve(
-                    recipe=active_recipe,
-                    multiplier=required_qty,
-                    seen_recipes=seen_recipes,
-                )
+        requirements = ItemProductionService.get_batch_requirements(batch)
+        if not requirements:
+            return Decimal("0")
 
-        # Remove from seen after backtracking
-        seen_recipes.remove(recipe.pk)
-        return total_cost
+        consumed = StockService.consume_fifo(requirements)
+        return sum((c.total_cost for c in consumed.values()), Decimal("0"))
 
-    # --------------------------------------------------------------------- #
-    # Helper: convert raw quantity → exact Decimal ratio
-    # --------------------------------------------------------------------- #
     @staticmethod
-    def _get_exact_ratio(raw_quantity: Decimal) -> Decimal:
+    def get_requirements(recipe: Recipe, used_qt: Decimal) -> Dict[Product, Decimal]:
         """
-        Convert component quantity to exact ratio per 1 unit of output.
+        Explode ``used_qt`` of ``recipe`` into stock-traceable leaf quantities.
 
-        Uses FRACTION_MAP for common fractions; otherwise returns raw value.
+        Does not touch stock.
         """
-        raw = raw_quantity.quantize(Decimal("0.001"))
-        num, den = RecipeService.FRACTION_MAP.get(raw, (None, None))
-        if num and den:
-            return Decimal(num) / Decimal(den)
-        return Decimal(raw)
+        return ItemProductionService.get_batch_requirements([(recipe.pk, used_qt)])
 
     @staticmethod
-    def _get_components_and_ratio(recipe: Recipe) -> list[Tuple[Product, Decimal]]:
+    def get_batch_requirements(
+        batch: Iterable[Tuple[int, Decimal]],
+        components: Optional[ComponentsMemo] = None,
+    ) -> Dict[Product, Decimal]:
         """
-        Get components: List[(Product, ratio_per_unit_output)]
+        Merge leaf quantities of several ``(recipe_id, quantity)`` pairs.
+
+        Uses the cached exploded BOM of each recipe, so the only query is one
+        ``in_bulk`` for the leaf products – none for leaves already loaded in
+        ``components`` (a ``BillOfMaterialsService.load_components`` memo).
+
+        Raises:
+            ValidationError: If quantity <= 0, a phantom has no active recipe
+                or the recipe tree has a cycle.
         """
-        return [
-            (comp.consume_product, ratio)
-            for comp in recipe.components.all()
-            for ratio in [ItemProductionService._get_exact_ratio(comp.quantity)]
-        ]
+        by_id: Dict[int, Decimal] = defaultdict(Decimal)
+        for recipe_id, used_qt in batch:
+            if used_qt <= 0:
+                raise ValidationError(
+                    _("Requested quantity must be greater than zero.")
+                )
+            for product_id, ratio in BillOfMaterialsService.get_ratios(
+                recipe_id, components
+            ).items():
+                by_id[product_id] += ratio * used_qt
+
+        if not by_id:
+            return {}
+
+        products = {
+            comp.consume_product_id: comp.consume_product
+            for rows in (components or {}).values()
+            for comp in rows
+            if comp.consume_product_id in by_id
+        }
+        if len(products) < len(by_id):
+            products.update(Product.objects.in_bulk(by_id.keys() - products.keys()))
+        return {products[pk]: qty for pk, qty in by_id.items()}
@@ -5,7 +5,8 @@ from decimal import Decimal
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-from ..models import Product, ProductAdjustmentReport, Stock
+from ..models import Product, ProductAdjustmentReport
+from .inventory_position import InventoryPositionService
 from .stock import StockService
 
 
@@ -31,7 +32,8 @@ class ProductAdjustmentService:
             session: Identifier for the adjustment session (audit).
             current_quantity: Desired final quantity.
         """
-        total_stock = Stock.objects.get_total(product)
+        position = InventoryPositionService.get(product)
+        total_stock = position.on_hand
 
         if current_quantity == total_stock:
             return
@@ -48,7 +50,7 @@ class ProductAdjustmentService:
                 cost=cost,
             )
         else:
-            max_price = Stock.objects.max_price(product)
+            max_price = position.max_unit_price
             if max_price == 0:
                 max_price = product.last_purchased_price or Decimal("0")
                 if max_price == 0:
@@ -1,18 +1,84 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Dict, List, Mapping, Optional
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Sum
 from django.utils.translation import gettext_lazy as _
 
-from ..models import Product, Stock
+from ..models import InventoryPosition, Product, Stock
+from .inventory_position import InventoryPositionService
 
 ZERO = Decimal("0")
 TOLERANCE = Decimal("0.001")
 
 
+@dataclass(frozen=True)
+class LotConsumption:
+    """Quantity taken from a single stock lot."""
+
+    stock_id: int
+    quantity: Decimal
+    unit_price: Decimal
+
+    @property
+    def cost(self) -> Decimal:
+        return self.quantity * self.unit_price
+
+
+@dataclass
+class ProductConsumption:
+    """FIFO cost breakdown of one product in a batch consumption."""
+
+    product: Product
+    quantity: Decimal
+    lots: List[LotConsumption] = field(default_factory=list)
+
+    @property
+    def total_cost(self) -> Decimal:
+        return sum((lot.cost for lot in self.lots), ZERO)
+
+
+@dataclass(frozen=True)
+class Shortage:
+    """One ingredient the stock can't cover."""
+
+    product: Product
+    required: Decimal
+    available: Decimal
+
+    @property
+    def missing(self) -> Decimal:
+        return self.required - self.available
+
+
+@dataclass
+class AvailabilityReport:
+    """Result of ``StockService.check_availability``."""
+
+    shortages: List[Shortage] = field(default_factory=list)
+
+    @property
+    def is_available(self) -> bool:
+        return not self.shortages
+
+    def raise_if_short(self) -> None:
+        """Raise one ``ValidationError`` listing every shortage."""
+        if self.shortages:
+            raise ValidationError(
+                [
+                    _(
+                        f"Not enough {s.product.name}: "
+                        f"required {s.required}, available {s.available}"
+                    )
+                    for s in self.shortages
+                ]
+            )
+
+
 class StockService:
     """
     FIFO stock management – fully type-safe.
@@ -50,12 +116,15 @@ class StockService:
         """
         StockService._ensure_traceable(product)
 
-        return Stock.objects.create(
-            stored_product=product,
-            initial_quantity=quantity,
-            remaining_quantity=quantity,
-            unit_price=unit_price,
-        )
+        with transaction.atomic():
+            stock = Stock.objects.create(
+                stored_product=product,
+                initial_quantity=quantity,
+                remaining_quantity=quantity,
+                unit_price=unit_price,
+            )
+            InventoryPositionService.record_receipt(product, quantity, unit_price)
+        return stock
 
     @staticmethod
     @transaction.atomic
@@ -73,43 +142,127 @@ class StockService:
         Raises:
             ValidationError: If there is not enough stock (shortage > 1 mg).
         """
-        if requested_qty <= 0:
+        consumed = StockService.consume_fifo({product: requested_qty})
+        return consumed[product].total_cost
+
+    @staticmethod
+    @transaction.atomic
+    def consume_fifo(
+        requirements: Mapping[Product, Decimal],
+    ) -> Dict[Product, ProductConsumption]:
+        """
+        Consume several products from their oldest lots in one pass.
+
+        All affected lots are locked with a single ordered
+        ``SELECT ... FOR UPDATE``; the plan is computed in memory and written
+        back with one ``bulk_update`` and one ``DELETE`` for exhausted lots.
+        Inventory positions are locked first and rewritten from the same
+        in-memory lots. Nothing is written if any product is short.
+
+        Args:
+            requirements: ``{product: quantity}``; every quantity must be > 0.
+
+        Returns:
+            ``{product: ProductConsumption}`` with per-lot cost breakdowns.
+
+        Raises:
+            ValidationError: If a quantity is not positive or any product is
+                short (the message lists every shortage).
+        """
+        if any(qty <= 0 for qty in requirements.values()):
             raise ValidationError(_("Requested quantity must be greater than zero."))
 
-        total_cost: Decimal = ZERO
-        remaining: Decimal = requested_qty
+        by_id = {product.pk: product for product in requirements}
+        InventoryPositionService.lock(by_id.keys())
+        lots_by_product: Dict[int, List[Stock]] = defaultdict(list)
+        for lot in Stock.objects.lock_lots(by_id.keys()):
+            lots_by_product[lot.stored_product_id].append(lot)
 
-        for entry in Stock.objects.first_in(product=product):
-            if remaining <= 0:
-                break
+        result: Dict[Product, ProductConsumption] = {}
+        to_update: List[Stock] = []
+        to_delete: List[int] = []
+        shortages: List[str] = []
 
-            if entry.remaining_quantity >= remaining:
-                total_cost += remaining * entry.unit_price
-                entry.remaining_quantity -= remaining
-                entry.save(update_fields=("remaining_quantity",))
-                remaining = ZERO
-            else:
-                total_cost += entry.remaining_quantity * entry.unit_price
-                remaining -= entry.remaining_quantity
-                entry.remaining_quantity = ZERO
-                entry.save(update_fields=("remaining_quantity",))
+        for product, requested_qty in requirements.items():
+            consumption = ProductConsumption(product=product, quantity=requested_qty)
+            remaining = requested_qty
 
-            if entry.remaining_quantity <= TOLERANCE:
-                entry.delete()
+            for lot in lots_by_product[product.pk]:
+                if remaining <= 0:
+                    break
 
-        if remaining > TOLERANCE:
-            raise ValidationError(
-                _(f"Not enough stock for {product}: short by {remaining}")
-            )
-        return total_cost
+                taken = min(lot.remaining_quantity, remaining)
+                consumption.lots.append(
+                    LotConsumption(
+                        stock_id=lot.pk, quantity=taken, unit_price=lot.unit_price
+                    )
+                )
+                remaining -= taken
+                lot.remaining_quantity -= taken
+
+                if lot.remaining_quantity <= TOLERANCE:
+                    to_delete.append(lot.pk)
+                else:
+                    to_update.append(lot)
+
+            if remaining > TOLERANCE:
+                shortages.append(
+                    _(f"Not enough stock for {product}: short by {remaining}")
+                )
+            result[product] = consumption
+
+        if shortages:
+            raise ValidationError(shortages)
+
+        if to_update:
+            Stock.objects.bulk_update(to_update, ["remaining_quantity"])
+        if to_delete:
+            Stock.objects.filter(pk__in=to_delete).delete()
+
+        exhausted = set(to_delete)
+        InventoryPositionService.sync_from_lots(
+            {
+                product_id: [
+                    lot
+                    for lot in lots_by_product[product_id]
+                    if lot.pk not in exhausted
+                ]
+                for product_id in by_id
+            }
+        )
+
+        return result
+
+    @staticmethod
+    def check_availability(
+        requirements: Mapping[Product, Decimal],
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+    ) -> AvailabilityReport:
+        """
+        Compare required quantities against on-hand inventory positions.
+
+        Args:
+            requirements: ``{product: quantity}``, already merged across the
+                whole cart.
+            positions: Optional ``InventoryPositionService.get_many`` memo.
+
+        Returns:
+            An ``AvailabilityReport`` listing *every* shortage (tolerance 1 mg).
+        """
+        positions = InventoryPositionService.get_many(
+            (p.pk for p in requirements), positions
+        )
+
+        report = AvailabilityReport()
+        for product, required in requirements.items():
+            available = positions[product.pk].on_hand
+            if required - available > TOLERANCE:
+                report.shortages.append(
+                    Shortage(product=product, required=required, available=available)
+                )
+        return report
 
     @staticmethod
     def is_enough(product: Product, qty: Decimal) -> bool:
         """Check if there is enough material for this product"""
-        all_left = (
-            Stock.objects.filter(stored_product=product).aggregate(
-                all_left=Sum("remaining_quantity")
-            )["all_left"]
-            or 0
-        )
-        return True if all_left >= qty else False
+        return InventoryPositionService.get(product).on_hand >= qty
@@ -0,0 +1,46 @@
+"""
+Cache invalidation for derived inventory data.
+
+Exploded BOMs (see ``BillOfMaterialsService``) depend on recipes, their
+components and on which products are phantoms / which recipe is active.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Product, Recipe, RecipeComponent
+from .services.bill_of_materials import BillOfMaterialsService
+
+# Product fields the exploded BOM depends on
+BOM_PRODUCT_FIELDS = ("active_recipe_id", "is_stock_traceable")
+
+
+def _bom_state(product: Product) -> tuple:
+    return tuple(product.__dict__.get(f) for f in BOM_PRODUCT_FIELDS)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=RecipeComponent)
+@receiver(post_delete, sender=RecipeComponent)
+def invalidate_bom_on_recipe_change(sender, **kwargs):
+    BillOfMaterialsService.invalidate()
+
+
+@receiver(post_init, sender=Product)
+def remember_product_bom_state(sender, instance, **kwargs):
+    instance._bom_state = _bom_state(instance)
+
+
+@receiver(post_save, sender=Product)
+def invalidate_bom_on_product_change(sender, instance, created, **kwargs):
+    # Prices, names, etc. change often and don't affect any BOM
+    state = _bom_state(instance)
+    if created or state != instance._bom_state:
+        BillOfMaterialsService.invalidate()
+    instance._bom_state = state
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_bom_on_product_delete(sender, **kwargs):
+    BillOfMaterialsService.invalidate()
@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+import pytest
+from apps.inventory.services import BillOfMaterialsService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from django.core.exceptions import ValidationError
+
+
+@pytest.fixture
+def tree(db):
+    """drink -> (2 x syrup[phantom] -> 0.5 sugar) + 1/3 milk"""
+    sugar = ProductFactory(is_stock_traceable=True)
+    milk = ProductFactory(is_stock_traceable=True)
+    syrup = ProductFactory(is_stock_traceable=False)
+
+    syrup_recipe = RecipeFactory(produced_product=syrup)
+    RecipeComponentFactory(
+        recipe=syrup_recipe, consume_product=sugar, quantity=Decimal("0.5")
+    )
+    syrup.active_recipe = syrup_recipe
+    syrup.save()
+
+    drink = RecipeFactory()
+    RecipeComponentFactory(recipe=drink, consume_product=syrup, quantity=Decimal("2"))
+    RecipeComponentFactory(
+        recipe=drink, consume_product=milk, quantity=Decimal("0.333")
+    )
+    return {"drink": drink, "syrup": syrup_recipe, "sugar": sugar, "milk": milk}
+
+
+@pytest.mark.django_db
+class TestBillOfMaterialsService:
+    def test_flattens_phantoms_with_exact_fractions(self, tree):
+        ratios = BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        assert ratios == {
+            tree["sugar"].pk: Decimal("1"),
+            tree["milk"].pk: Decimal(1) / Decimal(3),
+        }
+
+    def test_warm_lookup_hits_no_database(self, tree, django_assert_num_queries):
+        BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        with django_assert_num_queries(0):
+            BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+    def test_nested_component_change_invalidates_parent(self, tree):
+        BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        component = tree["syrup"].components.get()
+        component.quantity = Decimal("0.25")
+        component.save()
+
+        ratios = BillOfMaterialsService.get_ratios(tree["drink"].pk)
+        assert ratios[tree["sugar"].pk] == Decimal("0.5")
+
+    def test_active_recipe_change_invalidates(self, tree):
+        BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        honey = ProductFactory(is_stock_traceable=True)
+        other = RecipeFactory(produced_product=tree["syrup"].produced_product)
+        RecipeComponentFactory(recipe=other, consume_product=honey, quantity=1)
+        syrup = tree["syrup"].produced_product
+        syrup.active_recipe = other
+        syrup.save()
+
+        ratios = BillOfMaterialsService.get_ratios(tree["drink"].pk)
+        assert tree["sugar"].pk not in ratios
+        assert ratios[honey.pk] == Decimal("2")
+
+    def test_rebuild_before_commit_is_dropped(
+        self, tree, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            component = tree["syrup"].components.get()
+            component.quantity = Decimal("0.25")
+            component.save()
+            # A concurrent request rebuilding before the commit
+            BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        with django_assert_num_queries(2):
+            BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+    def test_unrelated_product_save_keeps_cache(self, tree, django_assert_num_queries):
+        BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        tree["milk"].last_purchased_price = Decimal("12")
+        tree["milk"].save()
+
+        with django_assert_num_queries(0):
+            BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+    def test_phantom_without_recipe_is_not_cached(self, tree):
+        syrup = tree["syrup"].produced_product
+        syrup.active_recipe = None
+        syrup.save()
+
+        with pytest.raises(ValidationError):
+            BillOfMaterialsService.get_ratios(tree["drink"].pk)
+
+        syrup.active_recipe = tree["syrup"]
+        syrup.save()
+        assert BillOfMaterialsService.get_ratios(tree["drink"].pk)
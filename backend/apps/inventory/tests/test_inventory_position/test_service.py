@@ -0,0 +1,94 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from apps.inventory.models import InventoryPosition, Stock
+from apps.inventory.services import InventoryPositionService, StockService
+from apps.inventory.tests.factories import ProductFactory
+from django.core.management import CommandError, call_command
+
+
+@pytest.fixture
+def flour(db):
+    return ProductFactory(is_stock_traceable=True)
+
+
+def _position(product):
+    return InventoryPosition.objects.get(product=product)
+
+
+@pytest.mark.django_db
+class TestInventoryPositionService:
+    def test_receipts_accumulate(self, flour):
+        StockService.add_to_stock(flour, Decimal("3"), Decimal("10"))
+        StockService.add_to_stock(flour, Decimal("5"), Decimal("4"))
+
+        position = _position(flour)
+        assert position.on_hand == Decimal("14")
+        assert position.head_unit_price == Decimal("3")
+        assert position.max_unit_price == Decimal("5")
+        assert position.last_movement_at is not None
+
+    def test_consumption_moves_head_and_max(self, flour):
+        StockService.add_to_stock(flour, Decimal("7"), Decimal("10"))
+        StockService.add_to_stock(flour, Decimal("2"), Decimal("10"))
+
+        StockService.reserve_fifo(flour, Decimal("12"))
+
+        position = _position(flour)
+        assert position.on_hand == Decimal("8")
+        assert position.head_unit_price == Decimal("2")
+        assert position.max_unit_price == Decimal("2")
+
+    def test_exhausted_product_has_no_head(self, flour):
+        StockService.add_to_stock(flour, Decimal("7"), Decimal("10"))
+
+        StockService.reserve_fifo(flour, Decimal("10"))
+
+        position = _position(flour)
+        assert position.on_hand == Decimal("0")
+        assert position.head_unit_price is None
+
+    def test_missing_row_is_built_from_stock(self, flour):
+        Stock.objects.create(
+            stored_product=flour,
+            initial_quantity=5,
+            remaining_quantity=5,
+            unit_price=Decimal("9"),
+            create_at=date(2024, 1, 1),
+        )
+
+        position = InventoryPositionService.get(flour)
+
+        assert position.on_hand == Decimal("5")
+        assert position.head_unit_price == Decimal("9")
+        assert InventoryPosition.objects.filter(product=flour).exists()
+
+    def test_warm_read_is_one_query(self, flour, django_assert_num_queries):
+        StockService.add_to_stock(flour, Decimal("1"), Decimal("1"))
+
+        with django_assert_num_queries(1):
+            assert StockService.is_enough(flour, Decimal("1"))
+
+
+@pytest.mark.django_db
+class TestInventoryPositionsCommand:
+    def test_reports_and_rebuilds_drift(self, flour):
+        StockService.add_to_stock(flour, Decimal("1"), Decimal("10"))
+        InventoryPosition.objects.filter(product=flour).update(on_hand=99)
+
+        with pytest.raises(CommandError):
+            call_command("inventory_positions", stdout=StringIO())
+
+        out = StringIO()
+        call_command("inventory_positions", "--rebuild", stdout=out)
+
+        assert "Rebuilt 1 drifted" in out.getvalue()
+        assert _position(flour).on_hand == Decimal("10")
+
+    def test_missing_row_without_stock_is_not_drift(self, flour):
+        out = StringIO()
+        call_command("inventory_positions", stdout=out)
+
+        assert "Found 0 drifted" in out.getvalue()
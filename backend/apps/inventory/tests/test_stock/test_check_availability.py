@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+import pytest
+from apps.inventory.services.stock import StockService
+from apps.inventory.tests.factories import ProductFactory
+from django.core.exceptions import ValidationError
+
+
+def _stock(product, qty):
+    StockService.add_to_stock(product, Decimal("1"), Decimal(qty))
+
+
+@pytest.mark.django_db
+class TestCheckAvailability:
+    def test_reports_every_shortage(self):
+        milk, sugar, beans = (ProductFactory(is_stock_traceable=True) for _ in "abc")
+        _stock(milk, "5")
+        _stock(milk, "5")
+        _stock(sugar, "1")
+
+        report = StockService.check_availability(
+            {milk: Decimal("10"), sugar: Decimal("3"), beans: Decimal("1")}
+        )
+
+        assert not report.is_available
+        assert {(s.product, s.missing) for s in report.shortages} == {
+            (sugar, Decimal("2")),
+            (beans, Decimal("1")),
+        }
+        with pytest.raises(ValidationError) as exc:
+            report.raise_if_short()
+        assert len(exc.value.messages) == 2
+
+    def test_single_query_for_many_products(self, django_assert_num_queries):
+        products = [ProductFactory(is_stock_traceable=True) for _ in range(10)]
+        for product in products:
+            _stock(product, "2")
+
+        with django_assert_num_queries(1):
+            report = StockService.check_availability(
+                {p: Decimal("2") for p in products}
+            )
+
+        assert report.is_available
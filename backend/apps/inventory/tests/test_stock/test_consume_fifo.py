@@ -0,0 +1,120 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from apps.inventory.models import Stock
+from apps.inventory.services import ItemProductionService
+from apps.inventory.services.stock import StockService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from django.core.exceptions import ValidationError
+
+
+def _lot(product, qty, price, day):
+    return Stock.objects.create(
+        stored_product=product,
+        initial_quantity=Decimal(qty),
+        remaining_quantity=Decimal(qty),
+        unit_price=Decimal(price),
+        create_at=date(2024, 1, day),
+    )
+
+
+@pytest.mark.django_db
+class TestConsumeFifo:
+    def test_spans_lots_oldest_first(self):
+        milk = ProductFactory(is_stock_traceable=True)
+        old = _lot(milk, "10", "2", 1)
+        new = _lot(milk, "10", "3", 2)
+
+        result = StockService.consume_fifo({milk: Decimal("15")})
+
+        breakdown = result[milk]
+        assert [(lot.stock_id, lot.quantity) for lot in breakdown.lots] == [
+            (old.pk, Decimal("10")),
+            (new.pk, Decimal("5")),
+        ]
+        assert breakdown.total_cost == Decimal("35")
+        assert not Stock.objects.filter(pk=old.pk).exists()
+        assert Stock.objects.get(pk=new.pk).remaining_quantity == Decimal("5")
+
+    def test_many_products_constant_queries(self, django_assert_max_num_queries):
+        products = [ProductFactory(is_stock_traceable=True) for _ in range(5)]
+        for product in products:
+            for day in (1, 2, 3):
+                _lot(product, "4", "1", day)
+
+        # lock positions + lots, bulk update, delete, position upsert, savepoints
+        with django_assert_max_num_queries(8):
+            result = StockService.consume_fifo({p: Decimal("6") for p in products})
+
+        assert all(r.total_cost == Decimal("6") for r in result.values())
+        assert Stock.objects.count() == 10
+
+    def test_shortage_writes_nothing(self):
+        sugar = ProductFactory(is_stock_traceable=True)
+        salt = ProductFactory(is_stock_traceable=True)
+        _lot(sugar, "10", "1", 1)
+        _lot(salt, "1", "1", 1)
+
+        with pytest.raises(ValidationError) as exc:
+            StockService.consume_fifo({sugar: Decimal("5"), salt: Decimal("2")})
+
+        assert len(exc.value.messages) == 1
+        assert Stock.objects.get(stored_product=sugar).remaining_quantity == 10
+
+    def test_rejects_non_positive_quantity(self):
+        product = ProductFactory(is_stock_traceable=True)
+
+        with pytest.raises(ValidationError):
+            StockService.consume_fifo({product: Decimal("0")})
+
+    def test_reserve_fifo_delegates(self):
+        product = ProductFactory(is_stock_traceable=True)
+        _lot(product, "100", "5", 1)
+
+        assert StockService.reserve_fifo(product, Decimal("50")) == Decimal("250")
+        assert Stock.objects.get(stored_product=product).remaining_quantity == 50
+
+
+@pytest.mark.django_db
+class TestBatchProduction:
+    def test_batch_merges_shared_leaves(self):
+        coffee = ProductFactory(is_stock_traceable=True)
+        _lot(coffee, "100", "2", 1)
+        latte = RecipeFactory()
+        espresso = RecipeFactory()
+        RecipeComponentFactory(
+            recipe=latte, consume_product=coffee, quantity=Decimal("2")
+        )
+        RecipeComponentFactory(
+            recipe=espresso, consume_product=coffee, quantity=Decimal("3")
+        )
+
+        cost = ItemProductionService.get_batch_total_cost(
+            [(latte.pk, Decimal("2")), (espresso.pk, Decimal("1"))]
+        )
+
+        assert cost == Decimal("14")
+        assert Stock.objects.get(stored_product=coffee).remaining_quantity == 93
+
+    def test_requirements_resolve_phantoms(self):
+        beans = ProductFactory(is_stock_traceable=True)
+        syrup = ProductFactory(is_stock_traceable=False)
+        syrup_recipe = RecipeFactory(produced_product=syrup)
+        RecipeComponentFactory(
+            recipe=syrup_recipe, consume_product=beans, quantity=Decimal("0.5")
+        )
+        syrup.active_recipe = syrup_recipe
+        syrup.save()
+        drink = RecipeFactory()
+        RecipeComponentFactory(
+            recipe=drink, consume_product=syrup, quantity=Decimal("2")
+        )
+
+        assert ItemProductionService.get_requirements(drink, Decimal("3")) == {
+            beans: Decimal("3")
+        }
@@ -1,3 +1,4 @@
 from .menu import MenuItemService
+from .menu_pdf import MenuPdfService
 
-__all__ = ("MenuItemService",)
+__all__ = ("MenuItemService", "MenuPdfService")
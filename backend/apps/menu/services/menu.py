@@ -1,26 +1,40 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Tuple  # For suggested_price return type
+from typing import Dict, Iterable, Optional, Tuple
 
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.utils.translation import gettext_lazy as _
 
 from ...core_setting.models import SiteSettings
-from ...inventory.models import Product, RecipeComponent, Stock
+from ...core_setting.services import SiteSettingsService
+from ...inventory.models import InventoryPosition, Product, RecipeComponent
+from ...inventory.services import BillOfMaterialsService, InventoryPositionService
+from ...inventory.services.bill_of_materials import ComponentsMemo
 from ..models import MenuCategory
 
 Q0 = Decimal("1")
 
 
+@dataclass(frozen=True)
+class PricingContext:
+    """Pricing settings, read once per (batch) call."""
+
+    profit_margin_frac: Decimal
+    tax_rate_frac: Decimal
+    overhead_bar_value: Decimal
+    overhead_food_value: Decimal
+
+
 class MenuItemService:
     # ---------- Settings ----------
     @staticmethod
     def _settings() -> SiteSettings:
-        try:
-            return SiteSettings.objects.get()
-        except ObjectDoesNotExist:
+        settings = SiteSettingsService.current()
+        if settings is None:
             raise ValidationError(_("Site settings not configured"))
+        return settings
 
     @classmethod
     def _profit_margin_frac(cls) -> Decimal:
@@ -38,16 +52,20 @@ class MenuItemService:
     def _overhead_food_value(cls) -> Decimal:
         return Decimal(cls._settings().overhead_food_value)
 
+    @classmethod
+    def _pricing_context(cls) -> PricingContext:
+        settings = cls._settings()
+        return PricingContext(
+            profit_margin_frac=Decimal(settings.profit_margin) / Decimal("100"),
+            tax_rate_frac=Decimal(settings.tax_rate) / Decimal("100"),
+            overhead_bar_value=Decimal(settings.overhead_bar_value),
+            overhead_food_value=Decimal(settings.overhead_food_value),
+        )
+
     # ---------- FIFO (peek) ----------
     @staticmethod
     def _fifo_first_unit_price(product: Product) -> Decimal | None:
-        row = (
-            Stock.objects.filter(stored_product=product, remaining_quantity__gt=0)
-            .order_by("create_at", "id")
-            .values_list("unit_price", flat=True)
-            .first()
-        )
-        return Decimal(row) if row is not None else None
+        return InventoryPositionService.get(product).head_unit_price
 
     # ---------- Recipe ----------
     @staticmethod
@@ -68,15 +86,19 @@ class MenuItemService:
 
     # ---------- Formula ----------
     @classmethod
-    def _apply_formula(cls, unit_cost: Decimal, parent_group: str) -> Decimal:
+    def _apply_formula(
+        cls, unit_cost: Decimal, parent_group: str, ctx: PricingContext | None = None
+    ) -> Decimal:
+        if parent_group not in (MenuCategory.Group.BAR_ITEM, MenuCategory.Group.FOOD):
+            raise ValidationError(_("For this item no parent group submitted"))
+
+        ctx = ctx or cls._pricing_context()
         if parent_group == MenuCategory.Group.BAR_ITEM:
-            base = unit_cost + cls._overhead_bar_value()
-        elif parent_group == MenuCategory.Group.FOOD:
-            base = unit_cost + cls._overhead_food_value()
+            base = unit_cost + ctx.overhead_bar_value
         else:
-            raise ValidationError(_("For this item no parent group submitted"))
-        price_ex_tax = base * (Q0 + cls._profit_margin_frac())
-        final = price_ex_tax * (Q0 + cls._tax_rate_frac())
+            base = unit_cost + ctx.overhead_food_value
+        price_ex_tax = base * (Q0 + ctx.profit_margin_frac)
+        final = price_ex_tax * (Q0 + ctx.tax_rate_frac)
         return final
 
     @staticmethod
@@ -92,28 +114,63 @@ class MenuItemService:
         - Recipe components (if active_recipe exists)
         - last_purchased_price (for raw/processed without recipe/stock)
         """
-        unit_cost = cls._fifo_first_unit_price(product)
-        if unit_cost is not None:
-            return unit_cost
-
-        unit_cost = Decimal("0")
-        if product.active_recipe:
-            for rc in cls._active_recipe_components(product):
-                comp = rc.consume_product
-                comp_price = cls._fifo_first_unit_price(comp)
-                if comp_price is None:
-                    comp_price = Decimal(comp.last_purchased_price or 0)
-                    if comp_price <= 0:
-                        raise ValidationError(
-                            _("There is no price record for this product")
-                        )
-                unit_cost += Decimal(rc.quantity) * comp_price
-        else:
-            unit_cost = Decimal(product.last_purchased_price or 0)
-            if unit_cost <= 0:
-                raise ValidationError(_("No price record for this product"))
+        return cls._calculate_unit_costs([product])[product.pk]
+
+    @classmethod
+    def _calculate_unit_costs(
+        cls,
+        products: Iterable[Product],
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+        components: Optional[ComponentsMemo] = None,
+    ) -> Dict[int, Decimal]:
+        """
+        ``_calculate_unit_cost`` for many products in a fixed number of queries:
+        one for FIFO head prices, one for recipe components and one for the
+        components' head prices (fewer when ``positions``, a
+        ``InventoryPositionService.get_many`` memo, or ``components``, a
+        ``BillOfMaterialsService.load_components`` memo, already hold them).
+        """
+        products = list(products)
+        heads = InventoryPositionService.get_many((p.pk for p in products), positions)
+
+        costs: Dict[int, Decimal] = {}
+        needs_recipe = []
+        for product in products:
+            head = heads[product.pk].head_unit_price
+            if head is not None:
+                costs[product.pk] = Decimal(head)
+            elif product.active_recipe_id:
+                needs_recipe.append(product)
+            else:
+                unit_cost = Decimal(product.last_purchased_price or 0)
+                if unit_cost <= 0:
+                    raise ValidationError(_("No price record for this product"))
+                costs[product.pk] = unit_cost
+
+        if needs_recipe:
+            components = BillOfMaterialsService.load_components(
+                {p.active_recipe_id for p in needs_recipe}, components
+            )
+            comp_heads = InventoryPositionService.get_many(
+                (rc.consume_product_id for rcs in components.values() for rc in rcs),
+                positions,
+            )
+
+            for product in needs_recipe:
+                unit_cost = Decimal("0")
+                for rc in components[product.active_recipe_id]:
+                    comp = rc.consume_product
+                    comp_price = comp_heads[comp.pk].head_unit_price
+                    if comp_price is None:
+                        comp_price = Decimal(comp.last_purchased_price or 0)
+                        if comp_price <= 0:
+                            raise ValidationError(
+                                _("There is no price record for this product")
+                            )
+                    unit_cost += Decimal(rc.quantity) * Decimal(comp_price)
+                costs[product.pk] = unit_cost
 
-        return unit_cost
+        return costs
 
     # ---------- Public API ----------
     @classmethod
@@ -122,19 +179,46 @@ class MenuItemService:
         Input: menu_id (int)
         Output: (final_price_int, unit_cost_int)
         """
+        return cls.suggested_prices([menu_id])[menu_id]
+
+    @classmethod
+    def suggested_prices(cls, menu_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """
+        Batch ``suggested_price``: ``{menu_id: (final_price_int, unit_cost_int)}``.
+        """
         from ..models import Menu  # Avoid circular imports
 
-        try:
-            menu = Menu.objects.select_related("name", "category").get(id=menu_id)
-        except ObjectDoesNotExist:
+        menu_ids = set(menu_ids)
+        menus = Menu.objects.select_related("name", "category").filter(id__in=menu_ids)
+        menus = list(menus)
+        if len(menus) != len(menu_ids):
             raise ValidationError(_("Menu item not found"))
 
-        product = menu.name  # Product instance
-        parent_group = menu.category.parent_group
+        return cls.menu_prices(menus)
 
-        unit_cost = cls._calculate_unit_cost(product)
-        raw_price = cls._apply_formula(unit_cost, parent_group)
-        return cls._round_int(raw_price), cls._round_int(unit_cost)
+    @classmethod
+    def menu_prices(
+        cls,
+        menus: Iterable,
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+        components: Optional[ComponentsMemo] = None,
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        ``suggested_prices`` for menus already loaded with ``name`` and
+        ``category``.
+        """
+        menus = list(menus)
+        costs = cls._calculate_unit_costs(
+            (menu.name for menu in menus), positions, components
+        )
+        ctx = cls._pricing_context()
+
+        result = {}
+        for menu in menus:
+            unit_cost = costs[menu.name_id]
+            raw_price = cls._apply_formula(unit_cost, menu.category.parent_group, ctx)
+            result[menu.pk] = (cls._round_int(raw_price), cls._round_int(unit_cost))
+        return result
 
     @classmethod
     def extra_req_cost(cls, product_id: int, quantity: int) -> Tuple[int, Decimal]:
@@ -155,6 +239,25 @@ class MenuItemService:
         except ObjectDoesNotExist:
             raise ValidationError(_("Product not found"))
 
-        unit_cost = cls._calculate_unit_cost(product)
-        unit_price = unit_cost * (Q0 + cls._profit_margin_frac())
-        return cls._round_int(unit_price), unit_cost
+        return cls.extra_req_prices([product])[product.pk]
+
+    @classmethod
+    def extra_req_prices(
+        cls,
+        products: Iterable[Product],
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+        components: Optional[ComponentsMemo] = None,
+    ) -> Dict[int, Tuple[int, Decimal]]:
+        """
+        Batch ``extra_req_price``: ``{product_id: (unit_price_int, unit_cost)}``.
+        """
+        products = list(products)
+        if not products:
+            return {}
+
+        costs = cls._calculate_unit_costs(products, positions, components)
+        markup = Q0 + cls._pricing_context().profit_margin_frac
+        return {
+            pk: (cls._round_int(unit_cost * markup), unit_cost)
+            for pk, unit_cost in costs.items()
+        }
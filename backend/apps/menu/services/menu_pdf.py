@@ -0,0 +1,424 @@
+"""
+Menu PDF artifact.
+
+The long single-page menu PDF is rendered once per *menu version* and kept
+in default storage under ``menu_pdf/<content hash>.pdf``. The hash covers
+everything drawn on the page (categories, visible items and the renderer
+version), so a download only costs the two light queries needed to compute
+it; rendering happens on the first request after a change, or earlier when
+``apps.menu.tasks`` pre-warms it after ``Menu`` / ``MenuCategory`` saves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A6
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+
+from ...utils.rtl import shape_rtl
+from ..models import MenuCategory
+
+# Bump when the layout below changes so stored artifacts are re-rendered
+RENDERER_VERSION = 1
+ARTIFACT_DIR = "menu_pdf"
+
+# Superseded artifacts younger than this are kept: a request that has just
+# found one may still be about to open it
+PRUNE_GRACE = timedelta(minutes=10)
+
+# Font registration
+FONT_PATH = "/app/assets/fonts/Vazirmatn-Regular.ttf"
+FONT_NAME = "Vazir"
+pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_PATH))
+
+# Colors (Cappuccino palette - choice I)
+PAGE_BG = HexColor("#EFE3D1")  # background
+CARD_BG = HexColor("#FFFFFF")  # card background
+BORDER_COLOR = HexColor("#B88A63")  # border / warm brown
+SHADOW_COLOR = HexColor("#00000012")  # subtle shadow (semi-transparent)
+CATEGORY_COLOR = HexColor("#5A4230")  # category text color
+DIVIDER_COLOR = HexColor("#B88A63")  # divider (same as border)
+
+# Layout constants (medium compact — choice B)
+PAGE_MARGIN_TOP = 15
+PAGE_MARGIN_BOTTOM = 15
+PAGE_MARGIN_LEFT = 12
+PAGE_MARGIN_RIGHT = 12
+
+# Card paddings (reduced ~35%)
+CARD_PADDING_LEFT = 9
+CARD_PADDING_RIGHT = 9
+CARD_PADDING_TOP = 8
+CARD_PADDING_BOTTOM = 9
+
+# Spacing
+SPACER_AFTER_HEADER = 10
+SPACER_BETWEEN_ITEMS = 8
+SPACER_BETWEEN_CATEGORIES = 18
+DIVIDER_TOP_BOTTOM = 12
+
+# Shadow offset (reduced)
+SHADOW_OFFSET_X = 3
+SHADOW_OFFSET_Y = -3
+
+# Card corner radius
+CARD_RADIUS = 6
+
+
+# Paragraph styles
+def build_styles():
+    return {
+        "header": ParagraphStyle(
+            name="header",
+            fontName=FONT_NAME,
+            fontSize=20,
+            leading=24,
+            alignment=TA_CENTER,
+            textColor=CATEGORY_COLOR,
+            spaceAfter=SPACER_AFTER_HEADER,
+        ),
+        "category_title": ParagraphStyle(
+            name="category_title",
+            fontName=FONT_NAME,
+            fontSize=14,
+            leading=18,
+            alignment=TA_RIGHT,
+            textColor=CATEGORY_COLOR,
+            spaceBefore=6,
+            spaceAfter=6,
+        ),
+        "category_desc": ParagraphStyle(
+            name="category_desc",
+            fontName=FONT_NAME,
+            fontSize=9,
+            leading=12,
+            alignment=TA_RIGHT,
+            textColor=HexColor("#666666"),
+            spaceAfter=8,
+        ),
+        "item_name": ParagraphStyle(
+            name="item_name",
+            fontName=FONT_NAME,
+            fontSize=11,
+            leading=13,
+            alignment=TA_RIGHT,
+            textColor=HexColor("#333333"),
+            spaceAfter=4,
+        ),
+        "item_desc": ParagraphStyle(
+            name="item_desc",
+            fontName=FONT_NAME,
+            fontSize=9,
+            leading=11,
+            alignment=TA_RIGHT,
+            textColor=HexColor("#666666"),
+            spaceAfter=6,
+        ),
+    }
+
+
+@dataclass(frozen=True)
+class MenuPdfArtifact:
+    etag: str
+    path: str
+
+
+class MenuPdfService:
+    # --------------------------------------------------------------------- #
+    # Public API
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def current_etag() -> str:
+        """Content hash of the menu as it would be rendered now."""
+        return MenuPdfService._etag(MenuPdfService._snapshot())
+
+    @staticmethod
+    def ensure() -> MenuPdfArtifact:
+        """Return the artifact for the current menu, rendering it if missing."""
+        snapshot = MenuPdfService._snapshot()
+        etag = MenuPdfService._etag(snapshot)
+        path = MenuPdfService._path(etag)
+
+        if not default_storage.exists(path):
+            saved = default_storage.save(path, ContentFile(render_menu_pdf(*snapshot)))
+            if saved != path:
+                # Another worker stored the same version first
+                default_storage.delete(saved)
+            MenuPdfService._prune(keep=path)
+
+        return MenuPdfArtifact(etag=etag, path=path)
+
+    @staticmethod
+    def open(artifact: MenuPdfArtifact):
+        return default_storage.open(artifact.path, "rb")
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _snapshot() -> Tuple[List[tuple], List[tuple]]:
+        """Exactly the rows the renderer draws, in drawing order."""
+        # ``models.item`` imports this package
+        from ..models import Menu
+
+        categories = list(
+            MenuCategory.objects.order_by("order").values_list(
+                "id", "title", "description"
+            )
+        )
+        items = list(
+            Menu.objects.filter(is_available=True, show_in_menu=True)
+            .order_by("category__order", "order")
+            .values_list("category_id", "name__name", "description")
+        )
+        return categories, items
+
+    @staticmethod
+    def _etag(snapshot) -> str:
+        payload = json.dumps([RENDERER_VERSION, *snapshot], ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def _path(etag: str) -> str:
+        return f"{ARTIFACT_DIR}/{etag}.pdf"
+
+    @staticmethod
+    def _prune(keep: str) -> None:
+        try:
+            _, files = default_storage.listdir(ARTIFACT_DIR)
+        except FileNotFoundError:
+            return
+        cutoff = timezone.now() - PRUNE_GRACE
+        for name in files:
+            path = f"{ARTIFACT_DIR}/{name}"
+            if path == keep:
+                continue
+            try:
+                if default_storage.get_modified_time(path) > cutoff:
+                    continue
+            except FileNotFoundError:
+                # Pruned by another worker meanwhile
+                continue
+            default_storage.delete(path)
+
+
+def render_menu_pdf(categories: List[tuple], items: List[tuple]) -> bytes:
+    """
+    Render a single long-page PDF (auto-height) containing the whole menu.
+
+    Content is measured once with ``Paragraph.wrap()``; the draw pass reuses
+    those measurements.
+    """
+    grouped: Dict[int, List[tuple]] = {}
+    for category_id, name, description in items:
+        grouped.setdefault(category_id, []).append((name, description))
+
+    styles = build_styles()
+
+    # Paper width (A6 width) and minimal height (use at least standard A6 height)
+    page_width_pt = A6[0]
+    min_page_height_pt = A6[1]
+
+    # Usable width inside margins
+    usable_width = page_width_pt - PAGE_MARGIN_LEFT - PAGE_MARGIN_RIGHT
+
+    # Card width (leave extra space for shadow offset)
+    card_width = usable_width
+    card_inner_width = card_width - (CARD_PADDING_LEFT + CARD_PADDING_RIGHT)
+
+    # Prepare flow measuring
+    elements_to_draw = []  # list of dicts: {type, h, data...}
+    total_height = 0
+
+    # Header
+    header_para = Paragraph(shape_rtl("کافه چینو"), styles["header"])
+    w, h = header_para.wrap(usable_width, 1000)
+    elements_to_draw.append({"type": "header", "para": header_para, "w": w, "h": h})
+    total_height += h + SPACER_AFTER_HEADER
+
+    # Iterate categories and items to compute heights
+    for cat_id, cat_title, cat_description in categories:
+        # Category title
+        cat_title_para = Paragraph(shape_rtl(cat_title or ""), styles["category_title"])
+        w, h = cat_title_para.wrap(usable_width, 1000)
+        elements_to_draw.append(
+            {"type": "category_title", "para": cat_title_para, "w": w, "h": h}
+        )
+        total_height += h
+
+        # Category description (optional)
+        if cat_description:
+            cat_desc_para = Paragraph(
+                shape_rtl(cat_description), styles["category_desc"]
+            )
+            w, h = cat_desc_para.wrap(usable_width, 1000)
+            elements_to_draw.append(
+                {"type": "category_desc", "para": cat_desc_para, "w": w, "h": h}
+            )
+            total_height += h
+
+        cat_items = grouped.get(cat_id, [])
+        if not cat_items:
+            # small spacer when no items
+            total_height += SPACER_BETWEEN_ITEMS
+            elements_to_draw.append({"type": "spacer", "h": SPACER_BETWEEN_ITEMS})
+            continue
+
+        for prod_name, desc in cat_items:
+            name_para = Paragraph(shape_rtl(prod_name or ""), styles["item_name"])
+            nw, nh = name_para.wrap(card_inner_width, 1000)
+
+            desc_para = Paragraph(shape_rtl(desc) if desc else " ", styles["item_desc"])
+            dw, dh = desc_para.wrap(card_inner_width, 1000)
+
+            # card content height = paddings + para heights
+            card_content_height = CARD_PADDING_TOP + nh + dh + CARD_PADDING_BOTTOM
+
+            # Add shadow offset spacing, and item-to-item spacing
+            total_card_space = (
+                card_content_height + SPACER_BETWEEN_ITEMS + abs(SHADOW_OFFSET_Y)
+            )
+
+            elements_to_draw.append(
+                {
+                    "type": "item_card",
+                    "name_para": name_para,
+                    "desc_para": desc_para,
+                    "card_h": card_content_height,
+                    "name_h": nh,
+                    "desc_h": dh,
+                }
+            )
+
+            total_height += total_card_space
+
+        # Divider between categories
+        total_height += DIVIDER_TOP_BOTTOM * 2 + 1  # line + top/bottom padding
+        elements_to_draw.append({"type": "divider", "h": DIVIDER_TOP_BOTTOM * 2 + 1})
+
+    # Fallback if no menu content (ensure some text)
+    only_paragraphs = [
+        e
+        for e in elements_to_draw
+        if e["type"] in ("header", "category_title", "category_desc", "item_card")
+    ]
+    if len(only_paragraphs) <= 1:
+        empty_para = Paragraph(shape_rtl("منویی موجود نیست"), styles["category_title"])
+        w, h = empty_para.wrap(usable_width, 1000)
+        elements_to_draw.append({"type": "empty", "para": empty_para, "w": w, "h": h})
+        total_height += h
+
+    # Add top & bottom margins
+    total_height += PAGE_MARGIN_TOP + PAGE_MARGIN_BOTTOM
+
+    # Ensure at least the minimal A6 page height
+    page_height_pt = max(min_page_height_pt, total_height)
+
+    # Create canvas with computed single-page size
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(page_width_pt, page_height_pt))
+
+    # Draw background full page
+    c.saveState()
+    c.setFillColor(PAGE_BG)
+    c.rect(0, 0, page_width_pt, page_height_pt, fill=1, stroke=0)
+    c.restoreState()
+
+    # Starting y (top of content)
+    y = page_height_pt - PAGE_MARGIN_TOP
+
+    # Draw elements in order; paragraphs keep the layout from the measure pass
+    for e in elements_to_draw:
+        etype = e["type"]
+
+        if etype == "header":
+            w, h = e["w"], e["h"]
+            # center horizontally
+            x = PAGE_MARGIN_LEFT + (usable_width - w) / 2
+            # draw at y-h (wrap uses top-down)
+            e["para"].drawOn(c, x, y - h)
+            y -= h + SPACER_AFTER_HEADER
+
+        elif etype in ("category_title", "category_desc", "empty"):
+            # Paragraph is RTL and alignment is TA_RIGHT, within margins
+            h = e["h"]
+            e["para"].drawOn(c, PAGE_MARGIN_LEFT, y - h)
+            y -= h
+
+        elif etype == "spacer":
+            y -= e["h"]
+
+        elif etype == "item_card":
+            # card outer coordinates (x,y) => bottom-left of the card rectangle
+            card_h = e["card_h"]
+            card_w = card_width
+
+            # compute positions
+            x_card = PAGE_MARGIN_LEFT
+            y_card_bottom = y - card_h  # because y is top cursor
+            # Draw shadow (slightly offset)
+            c.saveState()
+            c.setFillColor(SHADOW_COLOR)
+            c.roundRect(
+                x_card + SHADOW_OFFSET_X,
+                y_card_bottom + SHADOW_OFFSET_Y,
+                card_w,
+                card_h,
+                CARD_RADIUS,
+                fill=1,
+                stroke=0,
+            )
+            c.restoreState()
+
+            # Draw card background and border
+            c.saveState()
+            c.setFillColor(CARD_BG)
+            c.setStrokeColor(BORDER_COLOR)
+            c.setLineWidth(1)
+            c.roundRect(
+                x_card, y_card_bottom, card_w, card_h, CARD_RADIUS, fill=1, stroke=1
+            )
+            c.restoreState()
+
+            # Inner paragraphs (RTL, right aligned in card_inner_width): name then desc
+            x_inner = x_card + CARD_PADDING_LEFT
+            y_inner_top = y_card_bottom + card_h - CARD_PADDING_TOP
+            nh, dh = e["name_h"], e["desc_h"]
+            e["name_para"].drawOn(c, x_inner, y_inner_top - nh)
+            e["desc_para"].drawOn(c, x_inner, y_inner_top - nh - dh)
+
+            # move cursor down: account for card height plus small item spacing and absolute shadow Y
+            y -= card_h + SPACER_BETWEEN_ITEMS + abs(SHADOW_OFFSET_Y)
+
+        elif etype == "divider":
+            # line centered in the measured top/bottom padding
+            y_line = y - DIVIDER_TOP_BOTTOM
+            c.saveState()
+            c.setStrokeColor(DIVIDER_COLOR)
+            c.setLineWidth(1.2)
+            c.line(PAGE_MARGIN_LEFT, y_line, PAGE_MARGIN_LEFT + usable_width, y_line)
+            c.restoreState()
+            y -= e["h"]
+
+    # Finalize PDF
+    c.showPage()
+    c.save()
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
@@ -0,0 +1,21 @@
+"""
+Pre-render the menu PDF after menu changes.
+
+Artifacts are keyed by content, so this is only a warm-up: a missed
+signal (e.g. a queryset ``update()``) costs one render on the next
+download, never a stale file.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Menu, MenuCategory
+from .tasks import schedule_menu_pdf_regeneration
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+@receiver(post_save, sender=MenuCategory)
+@receiver(post_delete, sender=MenuCategory)
+def regenerate_menu_pdf(sender, **kwargs):
+    schedule_menu_pdf_regeneration()
@@ -0,0 +1,49 @@
+"""
+Background jobs for the menu app.
+
+There is no task queue in this deployment; jobs run on a daemon thread
+started after the triggering transaction commits.
+"""
+
+import logging
+import threading
+
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_pdf_lock = threading.Lock()
+_pdf_pending = threading.Event()
+
+
+def schedule_menu_pdf_regeneration() -> None:
+    """Pre-render the menu PDF once the current transaction commits."""
+    transaction.on_commit(_start_menu_pdf_worker)
+
+
+def _start_menu_pdf_worker() -> None:
+    # Coalesce bursts (admin reorders, bulk edits): one worker drains them
+    _pdf_pending.set()
+    if _pdf_lock.acquire(blocking=False):
+        threading.Thread(
+            target=_regenerate_menu_pdf, name="menu-pdf", daemon=True
+        ).start()
+
+
+def _regenerate_menu_pdf() -> None:
+    from .services import MenuPdfService
+
+    try:
+        while _pdf_pending.is_set():
+            _pdf_pending.clear()
+            try:
+                MenuPdfService.ensure()
+            except Exception:
+                logger.exception("Menu PDF regeneration failed")
+    finally:
+        close_old_connections()
+        _pdf_lock.release()
+
+    # A change that landed while releasing still needs a render
+    if _pdf_pending.is_set():
+        _start_menu_pdf_worker()
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+from apps.core_setting.tests.factories import SiteSettingsFactory
+from apps.inventory.models import Product
+from apps.inventory.services import StockService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from apps.menu.models import MenuCategory
+from apps.menu.services import MenuItemService
+from apps.menu.tests.factories import MenuCategoryFactory, MenuFactory
+from django.core.exceptions import ValidationError
+
+
+def _catalogue(size):
+    """Mix of stocked, recipe-priced and last-price-only products."""
+    products = []
+    for i in range(size):
+        product = ProductFactory(
+            type=Product.ProductType.PROCESSED, last_purchased_price=4 + i
+        )
+        if i % 3 == 0:
+            StockService.add_to_stock(product, Decimal(2 + i), Decimal("10"))
+        elif i % 3 == 1:
+            comp = ProductFactory(last_purchased_price=3)
+            recipe = RecipeFactory(produced_product=product)
+            RecipeComponentFactory(recipe=recipe, consume_product=comp, quantity=2)
+            product.active_recipe = recipe
+            product.save()
+        products.append(product)
+    return products
+
+
+@pytest.mark.django_db
+class TestBatchPricing:
+    def test_extra_prices_match_single_item_api(self):
+        SiteSettingsFactory(profit_margin=50)
+        products = _catalogue(6)
+
+        batch = MenuItemService.extra_req_prices(products)
+
+        for product in products:
+            assert batch[product.pk] == MenuItemService.extra_req_price(product.pk)
+
+    @pytest.mark.parametrize("size", [3, 15])
+    def test_extra_prices_constant_queries(self, size, django_assert_max_num_queries):
+        SiteSettingsFactory()
+        products = _catalogue(size)
+        MenuItemService.extra_req_prices(products)  # build positions lazily
+
+        # positions, components, component positions, settings
+        with django_assert_max_num_queries(4):
+            MenuItemService.extra_req_prices(products)
+
+    def test_suggested_prices_match_single_item_api(self):
+        SiteSettingsFactory(profit_margin=100, tax_rate=10, overhead_bar_value=5)
+        category = MenuCategoryFactory(parent_group=MenuCategory.Group.BAR_ITEM)
+        menus = [
+            MenuFactory(
+                name=ProductFactory(last_purchased_price=10 + i, type="SELLABLE"),
+                category=category,
+            )
+            for i in range(3)
+        ]
+
+        batch = MenuItemService.suggested_prices(m.pk for m in menus)
+
+        assert batch == {m.pk: MenuItemService.suggested_price(m.pk) for m in menus}
+
+    def test_suggested_prices_unknown_menu(self):
+        with pytest.raises(ValidationError):
+            MenuItemService.suggested_prices([999])
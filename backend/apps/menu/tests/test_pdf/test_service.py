@@ -0,0 +1,104 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from api.endpoints.menu_pdf_endpoints import lightweight_pdf
+from apps.menu.services import menu_pdf
+from apps.menu.services.menu_pdf import MenuPdfService
+from apps.menu.tests.factories import MenuCategoryFactory, MenuFactory
+from django.core.files.storage import default_storage
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    real = menu_pdf.render_menu_pdf
+
+    def counting(*args):
+        calls.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(menu_pdf, "render_menu_pdf", counting)
+    return calls
+
+
+@pytest.fixture
+def item(db):
+    return MenuFactory(
+        category=MenuCategoryFactory(), is_available=True, show_in_menu=True
+    )
+
+
+def _age(media, artifact):
+    stale = time.time() - menu_pdf.PRUNE_GRACE.total_seconds() - 60
+    os.utime(media / artifact.path, (stale, stale))
+
+
+@pytest.mark.django_db
+class TestMenuPdfService:
+    def test_renders_once_per_version(self, media, renders, item):
+        first = MenuPdfService.ensure()
+        second = MenuPdfService.ensure()
+
+        assert first == second
+        assert len(renders) == 1
+        with MenuPdfService.open(first) as pdf:
+            assert pdf.read(5) == b"%PDF-"
+
+    def test_menu_change_yields_new_version_and_prunes_old(self, media, item):
+        old = MenuPdfService.ensure()
+        _age(media, old)
+
+        item.description = "Double shot"
+        item.save()
+        new = MenuPdfService.ensure()
+
+        assert new.etag != old.etag
+        assert not default_storage.exists(old.path)
+        assert default_storage.exists(new.path)
+
+    def test_recent_old_version_survives_the_prune(self, media, item):
+        # Another request may have just found it and not opened it yet
+        old = MenuPdfService.ensure()
+
+        item.description = "Double shot"
+        item.save()
+        MenuPdfService.ensure()
+
+        with MenuPdfService.open(old) as pdf:
+            assert pdf.read(5) == b"%PDF-"
+
+    def test_hidden_items_do_not_change_version(self, media, item):
+        etag = MenuPdfService.current_etag()
+
+        MenuFactory(category=item.category, show_in_menu=False)
+
+        assert MenuPdfService.current_etag() == etag
+
+
+@pytest.mark.django_db
+class TestMenuPdfEndpoint:
+    def _call(self, **headers):
+        return lightweight_pdf(SimpleNamespace(headers=headers))
+
+    def test_download_sets_etag(self, media, item):
+        response = self._call()
+
+        assert response.status_code == 200
+        assert response["ETag"] == f'"{MenuPdfService.current_etag()}"'
+        assert b"".join(response.streaming_content).startswith(b"%PDF-")
+
+    def test_matching_etag_is_not_modified(self, media, renders, item):
+        etag = self._call()["ETag"]
+
+        response = self._call(**{"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert len(renders) == 1
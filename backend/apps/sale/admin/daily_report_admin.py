@@ -1,5 +1,3 @@
-import re
-from datetime import timedelta
 from typing import Any
 
 from django import forms
@@ -8,9 +6,9 @@ from django.http.request import HttpRequest
 from django.utils.translation import gettext_lazy as _
 from jalali_date.admin import ModelAdminJalaliMixin
 from jalali_date.widgets import AdminJalaliDateWidget
-from persiantools.jdatetime import JalaliDate
 
 from ...utils.jalali_date_list_filter import JalaliDateFieldListFilter
+from ...utils.jalali_period import parse_jalali_period
 from ..models import DailyReport
 from ..services.report.create_daily_report_service import (
     CreateDailyReportService as CDR,
@@ -53,7 +51,7 @@ class DailyReportAdmin(
     form = DailyReportForm
 
     readonly_fields = ("status",)
-    list_filter = (JalaliDateFieldListFilter,)
+    list_filter = (JalaliDateFieldListFilter.for_field("report_date"),)
 
     def save_form(self, request: HttpRequest, form: Any, change: Any) -> Any:
         super().save_form(request, form, change)
@@ -72,34 +70,10 @@ class DailyReportAdmin(
             notes=n,
         )
 
-    #
-    def _parse_jalali_range(self, term: str):
-        term = term.strip()
-        m = re.match(r"^(\d{4})(?:[\/-](\d{1,2})(?:[\/-](\d{1,2}))?)?$", term)
-        if not m:
-            return None
-        y = int(m.group(1))
-        mm = m.group(2)
-        dd = m.group(3)
-        if mm is None:
-            start = JalaliDate(y, 1, 1).to_gregorian()
-            end = JalaliDate(y + 1, 1, 1).to_gregorian()
-        elif dd is None:
-            month = int(mm)
-            start = JalaliDate(y, month, 1).to_gregorian()
-            if month == 12:
-                end = JalaliDate(y + 1, 1, 1).to_gregorian()
-            else:
-                end = JalaliDate(y, month + 1, 1).to_gregorian()
-        else:
-            start = JalaliDate(y, int(mm), int(dd)).to_gregorian()
-            end = start + timedelta(days=1)
-        return start, end
-
     def get_search_results(self, request, queryset, search_term):
         qs, use_distinct = super().get_search_results(request, queryset, search_term)
 
-        r = self._parse_jalali_range(search_term)
+        r = parse_jalali_period(search_term)
         if r:
             start, end = r
             qs |= queryset.filter(report_date__gte=start, report_date__lt=end)
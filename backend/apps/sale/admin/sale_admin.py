@@ -5,4 +5,25 @@ from ..models import Sale
 
 @admin.register(Sale)
 class SaleAdmin(admin.ModelAdmin):
-    pass
+    # Payment ledger columns, maintained by SaleLedgerService only
+    readonly_fields = (
+        "paid_subtotal",
+        "paid_tax",
+        "paid_discount",
+        "paid_tip",
+        "refunded_amount",
+    )
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+
+        # Never write back the ledger as it was when the form was loaded
+        obj.save(
+            update_fields=[
+                field.name
+                for field in obj._meta.concrete_fields
+                if field.editable and not field.primary_key
+            ]
+            + ["updated_at"]
+        )
@@ -1,8 +1,22 @@
 from django.contrib import admin
 
 from ..models import SaleItem
+from ..services.sale.sale_detail import SaleDetailService
 
 
 @admin.register(SaleItem)
 class SaleItemAdmin(admin.ModelAdmin):
-    pass
+    # Line edits change a closed sale's stored detail too
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        SaleDetailService.invalidate(obj.sale_id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        SaleDetailService.invalidate(obj.sale_id)
+
+    def delete_queryset(self, request, queryset):
+        sale_ids = set(queryset.values_list("sale_id", flat=True))
+        super().delete_queryset(request, queryset)
+        for sale_id in sale_ids:
+            SaleDetailService.invalidate(sale_id)
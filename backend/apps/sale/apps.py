@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SaleConfig(AppConfig):
     name = "apps.sale"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,154 @@
+"""
+Measure the daily report's expected-amount aggregation on a synthetic day.
+
+The synthetic sales, payments, refunds and purchases are written inside a
+transaction that is rolled back, so the database is left untouched.
+
+Usage:
+    python manage.py benchmark_daily_report                 # 5,000 sales
+    python manage.py benchmark_daily_report --sales 20000 --repeat 10
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from time import perf_counter
+
+from apps.inventory.models import Product, PurchaseInvoice, PurchaseItem
+from apps.sale.models import Sale, SaleItem, SalePayment, SaleRefund
+from apps.sale.services.report.create_daily_report_service import (
+    CreateDailyReportService,
+)
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+User = get_user_model()
+
+METHODS = SalePayment.PaymentMethod.values
+
+
+class Command(BaseCommand):
+    help = "Benchmark CreateDailyReportService aggregation on N synthetic sales."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sales", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            default=date(2000, 1, 1),
+            help="Business date to fill; pick one without real data.",
+        )
+
+    def handle(self, *args, sales, repeat, date, **options):
+        day_start, day_end = CreateDailyReportService._calculate_business_day_range(
+            date
+        )
+
+        with transaction.atomic():
+            started = perf_counter()
+            self._fill_day(sales, date, day_start)
+            self.stdout.write(f"synthetic day built in {perf_counter() - started:.1f}s")
+
+            timings = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries:
+                    started = perf_counter()
+                    result = CreateDailyReportService._calculate_expected_amounts(
+                        day_start, day_end
+                    )
+                    timings.append(perf_counter() - started)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{sales} sales: best {min(timings) * 1000:.1f} ms, "
+            f"worst {max(timings) * 1000:.1f} ms over {repeat} runs, "
+            f"{len(queries)} queries"
+        )
+        self.stdout.write(
+            f"total_sales={result['total_sales']} cogs={result['cogs']} "
+            f"expenses={result['expenses']}"
+        )
+
+    @staticmethod
+    def _fill_day(count: int, report_date: date, day_start) -> None:
+        staff = User.objects.create_user(
+            mobile="09000000000", name="benchmark", is_staff=True
+        )
+        products = Product.objects.bulk_create(
+            Product(name=f"benchmark {i}", type=Product.ProductType.SELLABLE)
+            for i in range(10)
+        )
+
+        opened_at = day_start + timedelta(hours=8)
+        sales = Sale.objects.bulk_create(
+            Sale(
+                state=Sale.SaleState.CLOSED,
+                sale_type=Sale.SaleType.TAKEAWAY,
+                opened_by=staff,
+                closed_by=staff,
+                opened_at=opened_at,
+                closed_at=opened_at,
+                subtotal_amount=Decimal(150 + i % 7 * 10),
+                paid_subtotal=Decimal(150 + i % 7 * 10),
+                paid_tax=Decimal(i % 3 * 5),
+                paid_discount=Decimal(i % 4),
+                payment_status=Sale.PaymentStatus.PAID,
+            )
+            for i in range(count)
+        )
+        # created_at is auto_now_add: move the day's sales into place afterwards
+        Sale.objects.filter(pk__in=[s.pk for s in sales]).update(created_at=opened_at)
+
+        SaleItem.objects.bulk_create(
+            SaleItem(
+                sale=sale,
+                product=products[(i + j) % len(products)],
+                quantity=1 + j,
+                unit_price=50,
+                material_cost=12 + j,
+            )
+            for i, sale in enumerate(sales)
+            for j in range(3)
+        )
+        payments = SalePayment.objects.bulk_create(
+            SalePayment(
+                sale=sale,
+                method=METHODS[(i + j) % len(METHODS)],
+                amount_applied=sale.subtotal_amount / 2,
+                tax_amount=sale.paid_tax / 2,
+                discount_amount=sale.paid_discount / 2,
+                tip_amount=Decimal(i % 5),
+                confirmed=i % 2 == 0,
+                received_by=staff,
+                received_at=opened_at,
+            )
+            for i, sale in enumerate(sales)
+            for j in range(2)
+        )
+        SaleRefund.objects.bulk_create(
+            SaleRefund(
+                payment=payment,
+                amount=Decimal("10"),
+                method=payment.method,
+                processed_by=staff,
+                processed_at=opened_at,
+            )
+            for payment in payments[::50]
+        )
+
+        invoices = PurchaseInvoice.objects.bulk_create(
+            PurchaseInvoice(issue_date=report_date, staff=staff) for _ in range(40)
+        )
+        PurchaseItem.objects.bulk_create(
+            PurchaseItem(
+                purchase_invoice=invoice,
+                purchased_product=product,
+                quantity=Decimal("2.5"),
+                purchased_unit_price=Decimal("18.75"),
+            )
+            for invoice in invoices
+            for product in products
+        )
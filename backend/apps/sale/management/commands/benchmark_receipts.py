@@ -0,0 +1,75 @@
+"""
+Measure ESC/POS receipt rendering throughput.
+
+Usage:
+    python manage.py benchmark_receipts                 # 1,000 receipts
+    python manage.py benchmark_receipts --count 5000 --width 32
+"""
+
+from datetime import datetime, timezone
+from time import perf_counter
+
+from apps.sale.models import PrintQueue, Sale
+from apps.sale.services.print_queue import ReceiptData, ReceiptLine, ReceiptRenderer
+from apps.utils.rtl import clear_shape_rtl_cache, shape_rtl_cache_info
+from django.core.management.base import BaseCommand
+
+SAMPLE_NAMES = (
+    "اسپرسو دبل",
+    "کاپوچینو",
+    "لاته کارامل",
+    "چای ماسالا",
+    "کیک شکلاتی",
+    "ساندویچ مرغ",
+    "آب معدنی",
+    "موکا",
+)
+
+
+def sample_receipt(sale_id: int) -> ReceiptData:
+    lines = tuple(
+        ReceiptLine(
+            name=name,
+            quantity=1 + i % 3,
+            unit_price=85_000 + 5_000 * i,
+            extras=(ReceiptLine("شیر بادام", 1, 20_000),) if i % 3 == 0 else (),
+        )
+        for i, name in enumerate(SAMPLE_NAMES)
+    )
+    return ReceiptData(
+        sale_id=sale_id,
+        sale_type=Sale.SaleType.DINE_IN,
+        opened_at=datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc),
+        lines=lines,
+        subtotal=sum(line.total for line in lines),
+        table_name="۱۲",
+        guest_count=4,
+    )
+
+
+class Command(BaseCommand):
+    help = "Benchmark rendering N receipts (layout + RTL shaping, no database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--width", type=int, choices=(32, 48), default=48)
+
+    def handle(self, *args, count, width, **options):
+        receipts = [sample_receipt(i) for i in range(1, count + 1)]
+        clear_shape_rtl_cache()
+
+        started = perf_counter()
+        size = 0
+        for data in receipts:
+            size += len(
+                ReceiptRenderer.render(data, PrintQueue.PrintType.STANDARD, width=width)
+            )
+        elapsed = perf_counter() - started
+
+        info = shape_rtl_cache_info()
+        self.stdout.write(
+            f"{count} receipts in {elapsed:.3f}s "
+            f"({count / elapsed:.0f}/s, {elapsed / count * 1000:.3f} ms each, "
+            f"{size / count:.0f} bytes each)"
+        )
+        self.stdout.write(f"shaping cache: hits={info.hits} misses={info.misses}")
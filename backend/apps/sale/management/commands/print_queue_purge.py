@@ -0,0 +1,73 @@
+"""
+Delete old, settled print jobs and report print queue size.
+
+Usage:
+    python manage.py print_queue_purge                   # PRINTED > 30 days
+    python manage.py print_queue_purge --days 7 --include-failed
+    python manage.py print_queue_purge --dry-run         # only report
+"""
+
+from datetime import timedelta
+
+from apps.sale.models import PrintQueue
+from apps.sale.services import PrintQueueService
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Purge printed (and optionally failed) print jobs older than N days."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Keep jobs created within this many days.",
+        )
+        parser.add_argument(
+            "--include-failed",
+            action="store_true",
+            help="Also purge FAILED jobs.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be purged without deleting.",
+        )
+
+    def handle(self, *args, days, include_failed, batch_size, dry_run, **options):
+        if days < 1 or batch_size < 1:
+            raise CommandError("--days and --batch-size must be positive.")
+
+        statuses = [PrintQueue.PrintStatus.PRINTED]
+        if include_failed:
+            statuses.append(PrintQueue.PrintStatus.FAILED)
+        older_than = timezone.now() - timedelta(days=days)
+
+        self._report("Before", PrintQueueService.table_stats())
+
+        if dry_run:
+            count = PrintQueue.objects.filter(
+                status__in=statuses, created_at__lt=older_than
+            ).count()
+            self.stdout.write(f"Would purge {count} job(s).")
+            return
+
+        purged = PrintQueueService.purge(
+            older_than=older_than, statuses=statuses, batch_size=batch_size
+        )
+        self._report("After", PrintQueueService.table_stats())
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} job(s)."))
+
+    def _report(self, label, stats):
+        rows = ", ".join(f"{k}={v}" for k, v in sorted(stats["rows"].items()))
+        size = stats["total_bytes"]
+        size = f", {size / 1024:.0f} KiB on disk" if size is not None else ""
+        self.stdout.write(f"{label}: {rows or 'empty'}{size}")
@@ -0,0 +1,86 @@
+"""
+Verify or rebuild the denormalized payment ledger on Sale.
+
+Usage:
+    python manage.py sale_ledger                 # report drifted sales
+    python manage.py sale_ledger --rebuild       # fix drifted sales
+    python manage.py sale_ledger --sale 12 13    # limit to some sales
+"""
+
+from apps.sale.models import Sale
+from apps.sale.services.payment.ledger_service import (
+    LEDGER_FIELDS,
+    LedgerTotals,
+    SaleLedgerService,
+)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = "Verify (and optionally rebuild) cached payment totals on sales."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Overwrite drifted ledger columns with recomputed totals.",
+        )
+        parser.add_argument(
+            "--sale",
+            nargs="+",
+            type=int,
+            dest="sale_ids",
+            help="Only check these sale IDs.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of sales recomputed per round trip.",
+        )
+
+    def handle(self, *args, rebuild, sale_ids, batch_size, **options):
+        qs = Sale.objects.order_by("pk").only("pk", *LEDGER_FIELDS)
+        if sale_ids:
+            qs = qs.filter(pk__in=sale_ids)
+
+        checked = drifted = 0
+        batch = []
+        for sale in qs.iterator(chunk_size=batch_size):
+            batch.append(sale)
+            if len(batch) >= batch_size:
+                drifted += self._process(batch, rebuild)
+                checked += len(batch)
+                batch = []
+        if batch:
+            drifted += self._process(batch, rebuild)
+            checked += len(batch)
+
+        verb = "Rebuilt" if rebuild else "Found"
+        self.stdout.write(f"Checked {checked} sales. {verb} {drifted} drifted.")
+
+        if drifted and not rebuild:
+            raise CommandError("Ledger drift detected; run with --rebuild to fix.")
+
+    def _process(self, sales, rebuild: bool) -> int:
+        expected = SaleLedgerService.compute_many(s.pk for s in sales)
+        drifted = 0
+
+        with transaction.atomic():
+            for sale in sales:
+                diff = LedgerTotals.of_sale(sale).diff(expected[sale.pk])
+                if not diff:
+                    continue
+
+                drifted += 1
+                details = ", ".join(
+                    f"{f}: {stored} != {actual}" for f, (stored, actual) in diff.items()
+                )
+                self.stdout.write(f"Sale #{sale.pk}: {details}")
+
+                if rebuild:
+                    Sale.objects.filter(pk=sale.pk).update(
+                        **{f: getattr(expected[sale.pk], f) for f in LEDGER_FIELDS}
+                    )
+        return drifted
@@ -0,0 +1,87 @@
+"""
+Verify, backfill or rebuild the business-day sales rollups.
+
+Usage:
+    python manage.py sales_rollup                   # report drifted days
+    python manage.py sales_rollup --rebuild         # backfill / fix every day
+    python manage.py sales_rollup --from 2025-01-01 --to 2025-01-31 --rebuild
+"""
+
+from datetime import date, timedelta
+
+from apps.sale.models import Sale, SalePayment, SaleRefund
+from apps.sale.services.report.sales_rollup_service import (
+    SalesRollupService,
+    business_date_of,
+)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Verify (and optionally rebuild) pre-aggregated business-day sales totals."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Overwrite drifted or missing days with recomputed totals.",
+        )
+        parser.add_argument(
+            "--from",
+            type=date.fromisoformat,
+            dest="start",
+            help="First business date (default: first day with sales activity).",
+        )
+        parser.add_argument(
+            "--to",
+            type=date.fromisoformat,
+            dest="end",
+            help="Last business date (default: today).",
+        )
+
+    def handle(self, *args, rebuild, start, end, **options):
+        start = start or self._first_active_date()
+        end = end or business_date_of(timezone.now())
+        if start is None:
+            self.stdout.write("No sales activity yet.")
+            return
+
+        if rebuild:
+            built = SalesRollupService.ensure_days(start, end)
+            self.stdout.write(f"Built {built} missing days.")
+
+        checked = drifted = 0
+        business_date = start
+        while business_date <= end:
+            checked += 1
+            with transaction.atomic():
+                drift = SalesRollupService.verify_day(business_date)
+                if drift:
+                    drifted += 1
+                    details = ", ".join(
+                        f"{f}: {stored} != {actual}"
+                        for f, (stored, actual) in drift.items()
+                    )
+                    self.stdout.write(f"{business_date}: {details}")
+                    if rebuild:
+                        SalesRollupService.rebuild_day(business_date)
+            business_date += timedelta(days=1)
+
+        verb = "Rebuilt" if rebuild else "Found"
+        self.stdout.write(f"Checked {checked} days. {verb} {drifted} drifted.")
+
+        if drifted and not rebuild:
+            raise CommandError("Rollup drift detected; run with --rebuild to fix.")
+
+    @staticmethod
+    def _first_active_date():
+        firsts = [
+            Sale.objects.aggregate(first=Min("created_at"))["first"],
+            SalePayment.objects.aggregate(first=Min("received_at"))["first"],
+            SaleRefund.objects.aggregate(first=Min("processed_at"))["first"],
+        ]
+        firsts = [moment for moment in firsts if moment is not None]
+        return business_date_of(min(firsts)) if firsts else None
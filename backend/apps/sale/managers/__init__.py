@@ -1,3 +1,5 @@
 from .daily_financial_report import ReportManager
+from .daily_report import DailyReportManager
+from .sale import SaleManager
 
-__all__ = ("ReportManager",)
+__all__ = ("DailyReportManager", "ReportManager", "SaleManager")
@@ -0,0 +1,25 @@
+from django.db import models
+
+from ...utils.jalali_period import JalaliManagerMixin, JalaliQuerySetMixin
+
+
+class DailyReportQuerySet(JalaliQuerySetMixin, models.QuerySet):
+    jalali_date_field = "report_date"
+
+    def with_details(self):
+        """
+        Reports ready for the details view: users joined, and the payment
+        method rows prefetched so every reconciliation property reads
+        ``payment_method_map`` instead of querying.
+        """
+        return self.select_related("created_by", "approved_by").prefetch_related(
+            "payment_methods"
+        )
+
+
+class DailyReportManager(JalaliManagerMixin, models.Manager):
+    def get_queryset(self):
+        return DailyReportQuerySet(self.model, using=self._db)
+
+    def with_details(self):
+        return self.get_queryset().with_details()
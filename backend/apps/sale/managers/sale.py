@@ -0,0 +1,72 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce, NullIf
+
+from ...utils.jalali_period import JalaliManagerMixin, JalaliQuerySetMixin
+
+MONEY = models.DecimalField(max_digits=12, decimal_places=2)
+
+
+def _display_name(relation: str):
+    """Account name, falling back to mobile when the name is blank."""
+    return Coalesce(
+        NullIf(F(f"{relation}__name"), Value("")),
+        F(f"{relation}__mobile"),
+    )
+
+
+class SaleQuerySet(JalaliQuerySetMixin, models.QuerySet):
+    jalali_date_field = "opened_at"
+
+    def for_dashboard(self):
+        """
+        Everything the dashboard card needs, in a single SELECT.
+
+        Money values come from the ledger columns, display names are
+        resolved in SQL so the related Account rows are never loaded.
+        """
+        return (
+            self.annotate(
+                table_name=F("table__name"),
+                guest_name=_display_name("guest"),
+                opened_by_name=_display_name("opened_by"),
+                total_due=models.ExpressionWrapper(
+                    F("subtotal_amount") - F("paid_discount") + F("paid_tax"),
+                    output_field=MONEY,
+                ),
+                remaining=Case(
+                    When(
+                        subtotal_amount__gt=F("paid_subtotal"),
+                        then=F("subtotal_amount") - F("paid_subtotal"),
+                    ),
+                    default=Value(Decimal("0")),
+                    output_field=MONEY,
+                ),
+            )
+            .only(
+                "id",
+                "state",
+                "payment_status",
+                "opened_at",
+            )
+            .order_by("-opened_at", "-id")
+        )
+
+    def before(self, opened_at: datetime, pk: int):
+        """
+        Keyset page boundary for ``-opened_at, -id`` ordering.
+        """
+        return self.filter(
+            Q(opened_at__lt=opened_at) | Q(opened_at=opened_at, id__lt=pk)
+        )
+
+
+class SaleManager(JalaliManagerMixin, models.Manager):
+    def get_queryset(self):
+        return SaleQuerySet(self.model, using=self._db)
+
+    def for_dashboard(self):
+        return self.get_queryset().for_dashboard()
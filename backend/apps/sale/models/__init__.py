@@ -2,18 +2,23 @@ from .daily_report_model import DailyReport
 from .daily_report_payment_method_model import DailyReportPaymentMethod
 from .print_queue_model import PrintQueue
 from .sale import Sale
+from .sale_detail_snapshot_model import SaleDetailSnapshot
 from .sale_discount_model import SaleDiscount
 from .sale_item import SaleItem
 from .sale_payment_model import SalePayment
 from .sale_refund_model import SaleRefund
+from .sales_rollup_model import BusinessDayRollup, BusinessHourRollup
 
 __all__ = (
     "SaleItem",
     "Sale",
+    "SaleDetailSnapshot",
     "SaleDiscount",
     "SalePayment",
     "SaleRefund",
     "DailyReport",
     "DailyReportPaymentMethod",
     "PrintQueue",
+    "BusinessDayRollup",
+    "BusinessHourRollup",
 )
@@ -7,9 +7,10 @@ from django.db import models
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from persiantools.jdatetime import JalaliDate
 from simple_history.models import HistoricalRecords
 
+from ...utils.jalali_period import format_jalali_date
+from ..managers import DailyReportManager
 from .sale_payment_model import SalePayment
 
 User = get_user_model()
@@ -160,6 +161,8 @@ class DailyReport(models.Model):
     # ---- History ----
     history = HistoricalRecords()
 
+    objects = DailyReportManager()
+
     class Meta:
         verbose_name = _("Daily report")
         verbose_name_plural = _("Daily reports")
@@ -174,6 +177,22 @@ class DailyReport(models.Model):
     def __str__(self):
         return self.jalali_report_date
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "status" in field_names:
+            instance._stored_status = instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._stored_status = self.status
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.__dict__.pop("payment_method_map", None)
+        self._stored_status = self.status
+
     def clean(self):
         """Validate report data."""
         super().clean()
@@ -181,12 +200,19 @@ class DailyReport(models.Model):
         if self.approved_at and self.approved_at < self.created_at:
             raise ValidationError(_("Approved date cannot be before created date"))
 
-        # Validate status transitions
+        # Validate status transitions against the status last read or saved
         if self.pk:  # Existing record
-            old_instance = DailyReport.objects.get(pk=self.pk)
+            old_status = getattr(self, "_stored_status", None)
+            if old_status is None:
+                old_status = (
+                    DailyReport.objects.filter(pk=self.pk)
+                    .values_list("status", flat=True)
+                    .first()
+                )
             if (
-                old_instance.status != DailyReport.ReportStatus.DRAFT
-                and old_instance.status != self.status
+                old_status is not None
+                and old_status != DailyReport.ReportStatus.DRAFT
+                and old_status != self.status
             ):
                 raise ValidationError(_("Cannot edit report after submission."))
 
@@ -194,7 +220,7 @@ class DailyReport(models.Model):
     @cached_property
     @admin.display(description=_("Jalali report date"))
     def jalali_report_date(self):
-        return JalaliDate(self.report_date).strftime("%c", locale="fa")
+        return format_jalali_date(self.report_date)
 
     @property
     def total_revenue(self) -> Decimal:
@@ -221,41 +247,43 @@ class DailyReport(models.Model):
         """Net cash = closing cash - opening float."""
         return self.closing_cash_counted - self.opening_float
 
+    @cached_property
+    def payment_method_map(self) -> dict:
+        """
+        Payment method rows keyed by method.
+
+        Uses the prefetched rows of ``DailyReport.objects.with_details()``,
+        otherwise loads them in one query.
+        """
+        return {row.payment_method: row for row in self.payment_methods.all()}
+
+    def _payment_method(self, method: str):
+        try:
+            return self.payment_method_map[method]
+        except KeyError:
+            raise self.payment_methods.model.DoesNotExist(
+                f"No {method} row for report {self.pk}"
+            ) from None
+
     @property
     def expected_cash_total(self) -> Decimal:
         """
         Expected cash from payments.
         Calculated from payment_methods where method=CASH.
         """
-        return (
-            self.payment_methods.select_related("daily_report")
-            .get(payment_method=SalePayment.PaymentMethod.CASH)
-            .expected_amount
-        )
+        return self._payment_method(SalePayment.PaymentMethod.CASH).expected_amount
 
     @property
     def actual_pos_total(self) -> Decimal:
-        return (
-            self.payment_methods.select_related("daily_report")
-            .get(payment_method=SalePayment.PaymentMethod.POS)
-            .actual_amount
-        )
+        return self._payment_method(SalePayment.PaymentMethod.POS).actual_amount
 
     @property
     def pos_variance(self) -> Decimal:
-        return (
-            self.payment_methods.select_related("daily_report")
-            .get(payment_method=SalePayment.PaymentMethod.POS)
-            .variance
-        )
+        return self._payment_method(SalePayment.PaymentMethod.POS).variance
 
     @property
     def card_transfer_variance(self) -> Decimal:
-        return (
-            self.payment_methods.select_related("daily_report")
-            .get(payment_method=SalePayment.PaymentMethod.CARD_TRANSFER)
-            .variance
-        )
+        return self._payment_method(SalePayment.PaymentMethod.CARD_TRANSFER).variance
 
     @property
     def cash_variance(self) -> Decimal:
@@ -265,9 +293,10 @@ class DailyReport(models.Model):
     @property
     def total_variance(self) -> Decimal:
         """Total variance across all payment methods."""
-        return self.payment_methods.aggregate(total=models.Sum("variance"))[
-            "total"
-        ] or Decimal("0.0000")
+        return sum(
+            (row.variance for row in self.payment_method_map.values()),
+            Decimal("0.0000"),
+        )
 
     @property
     def is_editable(self) -> bool:
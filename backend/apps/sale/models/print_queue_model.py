@@ -6,9 +6,11 @@ and cafe PCs can monitor and auto-print from.
 
 Workflow:
 1. Mobile device saves a sale and adds print data to queue (status=PENDING)
-2. Cafe PC polls the queue endpoint to get pending print jobs
+2. Cafe PC long-polls the wait endpoint, which returns as soon as jobs are queued
+   (or claims a batch, leased to that agent: status=IN_PROGRESS)
 3. Cafe PC prints the receipt and marks the job as PRINTED
-4. Old completed jobs are periodically cleaned up
+   (an unacknowledged lease expires and the job is handed out again)
+4. Old completed jobs are periodically purged (``manage.py print_queue_purge``)
 """
 
 from django.db import models
@@ -26,6 +28,7 @@ class PrintQueue(models.Model):
 
     class PrintStatus(models.TextChoices):
         PENDING = "PENDING", _("Pending")
+        IN_PROGRESS = "IN_PROGRESS", _("In progress")
         PRINTED = "PRINTED", _("Printed")
         FAILED = "FAILED", _("Failed")
 
@@ -75,13 +78,26 @@ class PrintQueue(models.Model):
 
     # Status tracking
     status = models.CharField(
-        max_length=10,
+        max_length=12,
         choices=PrintStatus.choices,
         default=PrintStatus.PENDING,
         db_index=True,
         help_text="Current status of the print job",
     )
 
+    # Lease (set while a printer agent holds the job)
+    claimed_by = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Printer agent currently holding the job",
+    )
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When an unacknowledged claim returns the job to the queue",
+    )
+
     # Timestamps
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -112,6 +128,12 @@ class PrintQueue(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["status", "created_at"]),
+            # Agents' hot path (pending / claim) stays small as history grows
+            models.Index(
+                fields=["printer_target", "created_at"],
+                condition=models.Q(status__in=["PENDING", "IN_PROGRESS"]),
+                name="print_queue_open_idx",
+            ),
         ]
         verbose_name = _("Print Queue")
         verbose_name_plural = _("Print Queue")
@@ -119,21 +141,36 @@ class PrintQueue(models.Model):
     def __str__(self):
         return f"Print Job {self.pk} - {self.print_type} ({self.status})"
 
+    # Status changes are single UPDATEs so concurrent agents can't
+    # overwrite each other's load-then-save.
     def mark_as_printed(self):
         """Mark this print job as successfully printed."""
         self.status = self.PrintStatus.PRINTED
         self.printed_at = timezone.now()
-        self.save(update_fields=["status", "printed_at"])
+        self.lease_expires_at = None
+        self._update("status", "printed_at", "lease_expires_at")
 
     def mark_as_failed(self, error_message: str):
         """Mark this print job as failed."""
         self.status = self.PrintStatus.FAILED
         self.error_message = error_message
-        self.retry_count += 1
-        self.save(update_fields=["status", "error_message", "retry_count"])
+        self.lease_expires_at = None
+        self._update(
+            "status",
+            "error_message",
+            "lease_expires_at",
+            retry_count=models.F("retry_count") + 1,
+        )
+        self.refresh_from_db(fields=["retry_count"])
 
     def retry(self):
         """Reset job to pending for retry."""
         self.status = self.PrintStatus.PENDING
         self.error_message = None
-        self.save(update_fields=["status", "error_message"])
+        self.claimed_by = ""
+        self.lease_expires_at = None
+        self._update("status", "error_message", "claimed_by", "lease_expires_at")
+
+    def _update(self, *fields, **expressions):
+        values = {name: getattr(self, name) for name in fields}
+        type(self).objects.filter(pk=self.pk).update(**values, **expressions)
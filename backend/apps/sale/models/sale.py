@@ -7,6 +7,8 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 
+from ..managers import SaleManager
+
 User = get_user_model()
 
 
@@ -133,6 +135,50 @@ class Sale(models.Model):
         db_index=True,
     )
 
+    # ---- Payment ledger (denormalized from COMPLETED payments) ----
+    # Maintained atomically by SaleLedgerService; never edit by hand.
+    # ``python manage.py sale_ledger --rebuild`` recomputes them from payments.
+
+    paid_subtotal = models.DecimalField(
+        editable=False,
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0"),
+        help_text=_("Sum of amount_applied over completed payments"),
+    )
+
+    paid_tax = models.DecimalField(
+        editable=False,
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0"),
+        help_text=_("Sum of tax over completed payments"),
+    )
+
+    paid_discount = models.DecimalField(
+        editable=False,
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0"),
+        help_text=_("Sum of discount over completed payments"),
+    )
+
+    paid_tip = models.DecimalField(
+        editable=False,
+        max_digits=12,
+        decimal_places=4,
+        default=Decimal("0"),
+        help_text=_("Sum of tips over completed payments"),
+    )
+
+    refunded_amount = models.DecimalField(
+        editable=False,
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0"),
+        help_text=_("Sum of completed refunds against this sale's payments"),
+    )
+
     # ==================== NOTES ====================
 
     note = models.TextField(blank=True, default="")
@@ -147,8 +193,17 @@ class Sale(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SaleManager()
     history = HistoricalRecords()
 
+    class Meta:
+        indexes = [
+            # Dashboard keyset pagination: WHERE state = ? ORDER BY opened_at, id
+            models.Index(
+                fields=["state", "-opened_at", "-id"], name="sale_dashboard_idx"
+            ),
+        ]
+
     # ==================== DERIVED PROPERTIES ====================
 
     @property
@@ -157,18 +212,14 @@ class Sale(models.Model):
         Sum of amounts applied toward subtotal.
         This is the ONLY value used to determine payment completion.
         """
-        from django.db.models import Sum
-
-        return self.payments.filter(status="COMPLETED").aggregate(
-            total=Sum("amount_applied")
-        )["total"] or Decimal("0")
+        return self.paid_subtotal
 
     @property
     def remaining_subtotal(self) -> Decimal:
         """
         Remaining amount required to fully cover subtotal.
         """
-        return max(self.subtotal_amount - self.subtotal_paid, Decimal("0"))
+        return max(self.subtotal_amount - self.paid_subtotal, Decimal("0"))
 
     @property
     def is_fully_paid(self) -> bool:
@@ -182,22 +233,21 @@ class Sale(models.Model):
         """
         Derived total tax from all completed payments.
         """
-        from django.db.models import Sum
-
-        return self.payments.filter(status="COMPLETED").aggregate(
-            total=Sum("tax_amount")
-        )["total"] or Decimal("0")
+        return self.paid_tax
 
     @property
     def discount_amount(self) -> Decimal:
         """
         Derived total discount from all completed payments.
         """
-        from django.db.models import Sum
+        return self.paid_discount
 
-        return self.payments.filter(status="COMPLETED").aggregate(
-            total=Sum("discount_amount")
-        )["total"] or Decimal("0")
+    @property
+    def tip_amount(self) -> Decimal:
+        """
+        Derived total tip from all completed payments.
+        """
+        return self.paid_tip
 
     @property
     def total_amount(self) -> Decimal:
@@ -223,11 +273,11 @@ class Sale(models.Model):
         if self.subtotal_amount < 0:
             raise ValidationError(_("Subtotal cannot be negative"))
 
-        if self.sale_type == self.SaleType.DINE_IN and not self.table:
+        if self.sale_type == self.SaleType.DINE_IN and not self.table_id:
             raise ValidationError(_("Dine-in sales must have a table"))
 
         if self.state == self.SaleState.CLOSED:
-            if not self.closed_by or not self.closed_at:
+            if not self.closed_by_id or not self.closed_at:
                 raise ValidationError(
                     _("Closed sale must have closed_by and closed_at")
                 )
@@ -238,7 +288,11 @@ class Sale(models.Model):
                 )
 
         if self.state == self.SaleState.CANCELED:
-            if not self.canceled_by or not self.canceled_at or not self.cancel_reason:
+            if (
+                not self.canceled_by_id
+                or not self.canceled_at
+                or not self.cancel_reason
+            ):
                 raise ValidationError(_("Canceled sale must have cancel metadata"))
 
     def save(self, *args, **kwargs):
@@ -260,7 +314,12 @@ class Sale(models.Model):
             else:
                 self.gross_margin_percent = Decimal("0.00")
 
-        self.full_clean()
+        if kwargs.get("update_fields") is None:
+            self.full_clean()
+        else:
+            # Partial writes come from services that already validated their
+            # fields; re-checking every column would re-query each FK
+            self.clean()
         super().save(*args, **kwargs)
 
     def __str__(self) -> str:
@@ -0,0 +1,31 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class SaleDetailSnapshot(models.Model):
+    """
+    Serialized detail payload of a CLOSED sale.
+
+    Written when the sale closes and served instead of rebuilding the item
+    hierarchy; removed whenever the sale's payment ledger moves (voids,
+    refunds). See ``SaleDetailService``.
+    """
+
+    sale = models.OneToOneField(
+        "sale.Sale",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="detail_snapshot",
+    )
+    payload = models.JSONField(_("Payload"), encoder=DjangoJSONEncoder)
+    version = models.PositiveSmallIntegerField(_("Layout version"))
+    created_at = models.DateTimeField(_("Created at"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Sale detail snapshot")
+        verbose_name_plural = _("Sale detail snapshots")
+
+    def __str__(self) -> str:
+        return f"Snapshot of sale #{self.sale_id}"
@@ -0,0 +1,119 @@
+from decimal import Decimal
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .sale_payment_model import SalePayment
+
+
+def _amount(verbose_name, help_text=""):
+    return models.DecimalField(
+        verbose_name,
+        max_digits=14,
+        decimal_places=4,
+        default=Decimal("0"),
+        help_text=help_text,
+    )
+
+
+class RollupTotals(models.Model):
+    """
+    Sales totals of one business-day bucket.
+
+    Sale columns count CLOSED sales by their creation time, payment and
+    refund columns count COMPLETED rows by the time they were received or
+    processed (the same attribution as ``CreateDailyReportService``).
+    """
+
+    # ---- Closed sales ----
+    sales_count = models.PositiveIntegerField(_("Sales count"), default=0)
+    gross_sales = _amount(_("Gross sales"), _("Sum of sale subtotals"))
+    discounts = _amount(_("Discounts"))
+    tax = _amount(_("Tax"))
+    cogs = _amount(_("Cost of goods sold"))
+
+    # ---- Payments (amount applied) ----
+    cash_payments = _amount(_("Cash payments"))
+    pos_payments = _amount(_("POS payments"))
+    card_transfer_payments = _amount(_("Card transfer payments"))
+    card_transfer_confirmed = _amount(
+        _("Confirmed card transfers"),
+        _("Full amount (applied + tax - discount + tip) of confirmed transfers"),
+    )
+    tips = _amount(_("Tips"))
+
+    # ---- Refunds ----
+    cash_refunds = _amount(_("Cash refunds"))
+    pos_refunds = _amount(_("POS refunds"))
+    card_transfer_refunds = _amount(_("Card transfer refunds"))
+
+    class Meta:
+        abstract = True
+
+    @property
+    def total_sales(self) -> Decimal:
+        """Same as summing ``Sale.total_amount``: subtotal - discount + tax."""
+        return self.gross_sales - self.discounts + self.tax
+
+    @property
+    def total_refunds(self) -> Decimal:
+        return self.cash_refunds + self.pos_refunds + self.card_transfer_refunds
+
+    def net_by_method(self) -> dict[str, Decimal]:
+        """Payments minus refunds, per payment method."""
+        return {
+            method: getattr(self, f"{method.lower()}_payments")
+            - getattr(self, f"{method.lower()}_refunds")
+            for method in SalePayment.PaymentMethod.values
+        }
+
+    def expected_amounts(self) -> dict:
+        """Expected amounts in the shape used by ``CreateDailyReportService``."""
+        return {
+            "total_sales": self.total_sales,
+            "total_refunds": self.total_refunds,
+            "total_discounts": self.discounts,
+            "total_tax": self.tax,
+            "payment_methods": self.net_by_method(),
+            "card_transfer_confirmed": self.card_transfer_confirmed,
+            "cogs": self.cogs,
+        }
+
+
+class BusinessDayRollup(RollupTotals):
+    """
+    Pre-aggregated sales totals of one business day (2 AM to 2 AM).
+
+    Maintained by ``SalesRollupService`` in the same transaction as every
+    close, payment, void and refund.
+    """
+
+    business_date = models.DateField(_("Business date"), primary_key=True)
+
+    class Meta:
+        verbose_name = _("Business day rollup")
+        verbose_name_plural = _("Business day rollups")
+        ordering = ("-business_date",)
+
+    def __str__(self) -> str:
+        return f"{self.business_date}: {self.total_sales}"
+
+
+class BusinessHourRollup(RollupTotals):
+    """
+    Sales totals of one wall-clock hour, for intraday trend charts.
+
+    Only hours with activity have a row. The hours of a business day add
+    up to its ``BusinessDayRollup``.
+    """
+
+    hour_start = models.DateTimeField(_("Hour start"), unique=True)
+    business_date = models.DateField(_("Business date"), db_index=True)
+
+    class Meta:
+        verbose_name = _("Business hour rollup")
+        verbose_name_plural = _("Business hour rollups")
+        ordering = ("hour_start",)
+
+    def __str__(self) -> str:
+        return f"{self.hour_start:%Y-%m-%d %H:00}: {self.total_sales}"
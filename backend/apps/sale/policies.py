@@ -5,8 +5,11 @@ Policies are:
 - Stateless
 - Side-effect free
 - Cheap-first (state checks before permission checks)
+- Checked through ``has_perm``, which answers from the access-token
+  permission snapshot when it covers the permission
 """
 
+from apps.user.services.permission_registry import has_perm
 from django.core.exceptions import PermissionDenied
 from django.utils.translation import gettext_lazy as _
 
@@ -23,7 +26,7 @@ def _require_authenticated(user) -> None:
 
 
 def _require_perm(user, perm: str) -> None:
-    if not user.has_perm(perm):
+    if not has_perm(user, perm):
         raise PermissionDenied(_("Missing permission: %(perm)s") % {"perm": perm})
 
 
@@ -46,7 +49,7 @@ def can_open_sale(user) -> None:
     """
     _require_authenticated(user)
 
-    if not user.has_perm("sale.open_sale"):
+    if not has_perm(user, "sale.open_sale"):
         raise PermissionDenied(_("You are not allowed to open a sale"))
 
 
@@ -62,7 +65,7 @@ def can_see_sale_list(user) -> None:
     """
     _require_authenticated(user)
 
-    if not user.has_perm("sale.view_sale_list"):
+    if not has_perm(user, "sale.view_sale_list"):
         raise PermissionDenied(_("You are not allowed to view the sales list"))
 
 
@@ -78,7 +81,7 @@ def can_see_sale_details(user) -> None:
     """
     _require_authenticated(user)
 
-    if not user.has_perm("sale.view_sale_detail"):
+    if not has_perm(user, "sale.view_sale_detail"):
         raise PermissionDenied(_("You are not allowed to view sale details"))
 
 
@@ -100,7 +103,7 @@ def can_modify_sale(user, sale: Sale) -> None:
     if sale.state != Sale.SaleState.OPEN:
         raise PermissionDenied(_("Only OPEN sales can be modified"))
 
-    if not user.has_perm("sale.modify_sale"):
+    if not has_perm(user, "sale.modify_sale"):
         raise PermissionDenied(_("You are not allowed to modify sales"))
 
 
@@ -119,7 +122,7 @@ def can_close_sale(user, sale: Sale) -> None:
     _require_authenticated(user)
 
     # Permission check
-    if not user.has_perm("sale.close_sale"):
+    if not has_perm(user, "sale.close_sale"):
         raise PermissionDenied(_("Missing permission: sale.close_sale"))
 
     # State validation
@@ -150,7 +153,7 @@ def can_cancel_sale(user, sale: Sale) -> None:
         raise PermissionDenied(_("Only OPEN sales can be canceled"))
 
     # Permission check
-    if not user.has_perm("sale.cancel_sale"):
+    if not has_perm(user, "sale.cancel_sale"):
         raise PermissionDenied(_("You are not allowed to cancel sales"))
 
 
@@ -173,7 +176,7 @@ def can_cancel_close_sale(user, sale: Sale) -> None:
         raise PermissionDenied(_("Only CLOSED sales can be canceled"))
 
     # Permission check
-    if not user.has_perm("sale.cancel_sale"):
+    if not has_perm(user, "sale.cancel_sale"):
         raise PermissionDenied(_("You are not allowed to cancel sales"))
 
 
@@ -319,7 +322,7 @@ def require_printer(user, printer: str):
         raise PermissionDenied("Authentication required")
 
     perm = f"sale.can_print_{printer.lower()}"
-    if not user.has_perm(perm):
+    if not has_perm(user, perm):
         raise PermissionDenied(f"Missing permission: {perm}")
 
 
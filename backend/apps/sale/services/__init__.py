@@ -1,3 +1,4 @@
+from .print_queue import PrintQueueService
 from .report.approve_daily_report_service import ApproveDailyReportService
 from .report.create_daily_report_service import CreateDailyReportService
 from .sale.close_sale import CloseSaleService
@@ -10,4 +11,5 @@ __all__ = (
     "CloseSaleService",
     "CreateDailyReportService",
     "ApproveDailyReportService",
+    "PrintQueueService",
 )
@@ -0,0 +1,210 @@
+"""
+Denormalized payment ledger for sales.
+
+Sale keeps running totals of its COMPLETED payments (and their refunds) in
+plain columns so every derived property (subtotal_paid, tax_amount, ...) is
+read from memory instead of firing a SUM over ``payments``.
+
+Every service that changes a payment or refund status MUST go through this
+module, inside its own transaction.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from apps.sale.models import Sale, SalePayment, SaleRefund
+from django.db.models import F, Sum
+
+from ..report.sales_rollup_service import SalesRollupService
+from ..sale.sale_detail import SaleDetailService
+
+ZERO = Decimal("0")
+
+
+@dataclass(frozen=True)
+class LedgerTotals:
+    """
+    Snapshot of the ledger columns of one sale.
+
+    Field names match the ``Sale`` columns one to one.
+    """
+
+    paid_subtotal: Decimal = ZERO
+    paid_tax: Decimal = ZERO
+    paid_discount: Decimal = ZERO
+    paid_tip: Decimal = ZERO
+    refunded_amount: Decimal = ZERO
+
+    @classmethod
+    def of_sale(cls, sale: Sale) -> LedgerTotals:
+        return cls(**{f: getattr(sale, f) for f in LEDGER_FIELDS})
+
+    @classmethod
+    def of_payment(cls, payment: SalePayment) -> LedgerTotals:
+        return cls(
+            paid_subtotal=payment.amount_applied,
+            paid_tax=payment.tax_amount,
+            paid_discount=payment.discount_amount,
+            paid_tip=payment.tip_amount,
+        )
+
+    @classmethod
+    def of_refund(cls, refund: SaleRefund) -> LedgerTotals:
+        return cls(refunded_amount=refund.amount)
+
+    def __neg__(self) -> LedgerTotals:
+        return LedgerTotals(**{f: -getattr(self, f) for f in LEDGER_FIELDS})
+
+    def diff(self, other: LedgerTotals) -> Dict[str, tuple[Decimal, Decimal]]:
+        """Return ``{field: (self_value, other_value)}`` for mismatching fields."""
+        return {
+            f: (getattr(self, f), getattr(other, f))
+            for f in LEDGER_FIELDS
+            if getattr(self, f) != getattr(other, f)
+        }
+
+
+LEDGER_FIELDS = tuple(f.name for f in fields(LedgerTotals))
+
+
+class SaleLedgerService:
+    """
+    Maintains ``Sale`` payment ledger columns.
+
+    Rules:
+        - Increments are applied with a single ``UPDATE ... SET col = col + x``
+          so concurrent payments on the same sale never lose an update.
+        - The in-memory sale (if given) is refreshed with the ledger columns
+          only, so callers keep their other unsaved changes.
+        - Every movement is also recorded in the business-day sales rollup.
+    """
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def apply_payment(payment: SalePayment, sale: Optional[Sale] = None) -> None:
+        """Account a newly COMPLETED payment."""
+        SaleLedgerService._shift(
+            payment.sale_id, LedgerTotals.of_payment(payment), sale
+        )
+        SalesRollupService.record_payment(payment)
+
+    @staticmethod
+    def revert_payment(payment: SalePayment, sale: Optional[Sale] = None) -> None:
+        """Remove a payment that left COMPLETED state (e.g. voided)."""
+        SaleLedgerService._shift(
+            payment.sale_id, -LedgerTotals.of_payment(payment), sale
+        )
+        SalesRollupService.record_payment(payment, sign=-1)
+
+    @staticmethod
+    def apply_refund(refund: SaleRefund, sale: Optional[Sale] = None) -> None:
+        """Account a newly COMPLETED refund."""
+        SaleLedgerService._shift(
+            refund.payment.sale_id, LedgerTotals.of_refund(refund), sale
+        )
+        SalesRollupService.record_refund(refund)
+
+    @staticmethod
+    def revert_refund(refund: SaleRefund, sale: Optional[Sale] = None) -> None:
+        """Remove a refund that left COMPLETED state."""
+        SaleLedgerService._shift(
+            refund.payment.sale_id, -LedgerTotals.of_refund(refund), sale
+        )
+        SalesRollupService.record_refund(refund, sign=-1)
+
+    @staticmethod
+    def _shift(sale_id: int, delta: LedgerTotals, sale: Optional[Sale]) -> None:
+        changes = {
+            f: F(f) + getattr(delta, f) for f in LEDGER_FIELDS if getattr(delta, f)
+        }
+        if changes:
+            Sale.objects.filter(pk=sale_id).update(**changes)
+            # Totals and payment states in a stored detail are now stale
+            SaleDetailService.invalidate(sale_id)
+
+        if sale is not None:
+            sale.refresh_from_db(fields=LEDGER_FIELDS)
+
+    # ------------------------------------------------------------------
+    # Verification / rebuild
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compute_many(sale_ids: Iterable[int]) -> Dict[int, LedgerTotals]:
+        """
+        Recompute ledger totals from payment and refund rows.
+
+        Runs two GROUP BY queries regardless of how many sales are given.
+        """
+        sale_ids = list(sale_ids)
+        result: Dict[int, dict] = {pk: {} for pk in sale_ids}
+
+        payments = (
+            SalePayment.objects.filter(
+                sale_id__in=sale_ids, status=SalePayment.PaymentStatus.COMPLETED
+            )
+            .values("sale_id")
+            .annotate(
+                paid_subtotal=Sum("amount_applied"),
+                paid_tax=Sum("tax_amount"),
+                paid_discount=Sum("discount_amount"),
+                paid_tip=Sum("tip_amount"),
+            )
+        )
+        for row in payments:
+            sale_id = row.pop("sale_id")
+            result[sale_id].update(row)
+
+        refunds = (
+            SaleRefund.objects.filter(
+                payment__sale_id__in=sale_ids, status=SaleRefund.Status.COMPLETED
+            )
+            .values("payment__sale_id")
+            .annotate(refunded_amount=Sum("amount"))
+        )
+        for row in refunds:
+            result[row["payment__sale_id"]]["refunded_amount"] = row["refunded_amount"]
+
+        return {
+            pk: LedgerTotals(**{f: Decimal(v or 0) for f, v in values.items()})
+            for pk, values in result.items()
+        }
+
+    @staticmethod
+    def compute(sale: Sale) -> LedgerTotals:
+        """Recompute the ledger of a single sale from its rows."""
+        return SaleLedgerService.compute_many([sale.pk])[sale.pk]
+
+    @staticmethod
+    def verify(sale: Sale) -> Dict[str, tuple[Decimal, Decimal]]:
+        """
+        Compare stored columns against payment rows.
+
+        Returns:
+            ``{field: (stored, expected)}`` for every drifted column.
+        """
+        return LedgerTotals.of_sale(sale).diff(SaleLedgerService.compute(sale))
+
+    @staticmethod
+    def rebuild(sale: Sale) -> bool:
+        """
+        Overwrite the ledger columns with freshly computed totals.
+
+        Returns:
+            ``True`` if anything had drifted.
+        """
+        expected = SaleLedgerService.compute(sale)
+        if not LedgerTotals.of_sale(sale).diff(expected):
+            return False
+
+        values = {f: getattr(expected, f) for f in LEDGER_FIELDS}
+        Sale.objects.filter(pk=sale.pk).update(**values)
+        for f, v in values.items():
+            setattr(sale, f, v)
+        return True
@@ -9,6 +9,9 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
+from ..report.sales_rollup_service import SalesRollupService
+from .ledger_service import SaleLedgerService
+
 User = get_user_model()
 
 
@@ -39,6 +42,7 @@ class PaymentService:
     - No item-level payment tracking
     - No tax/discount logic here
     - No auto-close here
+    - Every status change goes through SaleLedgerService
     """
 
     @staticmethod
@@ -114,7 +118,7 @@ class PaymentService:
                 )
 
         # --- create payment ---
-        return SalePayment.objects.create(
+        payment = SalePayment.objects.create(
             sale=sale,
             method=input_data.method,
             amount_applied=input_data.amount_applied,
@@ -125,12 +129,61 @@ class PaymentService:
             received_by=performer,
             status=SalePayment.PaymentStatus.COMPLETED,
         )
+        SaleLedgerService.apply_payment(payment, sale=sale)
+        return payment
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    @transaction.atomic
+    def void_payment(*, payment_id: int, performer: User) -> SalePayment:
+        """
+        Void a COMPLETED payment and take it out of the sale ledger.
+
+        Raises:
+            ValidationError: If payment does not exist or is already voided.
+        """
+        try:
+            payment = (
+                SalePayment.objects.select_for_update()
+                .select_related("sale")
+                .get(pk=payment_id)
+            )
+        except SalePayment.DoesNotExist:
+            raise ValidationError(_("Payment not found"))
+
+        if payment.status != SalePayment.PaymentStatus.COMPLETED:
+            raise ValidationError(_("Only completed payments can be voided"))
+
+        payment.status = SalePayment.PaymentStatus.VOID
+        payment.save(update_fields=["status"])
+
+        SaleLedgerService.revert_payment(payment, sale=payment.sale)
+        PaymentService._update_sale_payment_status(payment.sale)
+        return payment
+
+    @staticmethod
+    @transaction.atomic
+    def set_confirmed(payment: SalePayment, confirmed: bool) -> SalePayment:
+        """
+        Record (or take back) the accountant's confirmation of a transfer.
+
+        The row is locked and re-read so that concurrent confirms (or a
+        confirm racing a void) account the transfer in the rollup once.
+        """
+        locked = SalePayment.objects.select_for_update().get(pk=payment.pk)
+        if locked.confirmed != confirmed:
+            locked.confirmed = confirmed
+            locked.save(update_fields=["confirmed"])
+            SalesRollupService.record_confirmation(locked)
+
+        payment.confirmed = confirmed
+        return payment
 
     # ------------------------------------------------------------------
 
     @staticmethod
     def _update_sale_payment_status(sale: Sale) -> None:
-        sale.refresh_from_db()
 
         if sale.subtotal_paid >= sale.subtotal_amount:
             sale.payment_status = Sale.PaymentStatus.PAID
@@ -139,4 +192,4 @@ class PaymentService:
         else:
             sale.payment_status = Sale.PaymentStatus.UNPAID
 
-        sale.save(update_fields=["payment_status"])
+        sale.save(update_fields=["payment_status", "updated_at"])
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from apps.sale.models import SalePayment, SaleRefund
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from .ledger_service import SaleLedgerService
+
+User = get_user_model()
+
+
+class RefundService:
+    """
+    Authoritative refund service.
+
+    Rules:
+    - Refunds reference a COMPLETED payment
+    - Tips are never refundable (enforced by SaleRefund.clean)
+    - Every status change goes through SaleLedgerService
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def create_refund(
+        *,
+        payment: SalePayment,
+        amount: Decimal,
+        method: str,
+        performer: User,
+        reason: str = "",
+    ) -> SaleRefund:
+        # Lock the payment so concurrent refunds can't exceed it together
+        payment = SalePayment.objects.select_for_update().get(pk=payment.pk)
+
+        if payment.status != SalePayment.PaymentStatus.COMPLETED:
+            raise ValidationError(_("Only completed payments can be refunded"))
+
+        refund = SaleRefund(
+            payment=payment,
+            amount=amount,
+            method=method,
+            processed_by=performer,
+            reason=reason,
+            status=SaleRefund.Status.COMPLETED,
+        )
+        refund.full_clean()
+        refund.save()
+
+        SaleLedgerService.apply_refund(refund)
+        return refund
+
+    @staticmethod
+    @transaction.atomic
+    def void_refund(*, refund: SaleRefund, performer: User) -> SaleRefund:
+        refund = (
+            SaleRefund.objects.select_for_update()
+            .select_related("payment")
+            .get(pk=refund.pk)
+        )
+
+        if refund.status != SaleRefund.Status.COMPLETED:
+            raise ValidationError(_("Only completed refunds can be voided"))
+
+        refund.status = SaleRefund.Status.VOID
+        refund.save(update_fields=["status"])
+
+        SaleLedgerService.revert_refund(refund)
+        return refund
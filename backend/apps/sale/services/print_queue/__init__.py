@@ -0,0 +1,15 @@
+from .escpos import EscPos
+from .notifier import PrintQueueNotifier
+from .print_queue_service import AckResult, PrintQueueService
+from .receipt_renderer import ReceiptData, ReceiptDelta, ReceiptLine, ReceiptRenderer
+
+__all__ = (
+    "AckResult",
+    "EscPos",
+    "PrintQueueNotifier",
+    "PrintQueueService",
+    "ReceiptData",
+    "ReceiptDelta",
+    "ReceiptLine",
+    "ReceiptRenderer",
+)
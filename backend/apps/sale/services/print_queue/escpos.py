@@ -0,0 +1,138 @@
+"""
+Minimal ESC/POS byte builder for 80 mm / 58 mm thermal printers.
+
+Text is written in visual order: RTL strings must already be shaped
+(``apps.utils.rtl.shape_rtl``), since printers neither join Arabic-script
+letters nor reorder bidi text.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict
+
+from apps.utils.rtl import shape_rtl
+
+ESC = b"\x1b"
+GS = b"\x1d"
+
+# ESC t n – character code table numbers (Epson)
+CODEPAGES = {"cp864": 37, "cp1256": 50, "cp437": 0}
+
+# PC864 is Arabic-only: map Persian letters to their closest Arabic glyphs
+# and Persian digits to ASCII before shaping, instead of printing "?".
+_ARABIC_FALLBACK = str.maketrans(
+    {
+        "ی": "ي",
+        "ک": "ك",
+        "گ": "ك",
+        "پ": "ب",
+        "چ": "ج",
+        "ژ": "ز",
+        "\u200c": " ",  # zero-width non-joiner
+        **{chr(0x06F0 + d): str(d) for d in range(10)},  # Persian digits
+        **{chr(0x0660 + d): str(d) for d in range(10)},  # Arabic-Indic digits
+    }
+)
+
+
+# Substitute for a presentation form missing from a code page, best first
+_FORM_SUBSTITUTES = {
+    "<final>": ("<isolated>",),
+    "<medial>": ("<initial>", "<final>", "<isolated>"),
+    "<initial>": ("<isolated>",),
+    "<isolated>": (),
+}
+
+
+@lru_cache(maxsize=None)
+def _presentation_fallback(codepage: str) -> Dict[int, str]:
+    """
+    Map Arabic presentation forms the code page can't encode to one it can
+    (e.g. PC864 prints final DAL with the isolated glyph), else the base
+    letter.
+    """
+    forms: Dict[tuple, str] = {}
+    for code in range(0xFB50, 0xFF00):
+        tag, _, base = unicodedata.decomposition(chr(code)).partition(" ")
+        if tag in _FORM_SUBSTITUTES and " " not in base:
+            forms.setdefault((chr(int(base, 16)), tag), chr(code))
+
+    table: Dict[int, str] = {}
+    for (base, tag), char in forms.items():
+        if _encodable(char, codepage):
+            continue
+        candidates = [forms.get((base, t)) for t in _FORM_SUBSTITUTES[tag]]
+        table[ord(char)] = next(
+            (c for c in candidates if c and _encodable(c, codepage)), base
+        )
+    return table
+
+
+def _encodable(char: str, codepage: str) -> bool:
+    try:
+        char.encode(codepage)
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+class EscPos:
+    ALIGN_LEFT, ALIGN_CENTER, ALIGN_RIGHT = 0, 1, 2
+
+    def __init__(self, *, width: int = 48, codepage: str = "cp864"):
+        if codepage not in CODEPAGES:
+            raise ValueError(f"Unsupported codepage: {codepage}")
+        self.width = width
+        self.codepage = codepage
+        self._buf = bytearray(ESC + b"@")  # initialize
+        self._buf += ESC + b"t" + bytes([CODEPAGES[codepage]])
+
+    # ----------------------------- formatting ---------------------------- #
+    def align(self, mode: int) -> "EscPos":
+        self._buf += ESC + b"a" + bytes([mode])
+        return self
+
+    def bold(self, on: bool = True) -> "EscPos":
+        self._buf += ESC + b"E" + bytes([1 if on else 0])
+        return self
+
+    def double(self, on: bool = True) -> "EscPos":
+        """Double width and height (halves the usable columns)."""
+        self._buf += GS + b"!" + bytes([0x11 if on else 0])
+        return self
+
+    # -------------------------------- content ---------------------------- #
+    def rtl(self, text: str) -> str:
+        """Shape ``text`` for this printer's code page."""
+        if self.codepage == "cp864":
+            text = text.translate(_ARABIC_FALLBACK)
+        return shape_rtl(text).translate(_presentation_fallback(self.codepage))
+
+    def line(self, text: str = "") -> "EscPos":
+        self._buf += text.encode(self.codepage, errors="replace") + b"\n"
+        return self
+
+    def columns(self, right: str, left: str = "") -> "EscPos":
+        """
+        One row of an RTL table: ``right`` (already shaped) flush right,
+        ``left`` (numbers) flush left; ``right`` is cut to fit.
+        """
+        room = self.width - len(left) - 1 if left else self.width
+        right = right[-room:] if len(right) > room else right
+        return self.line(left + right.rjust(self.width - len(left)))
+
+    def rule(self, char: str = "-") -> "EscPos":
+        return self.line(char * self.width)
+
+    def feed(self, lines: int = 1) -> "EscPos":
+        self._buf += ESC + b"d" + bytes([lines])
+        return self
+
+    def cut(self) -> "EscPos":
+        self._buf += GS + b"V" + b"\x42\x00"  # feed to cutter, partial cut
+        return self
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buf)
@@ -0,0 +1,106 @@
+"""
+Wake-ups for printer agents waiting on new print jobs.
+
+PostgreSQL: LISTEN/NOTIFY. NOTIFY is transactional, so a waiter only wakes
+once the new job is committed and visible, in whichever worker it waits.
+
+Other databases (SQLite in tests / local dev): a process-local condition,
+signalled on commit. Good enough for a single dev server.
+"""
+
+from __future__ import annotations
+
+import select
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from django.db import connection, transaction
+
+Wait = Callable[[float], bool]
+
+_local_condition = threading.Condition()
+_local_generation: Dict[str, int] = {}
+
+
+class PrintQueueNotifier:
+    @staticmethod
+    def channel(target: str) -> str:
+        return f"print_queue_{target.lower()}"
+
+    @staticmethod
+    def notify(target: str) -> None:
+        """Wake agents of ``target`` once the current transaction commits."""
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, '')", [PrintQueueNotifier.channel(target)]
+                )
+        else:
+            transaction.on_commit(lambda: PrintQueueNotifier._signal_local(target))
+
+    @staticmethod
+    @contextmanager
+    def listen(target: str) -> Iterator[Wait]:
+        """
+        Subscribe to ``target`` and yield ``wait(timeout) -> woke``.
+
+        Subscribe *before* checking for jobs: a job committed in between
+        then still wakes the waiter.
+        """
+        if connection.vendor == "postgresql":
+            with PrintQueueNotifier._listen_postgres(target) as wait:
+                yield wait
+        else:
+            yield PrintQueueNotifier._listen_local(target)
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    @contextmanager
+    def _listen_postgres(target: str) -> Iterator[Wait]:
+        channel = connection.ops.quote_name(PrintQueueNotifier.channel(target))
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {channel}")
+        pg = connection.connection
+
+        def wait(timeout: float) -> bool:
+            # Notifications may already have arrived with earlier results
+            if not pg.notifies:
+                readable, _, _ = select.select([pg], [], [], max(timeout, 0))
+                if readable:
+                    pg.poll()
+            woke = bool(pg.notifies)
+            pg.notifies.clear()
+            return woke
+
+        try:
+            yield wait
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"UNLISTEN {channel}")
+            pg.notifies.clear()
+
+    @staticmethod
+    def _listen_local(target: str) -> Wait:
+        with _local_condition:
+            seen = _local_generation.get(target, 0)
+
+        def wait(timeout: float) -> bool:
+            nonlocal seen
+            with _local_condition:
+                woke = _local_condition.wait_for(
+                    lambda: _local_generation.get(target, 0) != seen,
+                    timeout=max(timeout, 0),
+                )
+                seen = _local_generation.get(target, 0)
+            return woke
+
+        return wait
+
+    @staticmethod
+    def _signal_local(target: str) -> None:
+        with _local_condition:
+            _local_generation[target] = _local_generation.get(target, 0) + 1
+            _local_condition.notify_all()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional
+
+from apps.sale.models import PrintQueue, Sale
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .notifier import PrintQueueNotifier
+
+DEFAULT_LEASE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class AckResult:
+    printed: int
+    failed: int
+
+
+class PrintQueueService:
+    """
+    Print job producer / consumer operations.
+
+    Agents long-poll ``wait_for_jobs`` / ``claim`` instead of polling
+    ``pending`` in a loop: an idle agent costs one blocked request per
+    timeout window, and a new job is handed over as soon as its transaction
+    commits. A waiting request holds a worker thread, so production runs
+    threaded (gthread) workers; see ``compose.prod.yml``.
+
+    With several agents per printer, ``claim`` leases each job to exactly
+    one agent; ``acknowledge`` settles the agent's batch in one call. A job
+    whose lease runs out is claimable again.
+    """
+
+    @staticmethod
+    # No savepoint: callers queue tickets from inside their own transaction
+    @transaction.atomic(savepoint=False)
+    def enqueue(
+        *,
+        printer_target: str,
+        print_data: dict,
+        print_type: str = PrintQueue.PrintType.STANDARD,
+        sale: Optional[Sale] = None,
+    ) -> PrintQueue:
+        job = PrintQueue.objects.create(
+            sale=sale,
+            printer_target=printer_target,
+            print_type=print_type,
+            print_data=print_data,
+        )
+        PrintQueueNotifier.notify(printer_target)
+        return job
+
+    @staticmethod
+    def pending(printer_target: str, after_id: int = 0):
+        return PrintQueue.objects.filter(
+            status=PrintQueue.PrintStatus.PENDING,
+            printer_target=printer_target,
+            id__gt=after_id,
+        ).order_by("created_at")
+
+    @staticmethod
+    def wait_for_jobs(
+        printer_target: str, *, after_id: int = 0, timeout: float = 25
+    ) -> List[PrintQueue]:
+        """
+        Return pending jobs newer than ``after_id``; block up to
+        ``timeout`` seconds while there are none.
+
+        Returns an empty list on timeout. Must run outside a transaction
+        (LISTEN only takes effect on commit).
+        """
+        return PrintQueueService._wait(
+            printer_target,
+            lambda: list(PrintQueueService.pending(printer_target, after_id)),
+            timeout,
+        )
+
+    @staticmethod
+    def claim(
+        printer_target: str,
+        *,
+        agent: str,
+        limit: int = 20,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        timeout: float = 0,
+    ) -> List[PrintQueue]:
+        """
+        Lease up to ``limit`` claimable jobs to ``agent`` (oldest first).
+
+        Claimable: PENDING, or IN_PROGRESS with an expired lease. Rows
+        locked by a concurrent claim are skipped, never waited on, so two
+        agents always get disjoint batches. With ``timeout`` > 0 blocks like
+        ``wait_for_jobs`` while nothing is claimable.
+        """
+        return PrintQueueService._wait(
+            printer_target,
+            lambda: PrintQueueService._claim_batch(
+                printer_target, agent, limit, lease_seconds
+            ),
+            timeout,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def acknowledge(
+        printer_target: str,
+        *,
+        agent: str,
+        printed: Iterable[int] = (),
+        failed: Optional[Dict[int, str]] = None,
+    ) -> AckResult:
+        """
+        Settle jobs leased to ``agent``: one UPDATE for the printed ones
+        plus one per distinct failure message.
+
+        Jobs whose lease was lost (expired and re-claimed) are not touched,
+        so a slow agent can't overwrite the new holder's outcome; neither
+        are jobs of another printer.
+        """
+        held = PrintQueue.objects.filter(
+            status=PrintQueue.PrintStatus.IN_PROGRESS,
+            printer_target=printer_target,
+            claimed_by=agent,
+        )
+        printed_count = held.filter(pk__in=list(printed)).update(
+            status=PrintQueue.PrintStatus.PRINTED,
+            printed_at=timezone.now(),
+            lease_expires_at=None,
+        )
+
+        by_message: Dict[str, List[int]] = {}
+        for job_id, message in (failed or {}).items():
+            by_message.setdefault(message, []).append(job_id)
+
+        failed_count = 0
+        for message, ids in by_message.items():
+            failed_count += held.filter(pk__in=ids).update(
+                status=PrintQueue.PrintStatus.FAILED,
+                error_message=message,
+                retry_count=F("retry_count") + 1,
+                lease_expires_at=None,
+            )
+
+        return AckResult(printed=printed_count, failed=failed_count)
+
+    # --------------------------------------------------------------------- #
+    # Retention
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def purge(
+        *,
+        older_than: datetime,
+        statuses: Iterable[str] = (PrintQueue.PrintStatus.PRINTED,),
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Delete settled jobs created before ``older_than``, ``batch_size``
+        rows per transaction so agents are never blocked for long.
+        """
+        expired = PrintQueue.objects.filter(
+            status__in=list(statuses), created_at__lt=older_than
+        ).order_by("pk")
+
+        deleted = 0
+        while True:
+            ids = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            deleted += PrintQueue.objects.filter(pk__in=ids).delete()[0]
+
+    @staticmethod
+    def table_stats() -> Dict[str, object]:
+        """Row counts per status and, on PostgreSQL, on-disk size in bytes."""
+        stats: Dict[str, object] = {
+            "rows": dict(
+                PrintQueue.objects.order_by()
+                .values_list("status")
+                .annotate(n=Count("pk"))
+            ),
+            "total_bytes": None,
+        }
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_total_relation_size(%s)", [PrintQueue._meta.db_table]
+                )
+                stats["total_bytes"] = cursor.fetchone()[0]
+        return stats
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _wait(
+        printer_target: str, fetch: Callable[[], List[PrintQueue]], timeout: float
+    ) -> List[PrintQueue]:
+        if timeout <= 0:
+            return fetch()
+
+        deadline = monotonic() + timeout
+        with PrintQueueNotifier.listen(printer_target) as wait:
+            while True:
+                jobs = fetch()
+                remaining = deadline - monotonic()
+                if jobs or remaining <= 0:
+                    return jobs
+                wait(remaining)
+
+    @staticmethod
+    @transaction.atomic
+    def _claim_batch(
+        printer_target: str, agent: str, limit: int, lease_seconds: int
+    ) -> List[PrintQueue]:
+        now = timezone.now()
+        claimable = Q(status=PrintQueue.PrintStatus.PENDING) | Q(
+            status=PrintQueue.PrintStatus.IN_PROGRESS, lease_expires_at__lt=now
+        )
+        jobs = list(
+            PrintQueue.objects.filter(claimable, printer_target=printer_target)
+            .order_by("created_at", "id")
+            .select_for_update(skip_locked=True)[:limit]
+        )
+        if not jobs:
+            return jobs
+
+        lease_expires_at = now + timedelta(seconds=lease_seconds)
+        PrintQueue.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=PrintQueue.PrintStatus.IN_PROGRESS,
+            claimed_by=agent,
+            lease_expires_at=lease_expires_at,
+        )
+        for job in jobs:
+            job.status = PrintQueue.PrintStatus.IN_PROGRESS
+            job.claimed_by = agent
+            job.lease_expires_at = lease_expires_at
+        return jobs
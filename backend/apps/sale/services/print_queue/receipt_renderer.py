@@ -0,0 +1,238 @@
+"""
+Server-side receipt rendering to ready-to-send ESC/POS bytes.
+
+Printer agents used to receive receipt JSON and lay it out themselves; now
+they can stream these bytes to the printer as-is. Layout is split from
+data loading so it can be rendered (and benchmarked) without a database.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from apps.sale.models import PrintQueue, Sale
+from apps.utils.number_separator import format_number
+from django.core.cache import cache
+from django.utils import timezone
+from persiantools.jdatetime import JalaliDateTime
+
+from .escpos import EscPos
+
+RECEIPT_TIMEOUT = 60 * 60 * 24
+# Bump when the layout changes so cached receipts are re-rendered
+LAYOUT_VERSION = 1
+
+CAFE_NAME = "کافه چینو"
+SALE_TYPE_LABELS = {
+    Sale.SaleType.DINE_IN: "سالن",
+    Sale.SaleType.TAKEAWAY: "بیرون‌بر",
+}
+
+
+@dataclass(frozen=True)
+class ReceiptLine:
+    name: str
+    quantity: int
+    unit_price: int
+    extras: Tuple["ReceiptLine", ...] = ()
+
+    @property
+    def total(self) -> int:
+        return self.quantity * self.unit_price
+
+
+@dataclass(frozen=True)
+class ReceiptData:
+    sale_id: int
+    sale_type: str
+    opened_at: datetime
+    lines: Tuple[ReceiptLine, ...]
+    subtotal: int
+    table_name: Optional[str] = None
+    guest_count: Optional[int] = None
+    note: str = ""
+
+    @classmethod
+    def from_sale(cls, sale: Sale) -> "ReceiptData":
+        """Two queries: the sale (with table) is expected loaded, items once."""
+        items = list(
+            sale.items.select_related("product").only(
+                "parent_item_id", "quantity", "unit_price", "product__name"
+            )
+        )
+        extras = {}
+        for item in items:
+            if item.parent_item_id:
+                extras.setdefault(item.parent_item_id, []).append(item)
+
+        def _line(item, children=()):
+            return ReceiptLine(
+                name=item.product.name,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                extras=tuple(_line(child) for child in children),
+            )
+
+        return cls(
+            sale_id=sale.pk,
+            sale_type=sale.sale_type,
+            opened_at=sale.opened_at,
+            lines=tuple(
+                _line(item, extras.get(item.pk, ()))
+                for item in items
+                if not item.parent_item_id
+            ),
+            subtotal=int(sale.subtotal_amount),
+            table_name=sale.table.name if sale.table_id else None,
+            guest_count=sale.guest_count,
+            note=sale.note,
+        )
+
+
+@dataclass(frozen=True)
+class ReceiptDelta:
+    """
+    Changed lines of a sale edit: ``(name, old_quantity, new_quantity)``;
+    0 old means added, 0 new means removed.
+    """
+
+    lines: Tuple[Tuple[str, int, int], ...] = ()
+    old_table: Optional[str] = None
+    new_table: Optional[str] = None
+    table_changed: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReceiptDelta":
+        table = data.get("table") or {}
+        return cls(
+            lines=tuple(
+                (line["name"], line["old"], line["new"])
+                for line in data.get("lines", ())
+            ),
+            old_table=table.get("old"),
+            new_table=table.get("new"),
+            table_changed=bool(table),
+        )
+
+
+class ReceiptRenderer:
+    """
+    Render receipts for print jobs; cached per (sale version, print type).
+
+    The sale version is its ``updated_at``; EDIT_DIFF receipts also key on
+    the delta they print.
+    """
+
+    @staticmethod
+    def render_job(
+        job: PrintQueue, *, width: int = 48, codepage: str = "cp864"
+    ) -> bytes:
+        sale = job.sale
+        if sale is None:
+            raise ValueError("Print job has no sale to render")
+
+        delta = None
+        digest = ""
+        if job.print_type == PrintQueue.PrintType.EDIT_DIFF:
+            delta = ReceiptDelta.from_dict(job.print_data.get("delta", {}))
+            digest = hashlib.sha1(
+                json.dumps(job.print_data.get("delta", {}), sort_keys=True).encode()
+            ).hexdigest()[:16]
+
+        key = (
+            f"sale:receipt:{LAYOUT_VERSION}:{sale.pk}:"
+            f"{sale.updated_at.timestamp()}:{job.print_type}:{digest}:"
+            f"{width}:{codepage}"
+        )
+        payload = cache.get(key)
+        if payload is None:
+            data = ReceiptData.from_sale(sale)
+            payload = ReceiptRenderer.render(
+                data, job.print_type, delta=delta, width=width, codepage=codepage
+            )
+            cache.set(key, payload, RECEIPT_TIMEOUT)
+        return payload
+
+    @staticmethod
+    def render(
+        data: ReceiptData,
+        print_type: str,
+        *,
+        delta: Optional[ReceiptDelta] = None,
+        width: int = 48,
+        codepage: str = "cp864",
+    ) -> bytes:
+        out = EscPos(width=width, codepage=codepage)
+        ReceiptRenderer._header(out, data)
+
+        if print_type == PrintQueue.PrintType.EDIT_DIFF:
+            ReceiptRenderer._delta(out, delta or ReceiptDelta())
+        else:
+            ReceiptRenderer._items(out, data.lines)
+            out.rule("=")
+            out.bold().columns(out.rtl("جمع کل"), format_number(data.subtotal))
+            out.bold(False)
+
+        if data.note:
+            out.rule()
+            out.columns(out.rtl(f"توضیحات: {data.note}"))
+
+        return out.feed(3).cut().getvalue()
+
+    # --------------------------------------------------------------------- #
+    # Sections
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _header(out: EscPos, data: ReceiptData) -> None:
+        opened = JalaliDateTime(timezone.localtime(data.opened_at))
+        place = SALE_TYPE_LABELS.get(data.sale_type, data.sale_type)
+        if data.table_name:
+            place = f"{place} - میز {data.table_name}"
+
+        out.align(EscPos.ALIGN_CENTER).double().line(out.rtl(CAFE_NAME))
+        out.double(False).align(EscPos.ALIGN_LEFT)
+        out.columns(out.rtl("شماره فروش"), str(data.sale_id))
+        out.columns(out.rtl(place), opened.strftime("%Y/%m/%d %H:%M"))
+        if data.guest_count:
+            out.columns(out.rtl("تعداد نفرات"), str(data.guest_count))
+        out.rule()
+
+    @staticmethod
+    def _items(out: EscPos, lines: Tuple[ReceiptLine, ...]) -> None:
+        for line in lines:
+            out.bold().columns(
+                out.rtl(f"{line.quantity} x {line.name}"), format_number(line.total)
+            )
+            out.bold(False)
+            for extra in line.extras:
+                out.columns(
+                    out.rtl(f"+ {extra.quantity} x {extra.name}") + "  ",
+                    format_number(extra.total),
+                )
+
+    @staticmethod
+    def _delta(out: EscPos, delta: ReceiptDelta) -> None:
+        out.align(EscPos.ALIGN_CENTER).bold().line(out.rtl("تغییرات سفارش"))
+        out.bold(False).align(EscPos.ALIGN_LEFT)
+
+        if delta.table_changed:
+            out.columns(
+                out.rtl(
+                    f"تغییر میز: از {delta.old_table or 'بیرون‌بر'} "
+                    f"به {delta.new_table or 'بیرون‌بر'}"
+                )
+            )
+
+        for name, old, new in delta.lines:
+            if not old:
+                label, qty = "اضافه", f"+{new}"
+            elif not new:
+                label, qty = "حذف", f"-{old}"
+            else:
+                label, qty = "تغییر", f"{old}->{new}"
+            out.bold(not new).columns(out.rtl(f"{label}: {name}"), qty)
+        out.bold(False)
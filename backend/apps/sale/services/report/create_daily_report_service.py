@@ -1,8 +1,8 @@
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from apps.inventory.models import PurchaseInvoice
+from apps.inventory.models import PurchaseItem
 from apps.sale.models import (
     DailyReport,
     DailyReportPaymentMethod,
@@ -13,9 +13,14 @@ from apps.sale.models import (
 from apps.sale.models.sale_item import SaleItem
 from apps.sale.policies import can_create_daily_report
 from django.db import models, transaction
-from django.db.models import F, Sum
+from django.db.models import F, Q, Sum
 from django.db.models.functions import Coalesce
-from django.utils import timezone
+
+from .sales_rollup_service import (
+    SalesRollupService,
+    business_day_range,
+    normalize_method,
+)
 
 
 class CreateDailyReportService:
@@ -64,8 +69,11 @@ class CreateDailyReportService:
         # Calculate business day range (2 AM cutoff)
         day_start, day_end = cls._calculate_business_day_range(report_date)
 
-        # Auto-calculate expected amounts from system
-        expected_data = cls._calculate_expected_amounts(day_start, day_end)
+        # Expected amounts from the pre-aggregated business-day rollup
+        expected_data = {
+            **SalesRollupService.get_day(report_date).expected_amounts(),
+            "expenses": cls._calculate_expenses(day_start, day_end),
+        }
 
         # Create the daily report
         report = DailyReport.objects.create(
@@ -85,9 +93,7 @@ class CreateDailyReportService:
         )
 
         total_cash: int = closing_cash_counted - opening_float
-        card_transfer_total: int = cls._card_transfer_confirmed_total(
-            day_start, day_end
-        )
+        card_transfer_total = expected_data["card_transfer_confirmed"]
         # User entries
         user_approved_payments = {
             SalePayment.PaymentMethod.CASH: total_cash,
@@ -113,20 +119,18 @@ class CreateDailyReportService:
         Returns:
             tuple: (day_start, day_end) as timezone-aware datetimes
         """
-        # Start at 2 AM on report_date
-        day_start = timezone.make_aware(
-            datetime.combine(report_date, time(hour=2, minute=0, second=0))
-        )
-
-        # End at 2 AM next day
-        day_end = day_start + timedelta(days=1)
-
-        return day_start, day_end
+        return business_day_range(report_date)
 
     @staticmethod
     def _calculate_expected_amounts(day_start: datetime, day_end: datetime) -> dict:
         """
-        Calculate expected amounts from system records for the business day.
+        Calculate expected amounts straight from source records.
+
+        Report creation reads ``BusinessDayRollup`` instead; this is the
+        reference the ``sales_rollup`` command verifies rollups against.
+        Runs a fixed number of aggregate queries however busy the day was:
+        sale totals, COGS, payments by method, refunds by method and
+        purchase expenses.
 
         Args:
             day_start: Start of business day.
@@ -135,45 +139,29 @@ class CreateDailyReportService:
         Returns:
             dict: Expected amounts including revenue and payment method breakdown
         """
-        # Query sales for the day
-        invoices = Sale.objects.filter(
+        zero = Decimal("0.0000")
+
+        # Sale totals come from the payment ledger columns:
+        # total = subtotal - discount + tax (see Sale.total_amount)
+        sales = Sale.objects.filter(
             created_at__gte=day_start,
             created_at__lt=day_end,
             state=Sale.SaleState.CLOSED,
-        )
-        sold_items = SaleItem.objects.filter(sale__in=invoices)
-
-        # Query payments for the day
-        payments = SalePayment.objects.filter(
-            received_at__gte=day_start,
-            received_at__lt=day_end,
-            status=SalePayment.PaymentStatus.COMPLETED,
+        ).aggregate(
+            subtotal=Coalesce(Sum("subtotal_amount"), zero),
+            discounts=Coalesce(Sum("paid_discount"), zero),
+            tax=Coalesce(Sum("paid_tax"), zero),
         )
 
-        # Query refunds for the day
-        refunds = SaleRefund.objects.filter(
-            processed_at__gte=day_start,
-            processed_at__lt=day_end,
-            status=SaleRefund.Status.COMPLETED,
-        )
-
-        expenses = Decimal("0")
-
-        for i in PurchaseInvoice.objects.filter(
-            issue_date__gte=day_start, issue_date__lt=day_end
-        ):
-            expenses += i.total_cost
-
-        # Calculate revenue totals
-        total_sales = invoices.aggregate(total=models.Sum("total_amount"))[
-            "total"
-        ] or Decimal("0.0000")
-
         # COGS = Sum of (quantity * material_cost) for each item
         # Using F expressions to multiply per-row before summing
         # Note: Must specify output_field because quantity is PositiveIntegerField
         # and material_cost is DecimalField (mixed types)
-        cogs = sold_items.aggregate(
+        cogs = SaleItem.objects.filter(
+            sale__created_at__gte=day_start,
+            sale__created_at__lt=day_end,
+            sale__state=Sale.SaleState.CLOSED,
+        ).aggregate(
             cogs=Coalesce(
                 Sum(
                     F("quantity") * F("material_cost"),
@@ -181,76 +169,121 @@ class CreateDailyReportService:
                 ),
                 Decimal("0"),
             )
-        )["cogs"]
-
-        total_discounts = invoices.aggregate(total=models.Sum("discount_amount"))[
-            "total"
-        ] or Decimal("0.0000")
-
-        total_tax = invoices.aggregate(total=models.Sum("tax_amount"))[
-            "total"
-        ] or Decimal("0.0000")
+        )[
+            "cogs"
+        ]
+
+        # Payments by method (amount_applied only, not tips)
+        payments = (
+            SalePayment.objects.filter(
+                received_at__gte=day_start,
+                received_at__lt=day_end,
+                status=SalePayment.PaymentStatus.COMPLETED,
+            )
+            .values("method")
+            .annotate(
+                applied=Sum("amount_applied"),
+                confirmed=Sum(
+                    F("amount_applied")
+                    + F("tax_amount")
+                    - F("discount_amount")
+                    + F("tip_amount"),
+                    filter=Q(confirmed=True),
+                ),
+            )
+            .order_by()
+        )
 
-        total_refunds = refunds.aggregate(total=models.Sum("amount"))[
-            "total"
-        ] or Decimal("0.0000")
+        # Refunds by method
+        refunds = (
+            SaleRefund.objects.filter(
+                processed_at__gte=day_start,
+                processed_at__lt=day_end,
+                status=SaleRefund.Status.COMPLETED,
+            )
+            .values("method")
+            .annotate(amount=Sum("amount"))
+            .order_by()
+        )
 
-        # Calculate payment method breakdown
-        payment_methods = CreateDailyReportService._calculate_payment_method_totals(
-            payments, refunds
+        payment_rows = list(payments)
+        refund_rows = list(refunds)
+        card_transfer_confirmed = next(
+            (
+                row["confirmed"]
+                for row in payment_rows
+                if row["method"] == SalePayment.PaymentMethod.CARD_TRANSFER
+            ),
+            None,
         )
 
         return {
-            "total_sales": total_sales,
-            "total_refunds": total_refunds,
-            "total_discounts": total_discounts,
-            "total_tax": total_tax,
-            "payment_methods": payment_methods,
+            "total_sales": sales["subtotal"] - sales["discounts"] + sales["tax"],
+            "total_refunds": sum((row["amount"] for row in refund_rows), zero),
+            "total_discounts": sales["discounts"],
+            "total_tax": sales["tax"],
+            "payment_methods": (
+                CreateDailyReportService._calculate_payment_method_totals(
+                    payment_rows, refund_rows
+                )
+            ),
+            "card_transfer_confirmed": card_transfer_confirmed or zero,
             "cogs": cogs,
-            "expenses": expenses,
+            "expenses": CreateDailyReportService._calculate_expenses(
+                day_start, day_end
+            ),
         }
 
     @staticmethod
-    def _calculate_payment_method_totals(payments, refunds) -> dict[str, Decimal]:
+    def _calculate_payment_method_totals(
+        payment_rows: list[dict], refund_rows: list[dict]
+    ) -> dict[str, Decimal]:
         """
         Calculate expected amounts by payment method.
 
         Args:
-            payments: QuerySet of SalePayment for the day
-            refunds: QuerySet of SaleRefund for the day
+            payment_rows: ``{"method", "applied"}`` per payment method
+            refund_rows: ``{"method", "amount"}`` per refund method
 
         Returns:
             dict: Payment method -> expected amount mapping
         """
-        method_mapping = {
-            "CASH": SalePayment.PaymentMethod.CASH,
-            "POS": SalePayment.PaymentMethod.POS,
-            "BANK_TRANSFER": SalePayment.PaymentMethod.CARD_TRANSFER,
-        }
-
-        payment_totals = {}
+        payment_totals = dict.fromkeys(
+            SalePayment.PaymentMethod.values, Decimal("0.0000")
+        )
 
-        # Sum payments by method (amount_applied only, not tips)
-        for payment in payments:
-            method = method_mapping.get(payment.method, SalePayment.PaymentMethod.CASH)
-            if method not in payment_totals:
-                payment_totals[method] = Decimal("0.0000")
-            payment_totals[method] += payment.amount_applied
+        for row in payment_rows:
+            method = CreateDailyReportService._normalize_method(row["method"])
+            payment_totals[method] += row["applied"]
 
         # Subtract refunds by method
-        for refund in refunds:
-            method = method_mapping.get(refund.method, SalePayment.PaymentMethod.CASH)
-            if method not in payment_totals:
-                payment_totals[method] = Decimal("0.0000")
-            payment_totals[method] -= refund.amount
-
-        # Ensure all payment methods exist (even if zero)
-        for method_type in SalePayment.PaymentMethod.values:
-            if method_type not in payment_totals:
-                payment_totals[method_type] = Decimal("0.0000")
+        for row in refund_rows:
+            method = CreateDailyReportService._normalize_method(row["method"])
+            payment_totals[method] -= row["amount"]
 
         return payment_totals
 
+    @staticmethod
+    def _normalize_method(method: str) -> str:
+        return normalize_method(method)
+
+    @staticmethod
+    def _calculate_expenses(day_start: datetime, day_end: datetime) -> Decimal:
+        """Purchases issued on the report date, summed over their line items."""
+        expenses = PurchaseItem.objects.filter(
+            purchase_invoice__issue_date__gte=day_start,
+            purchase_invoice__issue_date__lt=day_end,
+        ).aggregate(
+            total=Coalesce(
+                Sum(
+                    F("purchased_unit_price") * F("quantity"),
+                    output_field=models.DecimalField(),
+                ),
+                Decimal("0.0000"),
+            )
+        )
+        return expenses["total"]
+
     @staticmethod
     def _create_payment_method_breakdown(
         report: DailyReport,
@@ -282,20 +315,3 @@ class CreateDailyReportService:
         reports = DailyReportPaymentMethod.objects.filter(daily_report=report)
         for method, value in data.items():
             reports.filter(payment_method=method).update(actual_amount=value)
-
-    @staticmethod
-    def _card_transfer_confirmed_total(day_start: datetime, day_end: datetime) -> int:
-        """
-        Total card transfers which approved by accountant.
-        """
-
-        # Query payments for the day
-        payments = SalePayment.objects.filter(
-            received_at__gte=day_start,
-            received_at__lt=day_end,
-            method=SalePayment.PaymentMethod.CARD_TRANSFER,
-            status=SalePayment.PaymentStatus.COMPLETED,
-            confirmed=True,
-        )
-
-        return payments.aggregate(total=models.Sum("amount_total"))["total"] or 0
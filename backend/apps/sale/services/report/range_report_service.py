@@ -0,0 +1,230 @@
+"""
+Financial reports over a range of business days (week, month, Jalali month).
+
+Totals are summed in SQL over ``BusinessDayRollup`` rows, so a year of
+data is one aggregate query plus one streamed row per day.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+from apps.inventory.models import PurchaseItem
+from apps.sale.models import BusinessDayRollup
+from apps.utils.jalali_period import format_jalali_date, jalali_month_bounds, to_jalali
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .sales_rollup_service import SalesRollupService, business_date_of
+
+# Longest range served in one request (a leap year)
+MAX_RANGE_DAYS = 366
+
+# Missing day rollups built inside one request; history is backfilled by
+# ``manage.py sales_rollup --rebuild``
+MAX_BUILT_DAYS = 31
+
+# Rows fetched per database round trip while streaming
+CHUNK_SIZE = 500
+
+# The Iranian week starts on Saturday (Monday == 0)
+WEEK_START = 5
+
+
+class Period:
+    WEEK = "week"
+    MONTH = "month"
+    JALALI_MONTH = "jalali_month"
+
+    choices = (WEEK, MONTH, JALALI_MONTH)
+
+
+def _money():
+    return models.DecimalField(max_digits=18, decimal_places=4)
+
+
+def _or_zero(expression, output_field):
+    return Coalesce(expression, Value(0), output_field=output_field)
+
+
+def _purchase_total():
+    return Sum(F("purchased_unit_price") * F("quantity"), output_field=_money())
+
+
+# Computed in SQL from the rollup columns
+_EXPRESSIONS = {
+    "total_sales": F("gross_sales") - F("discounts") + F("tax"),
+    "total_refunds": F("cash_refunds") + F("pos_refunds") + F("card_transfer_refunds"),
+    "cash_net": F("cash_payments") - F("cash_refunds"),
+    "pos_net": F("pos_payments") - F("pos_refunds"),
+    "card_transfer_net": F("card_transfer_payments") - F("card_transfer_refunds"),
+}
+_EXPRESSIONS["net_revenue"] = (
+    _EXPRESSIONS["total_sales"] - _EXPRESSIONS["total_refunds"]
+)
+_EXPRESSIONS["gross_profit"] = _EXPRESSIONS["net_revenue"] - F("cogs")
+
+# (key, label) of every exported column, in order
+COLUMNS = (
+    ("business_date", "Date"),
+    ("jalali_date", "Jalali date"),
+    ("sales_count", "Sales"),
+    ("gross_sales", "Gross sales"),
+    ("discounts", "Discounts"),
+    ("tax", "Tax"),
+    ("total_sales", "Total sales"),
+    ("total_refunds", "Refunds"),
+    ("net_revenue", "Net revenue"),
+    ("cogs", "COGS"),
+    ("gross_profit", "Gross profit"),
+    ("expenses", "Expenses"),
+    ("cash_net", "Cash"),
+    ("pos_net", "POS"),
+    ("card_transfer_net", "Card transfer"),
+    ("card_transfer_confirmed", "Confirmed transfers"),
+    ("tips", "Tips"),
+)
+
+_SUMMED = tuple(key for key, _label in COLUMNS[2:] if key != "expenses")
+_STORED = tuple(key for key in _SUMMED if key not in _EXPRESSIONS)
+
+
+@dataclass(frozen=True)
+class DateRange:
+    start: date
+    end: date  # inclusive
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+
+class RangeReportService:
+    """
+    Reads multi-day financial totals for reports and exports.
+
+    Rules:
+        - A range is either a named period around an anchor date or an
+          explicit ``start`` / ``end`` pair, at most ``MAX_RANGE_DAYS`` long
+        - ``prepare`` builds past days without a rollup row (a few per
+          request); ``iter_days`` / ``totals`` only read
+        - Expenses are purchases issued on the business date
+    """
+
+    @staticmethod
+    def resolve_range(
+        period: Optional[str] = None,
+        anchor: Optional[date] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> DateRange:
+        if start or end:
+            if not (start and end):
+                raise ValidationError(_("Both start and end dates are required"))
+            date_range = DateRange(start, end)
+        elif period:
+            date_range = DateRange(
+                *RangeReportService.period_bounds(
+                    period, anchor or business_date_of(timezone.now())
+                )
+            )
+        else:
+            raise ValidationError(_("A period or a start and end date is required"))
+
+        if date_range.end < date_range.start:
+            raise ValidationError(_("End date must not be before start date"))
+        if date_range.days > MAX_RANGE_DAYS:
+            raise ValidationError(
+                _("Report range cannot exceed %(days)s days") % {"days": MAX_RANGE_DAYS}
+            )
+        return date_range
+
+    @staticmethod
+    def period_bounds(period: str, anchor: date) -> Tuple[date, date]:
+        """First and last day of the period containing ``anchor``."""
+        if period == Period.WEEK:
+            start = anchor - timedelta(days=(anchor.weekday() - WEEK_START) % 7)
+            return start, start + timedelta(days=6)
+        if period == Period.MONTH:
+            start = anchor.replace(day=1)
+            next_month = (start + timedelta(days=32)).replace(day=1)
+            return start, next_month - timedelta(days=1)
+        if period == Period.JALALI_MONTH:
+            year, month, _day = to_jalali(anchor)
+            start, end = jalali_month_bounds(year, month)
+            return start, end - timedelta(days=1)
+        raise ValidationError(
+            _("Unknown report period: %(period)s") % {"period": period}
+        )
+
+    @staticmethod
+    def prepare(date_range: DateRange) -> None:
+        """
+        Build the missing day rows of the range; call once per request.
+
+        Raises:
+            ValidationError: If more than ``MAX_BUILT_DAYS`` days are missing.
+        """
+        SalesRollupService.ensure_days(
+            date_range.start, date_range.end, limit=MAX_BUILT_DAYS
+        )
+
+    @staticmethod
+    def iter_days(date_range: DateRange) -> Iterator[Dict]:
+        """One dict per business day (``COLUMNS`` keys), oldest first."""
+        expenses = (
+            PurchaseItem.objects.filter(purchase_invoice__issue_date=OuterRef("pk"))
+            .values("purchase_invoice__issue_date")
+            .annotate(total=_purchase_total())
+            .values("total")
+        )
+        rows = (
+            BusinessDayRollup.objects.filter(
+                business_date__range=(date_range.start, date_range.end)
+            )
+            .annotate(
+                expenses=_or_zero(Subquery(expenses), _money()),
+                **_EXPRESSIONS,
+            )
+            .order_by("business_date")
+            .values("business_date", "expenses", *_SUMMED)
+        )
+        for row in rows.iterator(chunk_size=CHUNK_SIZE):
+            row["jalali_date"] = format_jalali_date(
+                row["business_date"], "%Y/%m/%d", "en"
+            )
+            yield row
+
+    @staticmethod
+    def totals(date_range: DateRange) -> Dict:
+        """Sum of every numeric column over the range (two queries)."""
+        # Aliases must not shadow the columns the expressions refer to
+        sums = BusinessDayRollup.objects.filter(
+            business_date__range=(date_range.start, date_range.end)
+        ).aggregate(
+            **{
+                f"sum_{key}": _or_zero(Sum(key), BusinessDayRollup._meta.get_field(key))
+                for key in _STORED
+            },
+            **{
+                f"sum_{key}": _or_zero(Sum(expression, output_field=_money()), _money())
+                for key, expression in _EXPRESSIONS.items()
+            },
+        )
+        totals = {key: sums[f"sum_{key}"] for key in _SUMMED}
+        totals["expenses"] = PurchaseItem.objects.filter(
+            purchase_invoice__issue_date__range=(date_range.start, date_range.end)
+        ).aggregate(total=_or_zero(_purchase_total(), _money()))["total"]
+        return totals
+
+    @staticmethod
+    def iter_table(date_range: DateRange) -> Iterator[list]:
+        """Day rows as lists in ``COLUMNS`` order, for tabular exports."""
+        for row in RangeReportService.iter_days(date_range):
+            yield [row[key] for key, _label in COLUMNS]
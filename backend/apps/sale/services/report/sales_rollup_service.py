@@ -0,0 +1,416 @@
+"""
+Incrementally maintained sales rollups (per business day and per hour).
+
+Every service that closes a sale or changes a payment / refund status
+reports the movement here, inside its own transaction, so reports and
+trend charts read a handful of pre-aggregated rows instead of scanning
+sales, payments and refunds.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from apps.sale.models import (
+    BusinessDayRollup,
+    BusinessHourRollup,
+    Sale,
+    SaleItem,
+    SalePayment,
+    SaleRefund,
+)
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+ZERO = Decimal("0")
+
+# A business day runs from 2 AM to 2 AM the next day
+BUSINESS_DAY_CUTOFF = time(hour=2)
+
+ROLLUP_FIELDS = tuple(
+    f.name
+    for f in BusinessDayRollup._meta.get_fields()
+    if isinstance(f, (models.DecimalField, models.PositiveIntegerField))
+)
+
+# Legacy method names still found on old rows
+METHOD_ALIASES = {"BANK_TRANSFER": SalePayment.PaymentMethod.CARD_TRANSFER}
+
+
+def normalize_method(method: str) -> str:
+    """Known methods map to themselves, legacy aliases to their successor."""
+    if method in SalePayment.PaymentMethod.values:
+        return method
+    return METHOD_ALIASES.get(method, SalePayment.PaymentMethod.CASH)
+
+
+def business_day_range(business_date: date) -> Tuple[datetime, datetime]:
+    """Timezone-aware ``[start, end)`` of a business day."""
+    day_start = timezone.make_aware(
+        datetime.combine(business_date, BUSINESS_DAY_CUTOFF)
+    )
+    return day_start, day_start + timedelta(days=1)
+
+
+def business_date_of(moment: datetime) -> date:
+    """Business day a timestamp belongs to (before 2 AM counts as the day before)."""
+    cutoff = timedelta(hours=BUSINESS_DAY_CUTOFF.hour)
+    return (timezone.localtime(moment) - cutoff).date()
+
+
+def _hour_of(moment: datetime) -> datetime:
+    return timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def _payment_total(payment: SalePayment) -> Decimal:
+    return (
+        payment.amount_applied
+        + payment.tax_amount
+        - payment.discount_amount
+        + payment.tip_amount
+    )
+
+
+class SalesRollupService:
+    """
+    Maintains and reads ``BusinessDayRollup`` / ``BusinessHourRollup``.
+
+    Rules:
+        - Increments are a single ``UPDATE ... SET col = col + x`` so
+          concurrent movements never lose an update.
+        - A business day without a row is built from the source rows once;
+          the movement being recorded is already part of them.
+        - Writers call this service after saving the changed row, inside
+          the same transaction.
+    """
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def get_day(business_date: date) -> BusinessDayRollup:
+        """Rollup of one business day, built from source rows if missing."""
+        return SalesRollupService.get_days([business_date])[business_date]
+
+    @staticmethod
+    def get_days(business_dates: Iterable[date]) -> Dict[date, BusinessDayRollup]:
+        business_dates = set(business_dates)
+        rollups = BusinessDayRollup.objects.in_bulk(business_dates)
+        for business_date in sorted(business_dates - rollups.keys()):
+            rollups[business_date] = SalesRollupService.rebuild_day(business_date)
+        return rollups
+
+    @staticmethod
+    def ensure_days(start: date, end: date, limit: Optional[int] = None) -> int:
+        """
+        Build the missing day rows of ``[start, end]`` (future days are skipped).
+
+        Args:
+            limit: Most days to build; more missing days raise instead, so a
+                request never backfills history (``sales_rollup --rebuild``).
+
+        Returns:
+            Number of days that had to be built.
+
+        Raises:
+            ValidationError: If more than ``limit`` days are missing.
+        """
+        end = min(end, business_date_of(timezone.now()))
+        existing = set(
+            BusinessDayRollup.objects.filter(
+                business_date__range=(start, end)
+            ).values_list("business_date", flat=True)
+        )
+        missing = [
+            start + timedelta(days=i)
+            for i in range((end - start).days + 1)
+            if start + timedelta(days=i) not in existing
+        ]
+        if limit is not None and len(missing) > limit:
+            raise ValidationError(
+                _(
+                    "%(days)s business days have no rollup yet; backfill them "
+                    "with 'manage.py sales_rollup --rebuild'"
+                )
+                % {"days": len(missing)}
+            )
+
+        for business_date in missing:
+            with transaction.atomic():
+                SalesRollupService.rebuild_day(business_date)
+        return len(missing)
+
+    @staticmethod
+    def get_hours(business_date: date) -> List[BusinessHourRollup]:
+        """Active hours of a business day, oldest first."""
+        SalesRollupService.get_day(business_date)
+        return list(BusinessHourRollup.objects.filter(business_date=business_date))
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def record_close(sale: Sale, sign: int = 1) -> None:
+        """Account a sale that entered (``sign=1``) or left CLOSED state."""
+        cogs = sale.items.aggregate(
+            cogs=Sum(
+                F("quantity") * F("material_cost"),
+                output_field=models.DecimalField(),
+            )
+        )["cogs"]
+        SalesRollupService._shift(
+            sale.created_at,
+            {
+                "sales_count": sign,
+                "gross_sales": sign * sale.subtotal_amount,
+                "discounts": sign * sale.paid_discount,
+                "tax": sign * sale.paid_tax,
+                "cogs": sign * (cogs or ZERO),
+            },
+        )
+
+    @staticmethod
+    def record_payment(payment: SalePayment, sign: int = 1) -> None:
+        """Account a payment that entered (``sign=1``) or left COMPLETED."""
+        method = normalize_method(payment.method).lower()
+        delta = {
+            f"{method}_payments": sign * payment.amount_applied,
+            "tips": sign * payment.tip_amount,
+        }
+        if payment.confirmed:
+            delta["card_transfer_confirmed"] = sign * _payment_total(payment)
+        SalesRollupService._shift(payment.received_at, delta)
+
+    @staticmethod
+    def record_confirmation(payment: SalePayment) -> None:
+        """Account a card transfer whose ``confirmed`` flag just flipped."""
+        if payment.status != SalePayment.PaymentStatus.COMPLETED:
+            return
+        sign = 1 if payment.confirmed else -1
+        SalesRollupService._shift(
+            payment.received_at,
+            {"card_transfer_confirmed": sign * _payment_total(payment)},
+        )
+
+    @staticmethod
+    def record_refund(refund: SaleRefund, sign: int = 1) -> None:
+        """Account a refund that entered (``sign=1``) or left COMPLETED."""
+        method = normalize_method(refund.method).lower()
+        SalesRollupService._shift(
+            refund.processed_at, {f"{method}_refunds": sign * refund.amount}
+        )
+
+    @staticmethod
+    def _shift(moment: datetime, delta: Dict[str, Decimal]) -> None:
+        changes = {f: F(f) + v for f, v in delta.items() if v}
+        if not changes:
+            return
+
+        business_date = business_date_of(moment)
+        if not BusinessDayRollup.objects.filter(business_date=business_date).update(
+            **changes
+        ):
+            try:
+                with transaction.atomic():
+                    SalesRollupService._create_day(business_date)
+                return
+            except IntegrityError:
+                # Built concurrently, without our uncommitted movement
+                BusinessDayRollup.objects.filter(business_date=business_date).update(
+                    **changes
+                )
+
+        hour_start = _hour_of(moment)
+        if BusinessHourRollup.objects.filter(hour_start=hour_start).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                BusinessHourRollup.objects.create(
+                    hour_start=hour_start, business_date=business_date, **delta
+                )
+        except IntegrityError:
+            BusinessHourRollup.objects.filter(hour_start=hour_start).update(**changes)
+
+    # ------------------------------------------------------------------
+    # Verification / rebuild
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compute_day(
+        business_date: date,
+    ) -> Tuple[BusinessDayRollup, List[BusinessHourRollup]]:
+        """
+        Unsaved day and hour rollups computed from source rows.
+
+        Runs four GROUP BY queries regardless of how busy the day was.
+        """
+        day_start, day_end = business_day_range(business_date)
+        hours: Dict[datetime, Dict[str, Decimal]] = defaultdict(dict)
+
+        def add(hour, field, value):
+            if value:
+                hours[hour][field] = hours[hour].get(field, ZERO) + value
+
+        sales = (
+            Sale.objects.filter(
+                created_at__gte=day_start,
+                created_at__lt=day_end,
+                state=Sale.SaleState.CLOSED,
+            )
+            .annotate(hour=TruncHour("created_at"))
+            .values("hour")
+            .annotate(
+                sales_count=Count("pk"),
+                gross_sales=Sum("subtotal_amount"),
+                discounts=Sum("paid_discount"),
+                tax=Sum("paid_tax"),
+            )
+            .order_by()
+        )
+        for row in sales:
+            hour = row.pop("hour")
+            for field, value in row.items():
+                add(hour, field, value)
+
+        cogs = (
+            SaleItem.objects.filter(
+                sale__created_at__gte=day_start,
+                sale__created_at__lt=day_end,
+                sale__state=Sale.SaleState.CLOSED,
+            )
+            .annotate(hour=TruncHour("sale__created_at"))
+            .values("hour")
+            .annotate(
+                cogs=Sum(
+                    F("quantity") * F("material_cost"),
+                    output_field=models.DecimalField(),
+                )
+            )
+            .order_by()
+        )
+        for row in cogs:
+            add(row["hour"], "cogs", row["cogs"])
+
+        payments = (
+            SalePayment.objects.filter(
+                received_at__gte=day_start,
+                received_at__lt=day_end,
+                status=SalePayment.PaymentStatus.COMPLETED,
+            )
+            .annotate(hour=TruncHour("received_at"))
+            .values("hour", "method")
+            .annotate(
+                applied=Sum("amount_applied"),
+                tips=Sum("tip_amount"),
+                confirmed=Sum(
+                    F("amount_applied")
+                    + F("tax_amount")
+                    - F("discount_amount")
+                    + F("tip_amount"),
+                    filter=Q(confirmed=True),
+                ),
+            )
+            .order_by()
+        )
+        for row in payments:
+            method = normalize_method(row["method"]).lower()
+            add(row["hour"], f"{method}_payments", row["applied"])
+            add(row["hour"], "tips", row["tips"])
+            add(row["hour"], "card_transfer_confirmed", row["confirmed"])
+
+        refunds = (
+            SaleRefund.objects.filter(
+                processed_at__gte=day_start,
+                processed_at__lt=day_end,
+                status=SaleRefund.Status.COMPLETED,
+            )
+            .annotate(hour=TruncHour("processed_at"))
+            .values("hour", "method")
+            .annotate(amount=Sum("amount"))
+            .order_by()
+        )
+        for row in refunds:
+            method = normalize_method(row["method"]).lower()
+            add(row["hour"], f"{method}_refunds", row["amount"])
+
+        day = BusinessDayRollup(business_date=business_date)
+        hour_rows = []
+        for hour_start in sorted(hours):
+            values = hours[hour_start]
+            hour_rows.append(
+                BusinessHourRollup(
+                    hour_start=hour_start, business_date=business_date, **values
+                )
+            )
+            for field, value in values.items():
+                setattr(day, field, getattr(day, field) + value)
+        return day, hour_rows
+
+    @staticmethod
+    def verify_day(business_date: date) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Compare the stored rollup against source rows.
+
+        Returns:
+            ``{field: (stored, expected)}`` for every drifted column; hour
+            buckets are reported as ``"HH:00 field"``. A missing day row
+            is compared as all zeros.
+        """
+        expected, expected_hours = SalesRollupService.compute_day(business_date)
+        stored = BusinessDayRollup.objects.filter(
+            business_date=business_date
+        ).first() or BusinessDayRollup(business_date=business_date)
+
+        drift = SalesRollupService._diff(stored, expected)
+
+        stored_hours = {
+            row.hour_start: row
+            for row in BusinessHourRollup.objects.filter(business_date=business_date)
+        }
+        for row in expected_hours:
+            label = f"{timezone.localtime(row.hour_start):%H}:00"
+            stored_row = stored_hours.pop(row.hour_start, None) or BusinessHourRollup()
+            for field, values in SalesRollupService._diff(stored_row, row).items():
+                drift[f"{label} {field}"] = values
+        for hour_start, row in stored_hours.items():
+            label = f"{timezone.localtime(hour_start):%H}:00"
+            for field, values in SalesRollupService._diff(
+                row, BusinessHourRollup()
+            ).items():
+                drift[f"{label} {field}"] = values
+        return drift
+
+    @staticmethod
+    def rebuild_day(business_date: date) -> BusinessDayRollup:
+        """Overwrite a business day and its hours with freshly computed totals."""
+        day, hours = SalesRollupService.compute_day(business_date)
+        BusinessHourRollup.objects.filter(business_date=business_date).delete()
+        BusinessDayRollup.objects.filter(business_date=business_date).delete()
+        day.save(force_insert=True)
+        BusinessHourRollup.objects.bulk_create(hours)
+        return day
+
+    @staticmethod
+    def _create_day(business_date: date) -> None:
+        """Insert a missing day; raises ``IntegrityError`` if it already exists."""
+        day, hours = SalesRollupService.compute_day(business_date)
+        day.save(force_insert=True)
+        BusinessHourRollup.objects.filter(business_date=business_date).delete()
+        BusinessHourRollup.objects.bulk_create(hours)
+
+    @staticmethod
+    def _diff(stored, expected) -> Dict[str, Tuple[Decimal, Decimal]]:
+        return {
+            f: (getattr(stored, f), getattr(expected, f))
+            for f in ROLLUP_FIELDS
+            if getattr(stored, f) != getattr(expected, f)
+        }
@@ -4,15 +4,18 @@ from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from ...policies import can_cancel_sale
+from ...policies import can_cancel_close_sale, can_cancel_sale
+from ..report.sales_rollup_service import SalesRollupService
+
+CANCEL_FIELDS = ["state", "canceled_by", "canceled_at", "cancel_reason", "updated_at"]
 
 
 class CancelSaleService:
     """
-    Cancels/voids an open sale.
+    Cancels/voids an open or closed sale.
 
     Rules:
-        - Only OPEN sales can be canceled
+        - ``cancel_open_sale`` takes OPEN sales, ``cancel_close_sale`` CLOSED ones
         - Cancellation reason is required
         - Once canceled, sale cannot be modified or closed
 
@@ -50,8 +53,8 @@ class CancelSaleService:
         sale.canceled_at = timezone.now()
         sale.cancel_reason = cancel_reason.strip()
 
-        # 4. Save
-        sale.save()
+        # 4. Save (only these columns; the payment ledger is updated elsewhere)
+        sale.save(update_fields=CANCEL_FIELDS)
 
         return sale
 
@@ -70,7 +73,7 @@ class CancelSaleService:
             Sale instance with state=CANCELED
 
         Raises:
-            PermissionDenied: If user lacks permission or sale is CLOSED
+            PermissionDenied: If user lacks permission or sale is not CLOSED
             ValidationError: If cancel_reason is empty
         """
         # 1. Validate reason
@@ -78,7 +81,7 @@ class CancelSaleService:
             raise ValidationError(_("Cancellation reason is required"))
 
         # 2. Policy Check (checks state and permission)
-        can_cancel_sale(performer, sale)
+        can_cancel_close_sale(performer, sale)
 
         # 3. Set cancellation data
         sale.state = Sale.SaleState.CANCELED
@@ -86,7 +89,10 @@ class CancelSaleService:
         sale.canceled_at = timezone.now()
         sale.cancel_reason = cancel_reason.strip()
 
-        # 4. Save
-        sale.save()
+        # 4. Save (only these columns; the payment ledger is updated elsewhere)
+        sale.save(update_fields=CANCEL_FIELDS)
+
+        # 5. It no longer counts as a closed sale
+        SalesRollupService.record_close(sale, sign=-1)
 
         return sale
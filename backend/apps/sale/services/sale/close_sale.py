@@ -11,6 +11,9 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
+from ..report.sales_rollup_service import SalesRollupService
+from .sale_detail import SaleDetailService
+
 
 class CloseSaleService:
     """
@@ -73,9 +76,20 @@ class CloseSaleService:
                 "state",
                 "closed_by",
                 "closed_at",
+                "updated_at",
             ]
         )
 
+        # --------------------------------------------------
+        # 5. Freeze the detail view (served until a void/refund)
+        # --------------------------------------------------
+        SaleDetailService.write_snapshot(sale)
+
+        # --------------------------------------------------
+        # 6. Count it in the business-day rollup
+        # --------------------------------------------------
+        SalesRollupService.record_close(sale)
+
         return sale
 
     @staticmethod
@@ -94,26 +108,28 @@ class CloseSaleService:
         Raises:
             ValidationError: If any product lacks a recipe or calculation fails
         """
-        total_cost = Decimal("0")
-
         # Get all top-level items (parent_item is None)
         items = sale.items.filter(parent_item__isnull=True).select_related("product")
 
         from ....inventory.services import ItemProductionService
 
+        # Validate every item up front so errors still name the product
+        batch = []
         for item in items:
             product = item.product
-
-            try:
-                # Calculate production cost for this item and consume from product
-                # TODO: cosume from stock is dublicated here and payment service.
-                item_cost = ItemProductionService.get_production_total_cost(
-                    recipe=product.active_recipe, used_qt=item.quantity
-                )
-                total_cost += item_cost
-            except Exception as e:
+            if product.active_recipe_id is None:
                 raise ValidationError(
-                    _(f"Failed to calculate COGS for '{product.name}': {str(e)}")
+                    _(
+                        f"Failed to calculate COGS for '{product.name}': no active recipe"
+                    )
                 )
+            batch.append((product.active_recipe_id, Decimal(item.quantity)))
 
-        return total_cost
+        # TODO: cosume from stock is dublicated here and payment service.
+        # Consume all leaf ingredients of the sale in one FIFO pass
+        try:
+            return ItemProductionService.get_batch_total_cost(batch)
+        except ValidationError as e:
+            raise ValidationError(
+                _(f"Failed to calculate COGS: {'; '.join(e.messages)}")
+            )
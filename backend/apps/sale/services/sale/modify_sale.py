@@ -3,31 +3,85 @@ Service for modifying OPEN sales.
 This is the ONLY place allowed to mutate sale items.
 """
 
+from collections import defaultdict
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from apps.inventory.models import Product
-from apps.menu.models import Menu
-from apps.sale.models import Sale
+from apps.inventory.models import Product, Table
+from apps.menu.models import Menu, MenuCategory
+from apps.sale.models import PrintQueue, Sale, SaleItem
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from ...policies import can_modify_sale
+from ..print_queue import PrintQueueService
 from .open_sale import OpenSaleService
 
+PRINTER_FOR_GROUP = {
+    MenuCategory.Group.BAR_ITEM: PrintQueue.PrinterTarget.BAR,
+    MenuCategory.Group.FOOD: PrintQueue.PrinterTarget.KITCHEN,
+}
+
+# ``previous_table`` default: the caller did not move the sale
+TABLE_UNCHANGED = object()
+
+
+@dataclass
+class SaleEditDelta:
+    """
+    What a sync changed, per printer: ``{target: {product_id: [name, old, new]}}``
+    (quantities summed per product; extras go to their parent's printer).
+    """
+
+    lines: Dict[str, Dict[int, list]] = field(default_factory=lambda: defaultdict(dict))
+    table: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+    def add(self, target: str, product: Product, old: int = 0, new: int = 0) -> None:
+        line = self.lines[target].setdefault(product.pk, [product.name, 0, 0])
+        line[1] += old
+        line[2] += new
+
+    def for_target(self, target: str) -> Optional[dict]:
+        """``print_data["delta"]`` for one printer, or ``None`` if unchanged."""
+        lines = [
+            {"product_id": pk, "name": name, "old": old, "new": new}
+            for pk, (name, old, new) in self.lines.get(target, {}).items()
+            if old != new
+        ]
+        if not lines and self.table is None:
+            return None
+        table = {"old": self.table[0], "new": self.table[1]} if self.table else None
+        return {"lines": lines, "table": table}
+
 
 class ModifySaleService:
     """
     Reconciles frontend cart state with backend sale items.
 
+    The change set is computed in memory and applied in bulk: one DELETE for
+    removed lines, one UPDATE for quantity changes, two INSERTs for new
+    parents and extras and one write of the subtotal.
+
     HARD RULE:
         new_subtotal_amount >= sale.subtotal_paid
     """
 
     @staticmethod
     @transaction.atomic
-    def sync_items(*, sale: Sale, items_payload: List[Any], performer) -> Sale:
+    def sync_items(
+        *,
+        sale: Sale,
+        items_payload: List[Any],
+        performer,
+        previous_table: Optional[Table] = TABLE_UNCHANGED,
+    ) -> Sale:
+        """
+        Also queues an EDIT_DIFF ticket for each printer whose lines changed
+        (and for every printer if the sale moved from ``previous_table``),
+        in the same transaction.
+        """
         # --------------------------------------------------
         # 1. Policy & state validation
         # --------------------------------------------------
@@ -36,6 +90,14 @@ class ModifySaleService:
         if sale.state != Sale.SaleState.OPEN:
             raise ValidationError(_("Only OPEN sales can be modified"))
 
+        # Locked re-read: a concurrent payment can't slip under the
+        # subtotal check below
+        sale.paid_subtotal = (
+            Sale.objects.select_for_update()
+            .values_list("paid_subtotal", flat=True)
+            .get(pk=sale.pk)
+        )
+
         # --------------------------------------------------
         # 2. Handle empty cart explicitly
         # --------------------------------------------------
@@ -49,10 +111,19 @@ class ModifySaleService:
                     % {"paid": sale.subtotal_paid}
                 )
 
+            delta = ModifySaleService._new_delta(sale, previous_table)
+            ModifySaleService._record_existing(
+                delta,
+                list(sale.items.select_related("product")),
+                keep={},
+                menus={},
+            )
+
             sale.items.all().delete()
             sale.subtotal_amount = Decimal("0")
             sale.modified_by = performer
-            sale.save(update_fields=["subtotal_amount", "modified_by"])
+            sale.save(update_fields=["subtotal_amount", "modified_by", "updated_at"])
+            ModifySaleService._enqueue_edit_tickets(sale, delta)
             return sale
 
         # --------------------------------------------------
@@ -64,7 +135,10 @@ class ModifySaleService:
         }
 
         menus_map: Dict[int, Menu] = {
-            m.pk: m for m in Menu.objects.filter(pk__in=menu_ids)
+            m.pk: m
+            for m in Menu.objects.filter(pk__in=menu_ids).select_related(
+                "name", "category"
+            )
         }
         products_map: Dict[int, Product] = {
             p.pk: p for p in Product.objects.filter(pk__in=product_ids)
@@ -83,73 +157,194 @@ class ModifySaleService:
             )
 
         # --------------------------------------------------
-        # 4. Detect deletions
+        # 4. Diff the cart against the current lines (in memory)
         # --------------------------------------------------
-        incoming_item_ids: Set[int] = {
-            item.item_id for item in items_payload if item.item_id is not None
+        incoming_qty: Dict[int, int] = {
+            item.item_id: item.quantity
+            for item in items_payload
+            if item.item_id is not None
         }
 
-        sale.items.filter(parent_item__isnull=True).exclude(
-            id__in=incoming_item_ids
-        ).delete()
-
-        # --------------------------------------------------
-        # 5. Create / update items
-        # --------------------------------------------------
-        for item_data in items_payload:
-            if item_data.item_id:
-                # UPDATE quantity only
-                sale.items.filter(
-                    id=item_data.item_id,
-                    sale=sale,
-                    parent_item__isnull=True,
-                ).update(quantity=item_data.quantity)
+        current = list(sale.items.select_related("product"))
+        parents = [line for line in current if line.parent_item_id is None]
 
-            else:
-                # CREATE new item
-                menu = menus_map[item_data.menu_id]
+        delta = ModifySaleService._new_delta(sale, previous_table)
+        ModifySaleService._record_existing(
+            delta, current, keep=incoming_qty, menus=menus_map.values()
+        )
 
-                extras = [
-                    OpenSaleService.ExtraInput(
-                        product=products_map[extra.product_id],
-                        quantity=extra.quantity,
-                    )
-                    for extra in item_data.extras
-                ]
+        removed_ids = [p.pk for p in parents if p.pk not in incoming_qty]
+        changed = []
+        added_lines = []
+        for parent in parents:
+            quantity = incoming_qty.get(parent.pk)
+            if quantity is None or quantity == parent.quantity:
+                continue
+            if quantity > parent.quantity:
+                added_lines.append((parent.product, quantity - parent.quantity))
+            parent.quantity = quantity
+            changed.append(parent)
 
-                item_input = OpenSaleService.ItemInput(
-                    menu=menu,
-                    quantity=item_data.quantity,
-                    extras=extras,
+        new_items = []
+        for item_data in items_payload:
+            if item_data.item_id:
+                continue
+            menu = menus_map[item_data.menu_id]
+            extras = [
+                OpenSaleService.ExtraInput(
+                    product=products_map[extra.product_id],
+                    quantity=extra.quantity,
+                )
+                for extra in item_data.extras
+            ]
+            new_items.append(
+                OpenSaleService.ItemInput(
+                    menu=menu, quantity=item_data.quantity, extras=extras
                 )
+            )
+
+            target = ModifySaleService._target(menu)
+            delta.add(target, menu.name, new=item_data.quantity)
+            for extra in extras:
+                delta.add(target, extra.product, new=extra.quantity)
 
-                OpenSaleService.create_item_line(sale, item_input)
+        # --------------------------------------------------
+        # 5. Stock check for what the cart ADDS
+        #    (new lines, quantity increases, new extras)
+        # --------------------------------------------------
+        positions, components = {}, {}
+        OpenSaleService.check_stock(
+            lines=added_lines + [(i.menu.name, i.quantity) for i in new_items],
+            extras=[(e.product, e.quantity) for i in new_items for e in i.extras],
+            positions=positions,
+            components=components,
+        )
 
         # --------------------------------------------------
-        # 6. Recalculate subtotal (AUTHORITATIVE)
+        # 6. Price new lines and compute subtotal (AUTHORITATIVE)
         # --------------------------------------------------
-        OpenSaleService.recalculate_subtotal(sale)
-        sale.refresh_from_db()
+        new_lines = OpenSaleService.build_item_lines(
+            sale, new_items, positions, components
+        )
+        kept = [
+            line for line in current if (line.parent_item_id or line.pk) in incoming_qty
+        ]
+        subtotal = OpenSaleService.lines_total(kept) + OpenSaleService.lines_total(
+            line for parent, extras in new_lines for line in (parent, *extras)
+        )
 
         # --------------------------------------------------
         # 7. Enforce subtotal >= already paid
         # --------------------------------------------------
-        if sale.subtotal_amount < sale.subtotal_paid:
+        if subtotal < sale.subtotal_paid:
             raise ValidationError(
                 _(
                     "Cart subtotal (%(subtotal)s) cannot be lower than "
                     "already paid amount (%(paid)s)"
                 )
                 % {
-                    "subtotal": sale.subtotal_amount,
+                    "subtotal": subtotal,
                     "paid": sale.subtotal_paid,
                 }
             )
 
         # --------------------------------------------------
-        # 8. Finalize audit
+        # 8. Apply the change set
+        # --------------------------------------------------
+        if removed_ids:
+            sale.items.filter(pk__in=removed_ids).delete()
+        if changed:
+            SaleItem.objects.bulk_update(changed, ["quantity"])
+        if new_lines:
+            OpenSaleService.insert_item_lines(new_lines)
+
+        # --------------------------------------------------
+        # 9. Finalize totals & audit
         # --------------------------------------------------
+        sale.subtotal_amount = subtotal
         sale.modified_by = performer
-        sale.save(update_fields=["subtotal_amount", "modified_by"])
+        sale.save(update_fields=["subtotal_amount", "modified_by", "updated_at"])
 
+        ModifySaleService._enqueue_edit_tickets(sale, delta)
         return sale
+
+    # --------------------------------------------------
+    # Edit tickets
+    # --------------------------------------------------
+    @staticmethod
+    def _new_delta(sale: Sale, previous_table) -> SaleEditDelta:
+        delta = SaleEditDelta()
+        if previous_table is not TABLE_UNCHANGED:
+            old_id = previous_table.pk if previous_table else None
+            if old_id != sale.table_id:
+                delta.table = (
+                    previous_table.name if previous_table else None,
+                    sale.table.name if sale.table_id else None,
+                )
+        return delta
+
+    @staticmethod
+    def _record_existing(
+        delta: SaleEditDelta,
+        lines: List[SaleItem],
+        keep: Dict[int, int],
+        menus: Iterable[Menu],
+    ) -> None:
+        """
+        Record the current lines with their new quantities (``keep``:
+        surviving parent id -> quantity; others are removed). Extras go to
+        their parent's printer and are removed along with it. ``menus`` are
+        the cart's menus, already loaded with their category.
+        """
+        parents = {line.pk: line for line in lines if line.parent_item_id is None}
+        targets = ModifySaleService._targets_for(
+            (p.product_id for p in parents.values()), menus
+        )
+
+        # Unchanged lines count too: a new line of the same product merges
+        for line in lines:
+            parent = parents[line.parent_item_id or line.pk]
+            if line is parent:
+                new = keep.get(line.pk, 0)
+            else:
+                new = line.quantity if parent.pk in keep else 0
+            delta.add(
+                targets.get(parent.product_id, PrintQueue.PrinterTarget.BAR),
+                line.product,
+                old=line.quantity,
+                new=new,
+            )
+
+    @staticmethod
+    def _targets_for(
+        product_ids: Iterable[int], menus: Iterable[Menu]
+    ) -> Dict[int, str]:
+        """Printer per product; only products off the cart's menus are queried."""
+        targets = {menu.name_id: ModifySaleService._target(menu) for menu in menus}
+        missing = set(product_ids) - targets.keys()
+        if missing:
+            targets.update(
+                (menu.name_id, ModifySaleService._target(menu))
+                for menu in Menu.objects.filter(name_id__in=missing)
+                .select_related("category")
+                .only("name_id", "category__parent_group")
+            )
+        return targets
+
+    @staticmethod
+    def _target(menu: Menu) -> str:
+        return PRINTER_FOR_GROUP.get(
+            menu.category.parent_group, PrintQueue.PrinterTarget.BAR
+        )
+
+    @staticmethod
+    def _enqueue_edit_tickets(sale: Sale, delta: SaleEditDelta) -> None:
+        for target in PrintQueue.PrinterTarget.values:
+            payload = delta.for_target(target)
+            if payload is not None:
+                PrintQueueService.enqueue(
+                    printer_target=target,
+                    print_type=PrintQueue.PrintType.EDIT_DIFF,
+                    sale=sale,
+                    print_data={"delta": payload},
+                )
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from apps.inventory.models import Product, Table
+from apps.inventory.models import InventoryPosition, Product, Table
+from apps.inventory.services.bill_of_materials import ComponentsMemo
 from apps.menu.models import Menu
 from apps.menu.services.menu import MenuItemService
 from apps.sale.models import Sale, SaleItem
@@ -26,10 +28,11 @@ class OpenSaleService:
         - Validates business rules (table required for dine-in, etc.)
         - Snapshots prices at time of sale
         - Creates sale header and line items atomically
-        - Calculates and caches total amount
+        - Calculates and caches total amount (in Python, from the lines)
 
     Thread Safety: Safe (uses transaction.atomic)
-    Database Calls: O(3) - 1 for sale, 1 for items, 1 for total update
+    Database Calls: O(1) in cart size - batch pricing, 1 for sale,
+        1 for parent items, 1 for extras
     """
 
     # --- DTOs (Data Transfer Objects) ---
@@ -66,27 +69,22 @@ class OpenSaleService:
         if guest_count is not None and guest_count <= 0:
             raise ValidationError(_("Guest count must be positive"))
 
-        # check for availability in stock
-        # TODO: check for n+1 query and optimize them
+        # check for availability in stock (whole cart, one stock query)
+        positions, components = {}, {}
+        OpenSaleService.check_stock(
+            lines=[(item.menu.name, item.quantity) for item in items],
+            extras=[(e.product, e.quantity) for item in items for e in item.extras],
+            positions=positions,
+            components=components,
+        )
 
-        from apps.inventory.services import ItemProductionService
-        from apps.inventory.services import StockService as SS
+        # Price every line (one batch for menus, one for extras)
+        lines = OpenSaleService.build_item_lines(None, items, positions, components)
+        subtotal = OpenSaleService.lines_total(
+            line for parent, extras in lines for line in (parent, *extras)
+        )
 
-        for item in items:
-            product = item.menu.name_id
-            act_recipe = Product.objects.get(id=product).active_recipe
-            com_rao = ItemProductionService._get_components_and_ratio(act_recipe)
-            for p, r in com_rao:
-                qt = item.quantity * r
-                if not SS.is_enough(p, qt):
-                    raise ValidationError(f"Not enough {p.name}")
-
-            if item.extras:
-                for i in item.extras:
-                    if not SS.is_enough(i.product, Decimal(i.quantity)):
-                        raise ValidationError(f"Not enough {i.product.name}")
-
-        # Create Header
+        # Create Header, total already known
         sale = Sale.objects.create(
             opened_by=opened_by,
             sale_type=sale_type,
@@ -95,14 +93,14 @@ class OpenSaleService:
             guest=guest,
             note=note,
             state=Sale.SaleState.OPEN,
+            subtotal_amount=subtotal,
         )
 
-        # Create Items
-        for item in items:
-            OpenSaleService.create_item_line(sale, item)
-
-        # Totals
-        OpenSaleService.recalculate_subtotal(sale)
+        # Create Items: parents, then extras
+        for parent, extras in lines:
+            for line in (parent, *extras):
+                line.sale = sale
+        OpenSaleService.insert_item_lines(lines)
 
         # Print to thermal printer if requested
         # if print_order:
@@ -110,51 +108,185 @@ class OpenSaleService:
         return sale
 
     @staticmethod
-    def create_item_line(sale: Sale, item: ItemInput) -> SaleItem:
+    def check_stock(
+        *,
+        lines: Iterable[Tuple[Product, int]],
+        extras: Iterable[Tuple[Product, int]] = (),
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+        components: Optional[ComponentsMemo] = None,
+    ) -> None:
         """
-        Creates a parent SaleItem and its associated Extras.
+        Verify stock covers a cart before any item is written.
+
+        Args:
+            lines: ``(sold_product, quantity)``; exploded via the cached BOM.
+            extras: ``(product, quantity)``; consumed as-is.
+            positions: ``InventoryPositionService.get_many`` memo to fill for
+                pricing the same cart; the sold products are read along with
+                the ingredients, so pricing needs no further position query.
+            components: ``BillOfMaterialsService.load_components`` memo, filled
+                with the sold products' recipes; it supplies the leaf products
+                here and the recipe costs to pricing.
+
+        Raises:
+            ValidationError: Listing every missing ingredient.
         """
-        if item.quantity <= 0:
-            raise ValidationError(_("Item quantity must be positive"))
-        if item.menu.price is None:
-            raise ValidationError(_("Menu item has no price"))
-
-        # Create Parent (Menu Item)
-        parent = SaleItem.objects.create(
-            sale=sale,
-            product=item.menu.name,
-            quantity=item.quantity,
-            unit_price=item.menu.price,
-            material_cost=item.menu.material_cost,
+        from apps.inventory.services import (
+            BillOfMaterialsService,
+            InventoryPositionService,
+            ItemProductionService,
+            StockService,
         )
 
-        # Create Children (Extras)
-        for extra in item.extras:
-            OpenSaleService._create_extra_line(sale, parent, extra)
+        lines = list(lines)
+        # Non-positive quantities are rejected later with a precise message
+        batch = []
+        for product, quantity in lines:
+            if quantity <= 0:
+                continue
+            if product.active_recipe_id is None:
+                raise ValidationError(_(f"No active recipe for {product.name}"))
+            batch.append((product.active_recipe_id, Decimal(quantity)))
 
+        if components is None:
+            components = {}
+        BillOfMaterialsService.load_components(
+            {recipe_id for recipe_id, _qty in batch}, components
+        )
+
+        requirements: Dict[Product, Decimal] = defaultdict(Decimal)
+        for product, qty in ItemProductionService.get_batch_requirements(
+            batch, components
+        ).items():
+            requirements[product] += qty
+        for product, quantity in extras:
+            if quantity > 0:
+                requirements[product] += Decimal(quantity)
+
+        if not requirements:
+            return
+        if positions is not None:
+            InventoryPositionService.get_many(
+                {p.pk for p in requirements} | {p.pk for p, _qty in lines}, positions
+            )
+        StockService.check_availability(requirements, positions).raise_if_short()
+
+    @staticmethod
+    def create_item_line(sale: Sale, item: ItemInput) -> SaleItem:
+        """
+        Creates a parent SaleItem and its associated Extras.
+        """
+        [(parent, _extras)] = OpenSaleService.insert_item_lines(
+            OpenSaleService.build_item_lines(sale, [item])
+        )
         return parent
 
     @staticmethod
-    def _create_extra_line(sale: Sale, parent: SaleItem, extra: ExtraInput) -> SaleItem:
-        if extra.quantity <= 0:
-            raise ValidationError(_("Extra quantity must be positive"))
-
-        # Calculate Price for Extra
-        total_price, total_cost = MenuItemService.extra_req_cost(
-            product_id=extra.product.pk,
-            quantity=extra.quantity,
+    def build_item_lines(
+        sale: Optional[Sale],
+        items: Iterable[ItemInput],
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+        components: Optional[ComponentsMemo] = None,
+    ) -> List[Tuple[SaleItem, List[SaleItem]]]:
+        """
+        Unsaved ``(parent, extras)`` lines for ``items``, prices snapshotted.
+        ``sale`` may be ``None`` when the header isn't created yet; the caller
+        then sets it on every line before inserting.
+
+        Every extra in the batch is priced with one
+        ``MenuItemService.extra_req_prices`` call. Menus must come with
+        ``name`` and ``category`` loaded; ``positions`` and ``components``
+        are the memos filled by ``check_stock``.
+        """
+        items = list(items)
+        for item in items:
+            if item.quantity <= 0:
+                raise ValidationError(_("Item quantity must be positive"))
+            if item.menu.price is None:
+                raise ValidationError(_("Menu item has no price"))
+            if any(extra.quantity <= 0 for extra in item.extras):
+                raise ValidationError(_("Extra quantity must be positive"))
+
+        material_costs = OpenSaleService._material_costs(
+            (i.menu for i in items), positions, components
         )
-        unit_price = total_price / extra.quantity
-
-        return SaleItem.objects.create(
-            sale=sale,
-            parent_item=parent,
-            product=extra.product,
-            quantity=extra.quantity,
-            unit_price=unit_price,
-            material_cost=total_cost,
+        extra_products = {e.product.pk: e.product for i in items for e in i.extras}
+        prices = MenuItemService.extra_req_prices(
+            extra_products.values(), positions, components
         )
 
+        lines = []
+        for item in items:
+            parent = SaleItem(
+                sale=sale,
+                product=item.menu.name,
+                quantity=item.quantity,
+                unit_price=item.menu.price,
+                material_cost=material_costs[item.menu.pk],
+            )
+            extras = []
+            for extra in item.extras:
+                unit_price, unit_cost = prices[extra.product.pk]
+                extras.append(
+                    SaleItem(
+                        sale=sale,
+                        parent_item=parent,
+                        product=extra.product,
+                        quantity=extra.quantity,
+                        unit_price=unit_price,
+                        material_cost=unit_cost * extra.quantity,
+                    )
+                )
+            lines.append((parent, extras))
+        return lines
+
+    @staticmethod
+    def insert_item_lines(
+        lines: List[Tuple[SaleItem, List[SaleItem]]],
+    ) -> List[Tuple[SaleItem, List[SaleItem]]]:
+        """
+        Insert lines from ``build_item_lines``: parents in one INSERT (their
+        PKs come back), then every extra in a second one.
+        """
+        SaleItem.objects.bulk_create([parent for parent, _extras in lines])
+
+        extras = []
+        for parent, children in lines:
+            for child in children:
+                # Re-assign so the child picks up the parent's fresh PK
+                child.parent_item = parent
+                extras.append(child)
+        if extras:
+            SaleItem.objects.bulk_create(extras)
+        return lines
+
+    @staticmethod
+    def _material_costs(
+        menus: Iterable[Menu],
+        positions: Optional[Dict[int, InventoryPosition]] = None,
+        components: Optional[ComponentsMemo] = None,
+    ) -> Dict[int, Optional[int]]:
+        """``Menu.material_cost`` for many menus from one pricing batch."""
+        menus = {menu.pk: menu for menu in menus}
+        pending = [menu for menu in menus.values() if "material_cost" not in vars(menu)]
+        try:
+            suggested = (
+                MenuItemService.menu_prices(pending, positions, components)
+                if pending
+                else {}
+            )
+        except ValidationError:
+            # One unpriceable menu fails the batch: fall back to per-menu
+            suggested = {}
+        for pk, (_price, cost) in suggested.items():
+            menus[pk].material_cost = cost  # seeds the cached_property
+        return {pk: menu.material_cost for pk, menu in menus.items()}
+
+    @staticmethod
+    def lines_total(lines: Iterable[SaleItem]) -> Decimal:
+        """Subtotal of in-memory lines: ``sum(quantity * unit_price)``."""
+        return Decimal(sum(line.quantity * line.unit_price for line in lines))
+
     @staticmethod
     def recalculate_subtotal(sale: Sale) -> None:
         """
@@ -168,4 +300,4 @@ class OpenSaleService:
             )
         )
         sale.subtotal_amount = aggregation["total"] or Decimal("0")
-        sale.save(update_fields=["subtotal_amount"])
+        sale.save(update_fields=["subtotal_amount", "updated_at"])
@@ -0,0 +1,235 @@
+"""
+Read side of a sale's full detail (items hierarchy, payments, totals).
+
+CLOSED sales are served from a stored ``SaleDetailSnapshot``; everything
+else is built live.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from apps.menu.models import Menu
+from apps.sale.models import Sale, SaleDetailSnapshot, SaleItem
+
+# Fields hidden from viewers without ``sale.view_revenue_data``
+REVENUE_FIELDS = ("total_cost", "gross_profit", "gross_margin_percent")
+
+
+class SaleDetailService:
+    """
+    Builds and caches the sale detail payload.
+
+    Rules:
+        - A snapshot is written when the sale closes and served only while
+          the sale is CLOSED and the snapshot matches ``SNAPSHOT_VERSION``.
+        - Ledger movements (voids, refunds) drop it; the next read rebuilds.
+        - The payload always carries revenue fields; callers hide them.
+    """
+
+    # Bump when the payload layout changes: older snapshots are rebuilt
+    SNAPSHOT_VERSION = 1
+
+    @staticmethod
+    def get(sale_id: int) -> dict:
+        """
+        Detail payload for ``sale_id``: one query for a snapshotted sale.
+
+        Raises:
+            Sale.DoesNotExist
+        """
+        payload = (
+            SaleDetailSnapshot.objects.filter(
+                sale_id=sale_id,
+                sale__state=Sale.SaleState.CLOSED,
+                version=SaleDetailService.SNAPSHOT_VERSION,
+            )
+            .values_list("payload", flat=True)
+            .first()
+        )
+        if payload is not None:
+            return payload
+
+        sale = SaleDetailService._load(sale_id)
+        detail = SaleDetailService.build(sale)
+        if sale.state == Sale.SaleState.CLOSED:
+            SaleDetailService._store(sale.pk, detail)
+        return detail
+
+    @staticmethod
+    def write_snapshot(sale: Sale) -> None:
+        """Store the payload of a just-closed sale (same transaction)."""
+        sale = SaleDetailService._load(sale.pk)
+        SaleDetailService._store(sale.pk, SaleDetailService.build(sale))
+
+    @staticmethod
+    def invalidate(sale_id: int) -> None:
+        SaleDetailSnapshot.objects.filter(sale_id=sale_id).delete()
+
+    # ------------------------------------------------------------------
+    # Live path
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def build(sale: Sale) -> dict:
+        """Payload from a sale loaded by ``_load``."""
+        all_items: List[SaleItem] = list(sale.items.all())
+
+        # Payments settle the subtotal, not items: a fully paid sale covers
+        # every unit, anything less is reported as unpaid
+        fully_paid = sale.is_fully_paid
+
+        extras_by_parent: Dict[int, List[SaleItem]] = defaultdict(list)
+        parents: List[SaleItem] = []
+        for item in all_items:
+            if item.parent_item_id is None:
+                parents.append(item)
+            else:
+                extras_by_parent[item.parent_item_id].append(item)
+
+        # Map parent products back to the Menu the UI knows them by
+        product_to_menu: Dict[int, int] = dict(
+            Menu.objects.filter(
+                name_id__in={p.product_id for p in parents}
+            ).values_list("name_id", "id")
+        )
+
+        items = [
+            {
+                "id": parent.pk,
+                "menu_id": product_to_menu.get(parent.product_id),
+                "product_name": parent.product.name,
+                "quantity": parent.quantity,
+                "unit_price": parent.unit_price,
+                "total": parent.quantity * parent.unit_price,
+                "extras": [
+                    {
+                        "id": child.pk,
+                        "product_id": child.product_id,
+                        "product_name": child.product.name,
+                        "quantity": child.quantity,
+                        "unit_price": child.unit_price,
+                        "total": child.quantity * child.unit_price,
+                    }
+                    for child in extras_by_parent[parent.pk]
+                ],
+                "quantity_paid": parent.quantity if fully_paid else 0,
+                "quantity_remaining": 0 if fully_paid else parent.quantity,
+            }
+            for parent in parents
+        ]
+
+        payments = []
+        for payment in sale.payments.all():
+            account = payment.destination_account
+            payments.append(
+                {
+                    "id": payment.pk,
+                    "method": payment.method,
+                    "amount_total": _amount_total(payment),
+                    "amount_applied": payment.amount_applied,
+                    "tip_amount": payment.tip_amount,
+                    "destination_account_id": account.pk if account else None,
+                    "destination_card_number": account.card_number if account else None,
+                    "destination_account_owner": (
+                        account.account_owner if account else None
+                    ),
+                    "destination_bank_name": account.bank_name if account else None,
+                    "received_by_name": _display_name(payment.received_by),
+                    "received_at": payment.received_at,
+                    "status": payment.status,
+                    # No item-level payment tracking
+                    "covered_items": [],
+                    "covered_item_ids": [],
+                }
+            )
+
+        is_closed = sale.state == Sale.SaleState.CLOSED
+        return {
+            # ---- Sale Metadata ----
+            "id": sale.pk,
+            "state": sale.state,
+            "sale_type": sale.sale_type,
+            "table_id": sale.table_id,
+            "table_name": sale.table.name if sale.table else None,
+            "guest_id": sale.guest_id,
+            "guest_name": _display_name(sale.guest),
+            "guest_count": sale.guest_count,
+            "note": sale.note,
+            "opened_at": sale.opened_at,
+            "opened_by_name": _display_name(sale.opened_by),
+            "modified_by_name": _display_name(sale.modified_by),
+            # ---- Financial Data ----
+            "subtotal_amount": sale.subtotal_amount,
+            "discount_amount": sale.discount_amount,
+            "tax_amount": sale.tax_amount,
+            "total_amount": sale.total_amount,
+            # ---- Invoice Data (when CLOSED) ----
+            "payment_status": sale.payment_status if is_closed else None,
+            "closed_at": sale.closed_at,
+            "closed_by_name": _display_name(sale.closed_by),
+            # ---- Payment Tracking ----
+            "total_paid": sale.subtotal_paid,
+            "balance_due": sale.balance_due,
+            "is_fully_paid": sale.is_fully_paid,
+            # ---- COGS & Revenue ----
+            "total_cost": sale.total_cost,
+            "gross_profit": sale.gross_profit,
+            "gross_margin_percent": sale.gross_margin_percent,
+            # ---- Cancellation (when CANCELED) ----
+            "canceled_at": sale.canceled_at,
+            "canceled_by_name": _display_name(sale.canceled_by),
+            "cancel_reason": sale.cancel_reason,
+            # ---- Items & Payments ----
+            "items": items,
+            "payments": payments,
+        }
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load(sale_id: int) -> Sale:
+        return (
+            Sale.objects.select_related(
+                "table",
+                "guest",
+                "opened_by",
+                "modified_by",
+                "closed_by",
+                "canceled_by",
+            )
+            .prefetch_related(
+                "items__product",
+                "payments__destination_account",
+                "payments__received_by",
+            )
+            .get(pk=sale_id)
+        )
+
+    @staticmethod
+    def _store(sale_id: int, detail: dict) -> None:
+        SaleDetailSnapshot.objects.update_or_create(
+            sale_id=sale_id,
+            defaults={
+                "payload": detail,
+                "version": SaleDetailService.SNAPSHOT_VERSION,
+            },
+        )
+
+
+def _amount_total(payment) -> Decimal:
+    """What the guest handed over: applied + tax - discount + tip."""
+    return (
+        payment.amount_applied
+        + payment.tax_amount
+        - payment.discount_amount
+        + payment.tip_amount
+    )
+
+
+def _display_name(user) -> Optional[str]:
+    if user is None:
+        return None
+    return user.get_full_name() or user.mobile
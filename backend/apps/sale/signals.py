@@ -0,0 +1,19 @@
+"""
+Invalidation of the stored closed-sale detail (``SaleDetailSnapshot``).
+
+Ledger movements drop it through ``SaleLedgerService``; this covers any
+other write to a CLOSED sale (admin edits of note, table, ...). The next
+read rebuilds it.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Sale
+from .services.sale.sale_detail import SaleDetailService
+
+
+@receiver(post_save, sender=Sale)
+def invalidate_closed_sale_detail(sender, instance: Sale, **kwargs):
+    if instance.state == Sale.SaleState.CLOSED:
+        SaleDetailService.invalidate(instance.pk)
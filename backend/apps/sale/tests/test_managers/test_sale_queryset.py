@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from api.endpoints.sale_endpoints import sale_dashboard
+from apps.sale.models import Sale
+from apps.user.tests.factories import AccountFactory
+from django.utils import timezone
+
+
+@pytest.fixture
+def manager(db):
+    return AccountFactory(is_staff=True, is_superuser=True)
+
+
+def _make_sales(count, opened_by, **extra):
+    now = timezone.now()
+    return [
+        Sale.objects.create(
+            opened_by=opened_by,
+            guest=AccountFactory(),
+            sale_type=Sale.SaleType.TAKEAWAY,
+            subtotal_amount=Decimal("100"),
+            opened_at=now - timedelta(minutes=i),
+            **extra,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestSaleDashboardQuerySet:
+    def test_annotations(self, manager):
+        [sale] = _make_sales(1, manager)
+        Sale.objects.filter(pk=sale.pk).update(
+            paid_subtotal=Decimal("40"),
+            paid_tax=Decimal("9"),
+            paid_discount=Decimal("4"),
+        )
+
+        row = Sale.objects.for_dashboard().get(pk=sale.pk)
+
+        assert row.total_due == Decimal("105")
+        assert row.remaining == Decimal("60")
+        assert row.opened_by_name == manager.name
+        assert row.guest_name == sale.guest.name
+        assert row.table_name is None
+
+    def test_blank_name_falls_back_to_mobile(self, manager):
+        guest = AccountFactory(name="")
+        sale = Sale.objects.create(
+            opened_by=manager, guest=guest, sale_type=Sale.SaleType.TAKEAWAY
+        )
+
+        row = Sale.objects.for_dashboard().get(pk=sale.pk)
+
+        assert row.guest_name == guest.mobile
+
+    def test_keyset_pages_cover_all_rows_once(self, manager):
+        sales = _make_sales(5, manager)
+        # Same timestamp for two rows forces the id tiebreak
+        Sale.objects.filter(pk=sales[2].pk).update(opened_at=sales[1].opened_at)
+
+        qs = Sale.objects.for_dashboard()
+        seen, page = [], list(qs[:2])
+        while page:
+            seen.extend(s.pk for s in page)
+            last = page[-1]
+            page = list(qs.before(last.opened_at, last.pk)[:2])
+
+        assert sorted(seen) == sorted(s.pk for s in sales)
+        assert len(seen) == len(set(seen))
+
+
+@pytest.mark.django_db
+class TestSaleDashboardEndpoint:
+    def _call(self, user, **params):
+        return sale_dashboard(SimpleNamespace(auth=user), **params)
+
+    @pytest.mark.parametrize("count", [3, 30])
+    def test_query_count_is_constant(self, manager, count, django_assert_num_queries):
+        _make_sales(count, manager)
+
+        with django_assert_num_queries(1):
+            response = self._call(manager, limit=100)
+
+        assert response.total_count == count
+
+    def test_cursor_pagination(self, manager):
+        sales = _make_sales(3, manager)
+
+        first = self._call(manager, limit=2)
+        second = self._call(manager, limit=2, cursor=first.next_cursor)
+
+        assert [s.id for s in first.active_sales] == [sales[0].pk, sales[1].pk]
+        assert [s.id for s in second.active_sales] == [sales[2].pk]
+        assert second.next_cursor is None
+
+    def test_invalid_cursor(self, manager):
+        status, body = self._call(manager, cursor="garbage", limit=10)
+
+        assert status == 422
@@ -0,0 +1,135 @@
+"""
+Tests for DailyReport model.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from apps.sale.models import (
+    BusinessDayRollup,
+    DailyReport,
+    DailyReportPaymentMethod,
+    SalePayment,
+)
+from apps.sale.services.report.create_daily_report_service import (
+    CreateDailyReportService,
+)
+from apps.user.tests.factories import AccountFactory
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+REPORT_DATE = date(2025, 3, 10)
+
+
+@pytest.fixture
+def report(db):
+    BusinessDayRollup.objects.create(
+        business_date=REPORT_DATE,
+        gross_sales=Decimal("400"),
+        cash_payments=Decimal("250"),
+        pos_payments=Decimal("150"),
+    )
+    report = CreateDailyReportService.execute(
+        created_by=AccountFactory(is_staff=True, is_superuser=True),
+        report_date=REPORT_DATE,
+        closing_cash_counted=240,
+        pos_total_report=Decimal("155"),
+        notes=None,
+    )
+    DailyReportPaymentMethod.objects.get(
+        daily_report=report, payment_method=SalePayment.PaymentMethod.POS
+    ).save()  # recompute variance from the actual amount
+    return report
+
+
+def _properties(report):
+    return (
+        report.expected_cash_total,
+        report.actual_pos_total,
+        report.cash_variance,
+        report.pos_variance,
+        report.card_transfer_variance,
+        report.total_variance,
+    )
+
+
+@pytest.mark.django_db
+class TestDailyReportPaymentMethods:
+    def test_details_loader_prefetches_payment_methods(self, report):
+        with CaptureQueriesContext(connection) as queries:
+            loaded = DailyReport.objects.with_details().get(pk=report.pk)
+            values = _properties(loaded)
+            loaded.created_by.mobile
+
+        assert len(queries) == 2
+        assert values == (
+            Decimal("250"),
+            Decimal("155"),
+            Decimal("-10"),
+            Decimal("5"),
+            Decimal("0"),
+            sum(row.variance for row in report.payment_methods.all()),
+        )
+
+    def test_plain_instance_loads_payment_methods_once(self, report):
+        loaded = DailyReport.objects.get(pk=report.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            _properties(loaded)
+
+        assert len(queries) == 1
+
+    def test_refresh_reloads_payment_methods(self, report):
+        loaded = DailyReport.objects.with_details().get(pk=report.pk)
+        assert loaded.actual_pos_total == Decimal("155")
+
+        DailyReportPaymentMethod.objects.filter(
+            daily_report=report, payment_method=SalePayment.PaymentMethod.POS
+        ).update(actual_amount=Decimal("160"))
+        loaded.refresh_from_db()
+
+        assert loaded.actual_pos_total == Decimal("160")
+
+    def test_missing_method_raises_does_not_exist(self, report):
+        report.payment_methods.filter(
+            payment_method=SalePayment.PaymentMethod.POS
+        ).delete()
+        loaded = DailyReport.objects.with_details().get(pk=report.pk)
+
+        with pytest.raises(DailyReportPaymentMethod.DoesNotExist):
+            loaded.pos_variance
+
+
+@pytest.mark.django_db
+class TestDailyReportClean:
+    def test_draft_can_change_status(self, report):
+        loaded = DailyReport.objects.get(pk=report.pk)
+        loaded.status = DailyReport.ReportStatus.APPROVED
+
+        with CaptureQueriesContext(connection) as queries:
+            loaded.clean()
+
+        assert len(queries) == 0
+
+    def test_approved_status_is_final(self, report):
+        DailyReport.objects.filter(pk=report.pk).update(
+            status=DailyReport.ReportStatus.APPROVED
+        )
+        loaded = DailyReport.objects.get(pk=report.pk)
+        loaded.status = DailyReport.ReportStatus.DRAFT
+
+        with CaptureQueriesContext(connection) as queries:
+            with pytest.raises(ValidationError):
+                loaded.clean()
+
+        assert len(queries) == 0
+
+    def test_status_is_tracked_across_saves(self, report):
+        report.status = DailyReport.ReportStatus.APPROVED
+        report.save()
+
+        report.status = DailyReport.ReportStatus.DRAFT
+        with pytest.raises(ValidationError):
+            report.clean()
@@ -0,0 +1,226 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from apps.inventory.models import PurchaseInvoice
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    PurchaseInvoiceFactory,
+    PurchaseItemFactory,
+)
+from apps.sale.models import Sale, SaleItem, SalePayment, SaleRefund
+from apps.sale.services.report.create_daily_report_service import (
+    CreateDailyReportService,
+)
+from apps.user.tests.factories import AccountFactory
+
+REPORT_DATE = date(2025, 3, 10)
+DAY_START, DAY_END = CreateDailyReportService._calculate_business_day_range(REPORT_DATE)
+
+
+def _reference_expected_amounts(day_start, day_end) -> dict:
+    """The per-row computation the aggregate queries replaced."""
+    invoices = Sale.objects.filter(
+        created_at__gte=day_start,
+        created_at__lt=day_end,
+        state=Sale.SaleState.CLOSED,
+    )
+    payments = SalePayment.objects.filter(
+        received_at__gte=day_start,
+        received_at__lt=day_end,
+        status=SalePayment.PaymentStatus.COMPLETED,
+    )
+    refunds = SaleRefund.objects.filter(
+        processed_at__gte=day_start,
+        processed_at__lt=day_end,
+        status=SaleRefund.Status.COMPLETED,
+    )
+
+    expenses = Decimal("0")
+    for invoice in PurchaseInvoice.objects.filter(
+        issue_date__gte=day_start, issue_date__lt=day_end
+    ):
+        expenses += invoice.total_cost or 0
+
+    methods = dict.fromkeys(SalePayment.PaymentMethod.values, Decimal("0"))
+    for payment in payments:
+        methods[
+            CreateDailyReportService._normalize_method(payment.method)
+        ] += payment.amount_applied
+    for refund in refunds:
+        methods[
+            CreateDailyReportService._normalize_method(refund.method)
+        ] -= refund.amount
+
+    return {
+        "total_sales": sum((s.total_amount for s in invoices), Decimal("0")),
+        "total_refunds": sum((r.amount for r in refunds), Decimal("0")),
+        "total_discounts": sum((s.discount_amount for s in invoices), Decimal("0")),
+        "total_tax": sum((s.tax_amount for s in invoices), Decimal("0")),
+        "payment_methods": methods,
+        "card_transfer_confirmed": sum(
+            (
+                p.amount_applied + p.tax_amount - p.discount_amount + p.tip_amount
+                for p in payments
+                if p.method == SalePayment.PaymentMethod.CARD_TRANSFER and p.confirmed
+            ),
+            Decimal("0"),
+        ),
+        "cogs": sum(
+            (
+                item.quantity * item.material_cost
+                for item in SaleItem.objects.filter(sale__in=invoices)
+            ),
+            Decimal("0"),
+        ),
+        "expenses": expenses,
+    }
+
+
+def _sale(opened_by, *, at, state=Sale.SaleState.CLOSED, subtotal=100, **ledger):
+    sale = Sale.objects.create(
+        opened_by=opened_by,
+        sale_type=Sale.SaleType.TAKEAWAY,
+        subtotal_amount=Decimal(subtotal),
+    )
+    Sale.objects.filter(pk=sale.pk).update(state=state, created_at=at, **ledger)
+    for quantity, cost in ((1, 30), (2, 7)):
+        SaleItem.objects.create(
+            sale=sale,
+            product=ProductFactory(),
+            quantity=quantity,
+            unit_price=50,
+            material_cost=cost,
+        )
+    return sale
+
+
+def _payment(sale, method, applied, *, at, **fields):
+    return SalePayment.objects.create(
+        sale=sale,
+        method=method,
+        amount_applied=Decimal(applied),
+        received_by=sale.opened_by,
+        received_at=at,
+        **fields,
+    )
+
+
+@pytest.fixture
+def busy_day(db):
+    staff = AccountFactory(is_staff=True)
+    noon = DAY_START + timedelta(hours=10)
+    late = DAY_END - timedelta(minutes=5)  # still the same business day
+
+    first = _sale(
+        staff, at=noon, subtotal=200, paid_discount=Decimal("12.5"), paid_tax=18
+    )
+    second = _sale(staff, at=late, subtotal=90, paid_tax=Decimal("8.1"))
+    _sale(staff, at=noon, state=Sale.SaleState.OPEN, subtotal=500)
+    _sale(staff, at=DAY_START - timedelta(minutes=1), subtotal=700)
+
+    cash = _payment(first, SalePayment.PaymentMethod.CASH, 120, at=noon)
+    pos = _payment(first, SalePayment.PaymentMethod.POS, 80, at=noon)
+    _payment(
+        second,
+        SalePayment.PaymentMethod.CARD_TRANSFER,
+        60,
+        at=late,
+        tax_amount=Decimal("5.4"),
+        tip_amount=Decimal("10"),
+        confirmed=True,
+    )
+    _payment(second, SalePayment.PaymentMethod.CARD_TRANSFER, 30, at=late)
+    _payment(second, "BANK_TRANSFER", 15, at=late)
+    _payment(
+        second,
+        SalePayment.PaymentMethod.CASH,
+        999,
+        at=noon,
+        status=SalePayment.PaymentStatus.VOID,
+    )
+    _payment(second, SalePayment.PaymentMethod.POS, 999, at=DAY_END)
+
+    SaleRefund.objects.create(
+        payment=cash,
+        amount=Decimal("20"),
+        method=SalePayment.PaymentMethod.CARD_TRANSFER,
+        processed_by=staff,
+        processed_at=late,
+    )
+    SaleRefund.objects.create(
+        payment=pos,
+        amount=Decimal("30"),
+        method=SalePayment.PaymentMethod.POS,
+        processed_by=staff,
+        processed_at=noon,
+        status=SaleRefund.Status.VOID,
+    )
+
+    for issued in (REPORT_DATE, REPORT_DATE, REPORT_DATE + timedelta(days=1)):
+        invoice = PurchaseInvoiceFactory(issue_date=issued, staff=staff)
+        PurchaseItemFactory.create_batch(
+            2,
+            purchase_invoice=invoice,
+            quantity=Decimal("1.5"),
+            purchased_unit_price=Decimal("40.25"),
+        )
+    PurchaseInvoiceFactory(issue_date=REPORT_DATE, staff=staff)  # no items yet
+
+
+@pytest.mark.django_db
+class TestExpectedAmounts:
+    def test_matches_per_row_computation(self, busy_day):
+        expected = _reference_expected_amounts(DAY_START, DAY_END)
+
+        result = CreateDailyReportService._calculate_expected_amounts(
+            DAY_START, DAY_END
+        )
+
+        assert result == expected
+        assert result["total_sales"] == Decimal("303.6")
+        assert result["payment_methods"] == {
+            SalePayment.PaymentMethod.CASH: Decimal("120"),
+            SalePayment.PaymentMethod.POS: Decimal("80"),
+            SalePayment.PaymentMethod.CARD_TRANSFER: Decimal("85"),
+        }
+        assert result["card_transfer_confirmed"] == Decimal("75.4")
+
+    def test_query_count_is_fixed(self, busy_day, django_assert_num_queries):
+        with django_assert_num_queries(5):
+            CreateDailyReportService._calculate_expected_amounts(DAY_START, DAY_END)
+
+    def test_empty_day(self, db):
+        result = CreateDailyReportService._calculate_expected_amounts(
+            DAY_START, DAY_END
+        )
+
+        assert result == _reference_expected_amounts(DAY_START, DAY_END)
+        assert set(result["payment_methods"]) == set(SalePayment.PaymentMethod.values)
+
+
+@pytest.mark.django_db
+class TestExecute:
+    def test_creates_report_from_aggregates(self, busy_day):
+        report = CreateDailyReportService.execute(
+            created_by=AccountFactory(is_staff=True, is_superuser=True),
+            report_date=REPORT_DATE,
+            opening_float=50,
+            closing_cash_counted=170,
+            pos_total_report=Decimal("80"),
+            notes=None,
+        )
+        report.refresh_from_db()
+
+        assert report.expected_total_sales == 303
+        assert report.expected_total_refunds == 20
+        assert report.total_expenses == Decimal("241.5")
+        rows = {
+            row.payment_method: (row.expected_amount, row.actual_amount)
+            for row in report.payment_methods.all()
+        }
+        assert rows == {
+            SalePayment.PaymentMethod.CASH: (Decimal("120"), Decimal("120")),
+            SalePayment.PaymentMethod.POS: (Decimal("80"), Decimal("80")),
+            SalePayment.PaymentMethod.CARD_TRANSFER: (Decimal("85"), Decimal("75.4")),
+        }
@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+import pytest
+from apps.inventory.services import StockService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from apps.menu.tests.factories import MenuFactory
+from apps.sale.models import Sale, SaleItem
+from apps.sale.services.sale.open_sale import OpenSaleService
+from apps.user.tests.factories import AccountFactory
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def menu(db):
+    """Two menus on one in-stock ingredient, plus a priced extra."""
+    ingredient = ProductFactory(is_stock_traceable=True)
+    StockService.add_to_stock(ingredient, Decimal("2"), Decimal("1000"))
+    recipe = RecipeFactory()
+    RecipeComponentFactory(recipe=recipe, consume_product=ingredient, quantity=1)
+
+    menus = [MenuFactory(price=price) for price in (100, 150)]
+    for m in menus:
+        m.name.active_recipe = recipe
+        m.name.save()
+
+    syrup = ProductFactory(is_stock_traceable=True)
+    StockService.add_to_stock(syrup, Decimal("10"), Decimal("1000"))
+    return {"menus": menus, "syrup": syrup}
+
+
+def _cart(menu, lines):
+    return [
+        OpenSaleService.ItemInput(
+            menu=menu["menus"][i % 2],
+            quantity=2,
+            extras=(
+                [OpenSaleService.ExtraInput(product=menu["syrup"], quantity=3)]
+                if i % 2
+                else []
+            ),
+        )
+        for i in range(lines)
+    ]
+
+
+def _open(items):
+    return OpenSaleService.open_sale(
+        opened_by=AccountFactory(is_superuser=True, is_staff=True),
+        sale_type=Sale.SaleType.TAKEAWAY,
+        items=items,
+    )
+
+
+@pytest.mark.django_db
+class TestOpenSaleBulk:
+    def test_lines_and_subtotal(self, menu):
+        sale = _open(_cart(menu, 4))
+
+        parents = SaleItem.objects.filter(sale=sale, parent_item__isnull=True)
+        extras = SaleItem.objects.filter(sale=sale, parent_item__isnull=False)
+        assert parents.count() == 4
+        assert extras.count() == 2
+        assert {e.parent_item.product_id for e in extras} == {menu["menus"][1].name_id}
+
+        extra = extras.first()
+        assert extra.quantity == 3
+        assert extra.material_cost == 30
+        expected = 2 * (2 * 100 + 2 * 150) + 2 * 3 * extra.unit_price
+        sale.refresh_from_db()
+        assert sale.subtotal_amount == Decimal(expected)
+
+    def test_query_count_does_not_grow_with_cart(self, menu):
+        _open(_cart(menu, 2))  # warm pricing / BOM caches
+
+        counts = []
+        for lines in (2, 40):
+            items = _cart(menu, lines)
+            user = AccountFactory(is_superuser=True, is_staff=True)
+            with CaptureQueriesContext(connection) as ctx:
+                OpenSaleService.open_sale(
+                    opened_by=user, sale_type=Sale.SaleType.TAKEAWAY, items=items
+                )
+            counts.append(len(ctx))
+
+        assert counts[0] == counts[1]
+
+    def test_invalid_extra_writes_nothing(self, menu):
+        items = _cart(menu, 2)
+        items[1].extras[0].quantity = 0
+
+        with pytest.raises(ValidationError):
+            _open(items)
+
+        assert not Sale.objects.exists()
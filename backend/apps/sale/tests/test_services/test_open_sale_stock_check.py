@@ -0,0 +1,69 @@
+import pytest
+from apps.inventory.models import Stock
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from apps.sale.services.sale.open_sale import OpenSaleService
+from django.core.exceptions import ValidationError
+
+
+@pytest.fixture
+def latte(db):
+    """Sellable product whose recipe uses 2 milk + 1 coffee."""
+    milk = ProductFactory(is_stock_traceable=True, name="milk")
+    coffee = ProductFactory(is_stock_traceable=True, name="coffee")
+    recipe = RecipeFactory()
+    RecipeComponentFactory(recipe=recipe, consume_product=milk, quantity=2)
+    RecipeComponentFactory(recipe=recipe, consume_product=coffee, quantity=1)
+    product = recipe.produced_product
+    product.active_recipe = recipe
+    product.save()
+    for p in (milk, coffee):
+        Stock.objects.create(
+            stored_product=p,
+            initial_quantity=5,
+            remaining_quantity=5,
+            unit_price=1,
+        )
+    return {"product": product, "milk": milk, "coffee": coffee}
+
+
+@pytest.mark.django_db
+class TestOpenSaleStockCheck:
+    def test_requirements_merge_across_lines_and_extras(self, latte):
+        # 2 lattes (4 milk) + 1 extra milk = 5 milk: exactly enough
+        OpenSaleService.check_stock(
+            lines=[(latte["product"], 1), (latte["product"], 1)],
+            extras=[(latte["milk"], 1)],
+        )
+
+        with pytest.raises(ValidationError) as exc:
+            OpenSaleService.check_stock(
+                lines=[(latte["product"], 2)],
+                extras=[(latte["milk"], 2)],
+            )
+        assert "milk" in exc.value.messages[0]
+
+    def test_lists_all_missing_ingredients(self, latte):
+        with pytest.raises(ValidationError) as exc:
+            OpenSaleService.check_stock(lines=[(latte["product"], 6)])
+
+        assert len(exc.value.messages) == 2
+
+    def test_product_without_recipe(self, db):
+        with pytest.raises(ValidationError):
+            OpenSaleService.check_stock(lines=[(ProductFactory(), 1)])
+
+    def test_query_count_independent_of_cart_size(
+        self, latte, django_assert_max_num_queries
+    ):
+        OpenSaleService.check_stock(lines=[(latte["product"], 1)])  # warm BOM
+
+        # recipe components (leaf products included) + positions
+        with django_assert_max_num_queries(2):
+            OpenSaleService.check_stock(
+                lines=[(latte["product"], 1)] * 2,
+                extras=[(latte["milk"], 1)],
+            )
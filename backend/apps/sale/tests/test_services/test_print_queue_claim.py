@@ -0,0 +1,120 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from api.endpoints.print_queue_endpoints import acknowledge_jobs
+from api.schemas.print_queue_schemas import PrintJobAckRequest
+from apps.sale.models import PrintQueue
+from apps.sale.services import PrintQueueService
+from apps.user.tests.factories import AccountFactory
+from django.core.exceptions import PermissionDenied
+from django.utils import timezone
+
+BAR = PrintQueue.PrinterTarget.BAR
+Status = PrintQueue.PrintStatus
+
+
+def _jobs(count, target=BAR):
+    return [
+        PrintQueue.objects.create(printer_target=target, print_data={"n": i})
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestClaim:
+    def test_agents_get_disjoint_batches(self):
+        jobs = _jobs(5)
+
+        first = PrintQueueService.claim(BAR, agent="pc-1", limit=3)
+        second = PrintQueueService.claim(BAR, agent="pc-2", limit=3)
+
+        assert [j.pk for j in first] == [j.pk for j in jobs[:3]]
+        assert [j.pk for j in second] == [j.pk for j in jobs[3:]]
+        assert PrintQueueService.claim(BAR, agent="pc-3") == []
+
+        row = PrintQueue.objects.get(pk=jobs[0].pk)
+        assert row.status == Status.IN_PROGRESS
+        assert row.claimed_by == "pc-1"
+        assert row.lease_expires_at > timezone.now()
+
+    def test_expired_lease_is_reclaimed(self):
+        [job] = _jobs(1)
+        PrintQueueService.claim(BAR, agent="pc-1")
+        PrintQueue.objects.filter(pk=job.pk).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        [reclaimed] = PrintQueueService.claim(BAR, agent="pc-2")
+
+        assert reclaimed.pk == job.pk
+        assert reclaimed.claimed_by == "pc-2"
+
+
+@pytest.mark.django_db
+class TestAcknowledge:
+    def test_settles_whole_batch(self, django_assert_max_num_queries):
+        jobs = _jobs(4)
+        PrintQueueService.claim(BAR, agent="pc-1")
+
+        with django_assert_max_num_queries(4):
+            result = PrintQueueService.acknowledge(
+                BAR,
+                agent="pc-1",
+                printed=[jobs[0].pk, jobs[1].pk],
+                failed={jobs[2].pk: "paper out", jobs[3].pk: "paper out"},
+            )
+
+        assert (result.printed, result.failed) == (2, 2)
+        failed = PrintQueue.objects.get(pk=jobs[2].pk)
+        assert failed.status == Status.FAILED
+        assert failed.retry_count == 1
+        assert PrintQueue.objects.get(pk=jobs[0].pk).printed_at is not None
+
+    def test_lost_lease_is_not_overwritten(self):
+        [job] = _jobs(1)
+        PrintQueueService.claim(BAR, agent="pc-1")
+        PrintQueue.objects.filter(pk=job.pk).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        PrintQueueService.claim(BAR, agent="pc-2")
+
+        result = PrintQueueService.acknowledge(BAR, agent="pc-1", printed=[job.pk])
+
+        assert result.printed == 0
+        assert PrintQueue.objects.get(pk=job.pk).claimed_by == "pc-2"
+
+    def test_other_printer_jobs_are_not_touched(self):
+        [job] = _jobs(1, target=PrintQueue.PrinterTarget.KITCHEN)
+        PrintQueueService.claim(PrintQueue.PrinterTarget.KITCHEN, agent="pc-1")
+
+        result = PrintQueueService.acknowledge(BAR, agent="pc-1", printed=[job.pk])
+
+        assert result.printed == 0
+        assert PrintQueue.objects.get(pk=job.pk).status == Status.IN_PROGRESS
+
+    def test_model_mark_as_failed_increments_in_database(self):
+        [job] = _jobs(1)
+        stale = PrintQueue.objects.get(pk=job.pk)
+
+        job.mark_as_failed("jam")
+        stale.mark_as_failed("jam")
+
+        assert PrintQueue.objects.get(pk=job.pk).retry_count == 2
+        assert stale.retry_count == 2
+
+
+@pytest.mark.django_db
+class TestAcknowledgeEndpoint:
+    def test_requires_printer_permission(self):
+        [job] = _jobs(1)
+        PrintQueueService.claim(BAR, agent="pc-1")
+
+        with pytest.raises(PermissionDenied):
+            acknowledge_jobs(
+                SimpleNamespace(auth=AccountFactory()),
+                "bar",
+                PrintJobAckRequest(agent="pc-1", printed=[job.pk]),
+            )
+
+        assert PrintQueue.objects.get(pk=job.pk).status == Status.IN_PROGRESS
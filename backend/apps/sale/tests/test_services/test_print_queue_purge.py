@@ -0,0 +1,66 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from apps.sale.models import PrintQueue
+from apps.sale.services import PrintQueueService
+from django.core.management import call_command
+from django.utils import timezone
+
+Status = PrintQueue.PrintStatus
+
+
+def _job(status, age_days):
+    job = PrintQueue.objects.create(
+        printer_target=PrintQueue.PrinterTarget.BAR, print_data={}, status=status
+    )
+    PrintQueue.objects.filter(pk=job.pk).update(
+        created_at=timezone.now() - timedelta(days=age_days)
+    )
+    return job
+
+
+@pytest.mark.django_db
+class TestPrintQueuePurge:
+    def test_purges_only_old_settled_jobs_in_batches(self):
+        old = [_job(Status.PRINTED, 40) for _ in range(5)]
+        kept = [
+            _job(Status.PRINTED, 1),
+            _job(Status.PENDING, 40),
+            _job(Status.FAILED, 40),
+        ]
+
+        purged = PrintQueueService.purge(
+            older_than=timezone.now() - timedelta(days=30), batch_size=2
+        )
+
+        assert purged == len(old)
+        assert set(PrintQueue.objects.values_list("pk", flat=True)) == {
+            j.pk for j in kept
+        }
+
+    def test_table_stats_counts_by_status(self):
+        _job(Status.PRINTED, 1)
+        _job(Status.PENDING, 1)
+
+        stats = PrintQueueService.table_stats()
+
+        assert stats["rows"] == {Status.PRINTED: 1, Status.PENDING: 1}
+
+    def test_command_dry_run_keeps_rows(self):
+        _job(Status.FAILED, 40)
+        out = StringIO()
+
+        call_command("print_queue_purge", "--include-failed", "--dry-run", stdout=out)
+
+        assert "Would purge 1 job(s)." in out.getvalue()
+        assert PrintQueue.objects.count() == 1
+
+    def test_command_purges(self):
+        _job(Status.PRINTED, 40)
+        out = StringIO()
+
+        call_command("print_queue_purge", "--days", "30", stdout=out)
+
+        assert "Purged 1 job(s)." in out.getvalue()
+        assert not PrintQueue.objects.exists()
@@ -0,0 +1,60 @@
+import threading
+from time import monotonic
+
+import pytest
+from apps.sale.models import PrintQueue
+from apps.sale.services import PrintQueueService
+from apps.sale.services.print_queue import PrintQueueNotifier
+
+BAR = PrintQueue.PrinterTarget.BAR
+KITCHEN = PrintQueue.PrinterTarget.KITCHEN
+
+
+def _job(target=BAR):
+    return PrintQueue.objects.create(printer_target=target, print_data={"n": 1})
+
+
+@pytest.mark.django_db
+class TestWaitForJobs:
+    def test_returns_pending_jobs_immediately(self):
+        job = _job()
+        _job(KITCHEN)
+
+        started = monotonic()
+        jobs = PrintQueueService.wait_for_jobs(BAR, timeout=5)
+
+        assert jobs == [job]
+        assert monotonic() - started < 1
+
+    def test_after_skips_jobs_already_handed_out(self):
+        old = _job()
+        new = _job()
+
+        assert PrintQueueService.wait_for_jobs(BAR, after_id=old.pk, timeout=1) == [new]
+
+    def test_times_out_empty(self):
+        started = monotonic()
+
+        assert PrintQueueService.wait_for_jobs(BAR, timeout=0.1) == []
+        assert monotonic() - started >= 0.1
+
+    def test_enqueue_notifies_target_on_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        with PrintQueueNotifier.listen(BAR) as wait:
+            with django_capture_on_commit_callbacks(execute=True):
+                PrintQueueService.enqueue(printer_target=BAR, print_data={})
+
+            assert wait(0) is True
+
+
+class TestLocalNotifier:
+    def test_wakes_waiter_of_same_target_only(self):
+        with PrintQueueNotifier.listen(KITCHEN) as kitchen:
+            with PrintQueueNotifier.listen(BAR) as bar:
+                threading.Timer(0.05, PrintQueueNotifier._signal_local, [BAR]).start()
+
+                started = monotonic()
+                assert bar(5) is True
+                assert monotonic() - started < 1
+                assert kitchen(0) is False
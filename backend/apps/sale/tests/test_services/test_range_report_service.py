@@ -0,0 +1,242 @@
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from api.endpoints.report_endpoints import list_reports, range_report
+from apps.inventory.tests.factories import PurchaseItemFactory
+from apps.sale.models import BusinessDayRollup, Sale, SalePayment
+from apps.sale.services.report.create_daily_report_service import (
+    CreateDailyReportService,
+)
+from apps.sale.services.report.range_report_service import (
+    COLUMNS,
+    DateRange,
+    Period,
+    RangeReportService,
+)
+from apps.sale.services.report.sales_rollup_service import business_date_of
+from apps.user.tests.factories import AccountFactory
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+MARCH = DateRange(date(2025, 3, 1), date(2025, 3, 31))
+
+
+@pytest.fixture
+def manager(db):
+    return AccountFactory(is_staff=True, is_superuser=True)
+
+
+@pytest.fixture
+def march(db):
+    """Three active days in March 2025; every other day has no rollup yet."""
+    for day, cash, refunds in ((3, 100, 0), (10, 250, 20), (31, 50, 5)):
+        BusinessDayRollup.objects.create(
+            business_date=date(2025, 3, day),
+            sales_count=2,
+            gross_sales=Decimal(cash + 10),
+            discounts=Decimal("10"),
+            tax=Decimal("4"),
+            cogs=Decimal("30"),
+            cash_payments=Decimal(cash),
+            cash_refunds=Decimal(refunds),
+        )
+    PurchaseItemFactory(
+        purchase_invoice__issue_date=date(2025, 3, 10),
+        quantity=Decimal("2"),
+        purchased_unit_price=Decimal("40"),
+    )
+
+
+class TestPeriodBounds:
+    def test_week_runs_saturday_to_friday(self):
+        assert RangeReportService.period_bounds(Period.WEEK, date(2025, 3, 12)) == (
+            date(2025, 3, 8),
+            date(2025, 3, 14),
+        )
+
+    def test_month(self):
+        assert RangeReportService.period_bounds(Period.MONTH, date(2024, 2, 10)) == (
+            date(2024, 2, 1),
+            date(2024, 2, 29),
+        )
+
+    def test_jalali_month(self):
+        # Esfand 1403 (a leap year) has 30 days
+        assert RangeReportService.period_bounds(
+            Period.JALALI_MONTH, date(2025, 3, 1)
+        ) == (date(2025, 2, 19), date(2025, 3, 20))
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"start": date(2025, 1, 1), "end": date(2026, 1, 2)},
+            {"start": date(2025, 2, 1), "end": date(2025, 1, 1)},
+            {"start": date(2025, 2, 1)},
+            {"period": "quarter"},
+            {},
+        ],
+    )
+    def test_invalid_ranges(self, kwargs):
+        with pytest.raises(ValidationError):
+            RangeReportService.resolve_range(**kwargs)
+
+
+@pytest.mark.django_db
+class TestRangeReport:
+    def test_one_row_per_day(self, march):
+        RangeReportService.prepare(MARCH)
+        rows = list(RangeReportService.iter_days(MARCH))
+
+        assert [row["business_date"] for row in rows] == [
+            MARCH.start + timedelta(days=i) for i in range(31)
+        ]
+        tenth = rows[9]
+        assert tenth["jalali_date"] == "1403/12/20"
+        assert tenth["total_sales"] == Decimal("254")
+        assert tenth["net_revenue"] == Decimal("234")
+        assert tenth["gross_profit"] == Decimal("204")
+        assert tenth["cash_net"] == Decimal("230")
+        assert tenth["expenses"] == Decimal("80")
+        assert rows[0]["sales_count"] == 0
+
+    def test_totals_match_rows(self, march):
+        RangeReportService.prepare(MARCH)
+        rows = list(RangeReportService.iter_days(MARCH))
+        totals = RangeReportService.totals(MARCH)
+
+        for key, _label in COLUMNS[2:]:
+            assert totals[key] == sum(row[key] for row in rows), key
+        assert totals["sales_count"] == 6
+        assert totals["expenses"] == Decimal("80")
+
+    def test_missing_days_are_built_from_source_rows(self, manager):
+        today = business_date_of(timezone.now())
+        sale = Sale.objects.create(
+            opened_by=manager,
+            sale_type=Sale.SaleType.TAKEAWAY,
+            subtotal_amount=Decimal("75"),
+        )
+        SalePayment.objects.create(
+            sale=sale,
+            method=SalePayment.PaymentMethod.CASH,
+            amount_applied=Decimal("75"),
+            received_by=manager,
+        )
+        BusinessDayRollup.objects.all().delete()
+        date_range = DateRange(today - timedelta(days=2), today)
+
+        assert RangeReportService.totals(date_range)["cash_net"] == Decimal("0")
+        assert not BusinessDayRollup.objects.exists()  # reads never build
+
+        RangeReportService.prepare(date_range)
+
+        assert RangeReportService.totals(date_range)["cash_net"] == Decimal("75")
+        assert BusinessDayRollup.objects.count() == 3
+
+    def test_future_days_are_not_built(self, db):
+        today = business_date_of(timezone.now())
+
+        RangeReportService.prepare(DateRange(today, today + timedelta(days=5)))
+
+        assert list(
+            BusinessDayRollup.objects.values_list("business_date", flat=True)
+        ) == [today]
+
+    def test_history_is_left_to_the_backfill_command(self, db):
+        today = business_date_of(timezone.now())
+
+        with pytest.raises(ValidationError):
+            RangeReportService.prepare(DateRange(today - timedelta(days=40), today))
+        assert not BusinessDayRollup.objects.exists()
+
+
+@pytest.mark.django_db
+class TestRangeReportEndpoint:
+    def test_json(self, manager, march):
+        response = range_report(
+            SimpleNamespace(auth=manager),
+            period=Period.MONTH,
+            anchor=date(2025, 3, 15),
+            start=None,
+            end=None,
+            export="json",
+        )
+
+        assert (response.start, response.end) == (MARCH.start, MARCH.end)
+        assert len(response.days) == 31
+        assert response.totals.expenses == Decimal("80")
+
+    def test_streams_csv(self, manager, march):
+        response = range_report(
+            SimpleNamespace(auth=manager),
+            period=None,
+            anchor=None,
+            start=MARCH.start,
+            end=MARCH.end,
+            export="csv",
+        )
+
+        assert response.streaming
+        assert "report-2025-03-01-2025-03-31.csv" in response["Content-Disposition"]
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == [label for _key, label in COLUMNS]
+        assert len(rows) == 32
+        assert rows[10][:2] == ["2025-03-10", "1403/12/20"]
+
+    def test_streams_xlsx(self, manager, march):
+        response = range_report(
+            SimpleNamespace(auth=manager),
+            period=Period.JALALI_MONTH,
+            anchor=date(2025, 3, 1),
+            start=None,
+            end=None,
+            export="xlsx",
+        )
+
+        workbook = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        assert sheet.count("<row ") == 31
+        assert "1403/12/20" in sheet
+
+    def test_requires_report_permission(self, db):
+        status, body = range_report(
+            SimpleNamespace(auth=AccountFactory()),
+            period=Period.WEEK,
+            anchor=None,
+            start=None,
+            end=None,
+            export="json",
+        )
+
+        assert status == 422
+
+
+@pytest.mark.django_db
+def test_list_reports_query_count(manager, march):
+    variances = {
+        CreateDailyReportService.execute(
+            created_by=manager,
+            report_date=date(2025, 3, day),
+            closing_cash_counted=90,
+            pos_total_report=Decimal("0"),
+            notes=None,
+        ).total_variance
+        for day in (3, 10, 31)
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        response = list_reports(SimpleNamespace(auth=manager))
+
+    assert response.total_count == 3
+    assert len(queries) <= 2
+    assert {Decimal(report.total_variance) for report in response.reports} == (
+        variances
+    )
@@ -0,0 +1,163 @@
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from apps.inventory.services import StockService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from apps.menu.tests.factories import MenuFactory
+from apps.sale.management.commands.benchmark_receipts import sample_receipt
+from apps.sale.models import PrintQueue, Sale, SaleItem
+from apps.sale.services import ModifySaleService
+from apps.sale.services.print_queue import (
+    EscPos,
+    ReceiptData,
+    ReceiptDelta,
+    ReceiptRenderer,
+)
+from apps.user.tests.factories import AccountFactory
+
+GOLDEN = Path(__file__).parent / "golden"
+
+
+def _assert_golden(name, payload):
+    """Regenerate with ``UPDATE_GOLDEN=1 pytest ...`` after layout changes."""
+    path = GOLDEN / name
+    if os.environ.get("UPDATE_GOLDEN"):
+        path.write_bytes(payload)
+    assert payload == path.read_bytes()
+
+
+class TestEscPos:
+    def test_columns_pin_text_to_both_edges(self):
+        out = EscPos(width=20, codepage="cp437")
+        out.columns("name", "1,000")
+
+        assert out.getvalue().endswith(b"1,000           name\n")
+
+    def test_long_right_text_keeps_its_start(self):
+        out = EscPos(width=10, codepage="cp437")
+        out.columns("abcdefghijkl", "99")
+
+        # Visual RTL strings start at the right edge
+        assert out.getvalue().endswith(b"\x0099 fghijkl\n")
+
+    def test_unknown_codepage(self):
+        with pytest.raises(ValueError):
+            EscPos(codepage="utf-8")
+
+
+class TestReceiptRendererGolden:
+    def test_standard_receipt(self):
+        payload = ReceiptRenderer.render(
+            sample_receipt(42), PrintQueue.PrintType.STANDARD
+        )
+
+        _assert_golden("standard_48.bin", payload)
+        assert b"?" not in payload  # every Persian glyph has a PC864 form
+
+    def test_standard_receipt_58mm(self):
+        payload = ReceiptRenderer.render(
+            sample_receipt(42), PrintQueue.PrintType.STANDARD, width=32
+        )
+
+        _assert_golden("standard_32.bin", payload)
+
+    def test_edit_diff_receipt(self):
+        delta = ReceiptDelta.from_dict(
+            {
+                "lines": [
+                    {"name": "کاپوچینو", "old": 0, "new": 2},
+                    {"name": "موکا", "old": 1, "new": 0},
+                    {"name": "چای ماسالا", "old": 1, "new": 3},
+                ],
+                "table": {"old": "۳", "new": "۵"},
+            }
+        )
+        data = ReceiptData(
+            sale_id=7,
+            sale_type=Sale.SaleType.DINE_IN,
+            opened_at=datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc),
+            lines=(),
+            subtotal=0,
+            table_name="۵",
+        )
+
+        payload = ReceiptRenderer.render(
+            data, PrintQueue.PrintType.EDIT_DIFF, delta=delta
+        )
+
+        _assert_golden("edit_diff_48.bin", payload)
+
+
+@pytest.mark.django_db
+class TestRenderJob:
+    @pytest.fixture
+    def job(self):
+        sale = Sale.objects.create(
+            opened_by=AccountFactory(), sale_type=Sale.SaleType.TAKEAWAY
+        )
+        latte = SaleItem.objects.create(
+            sale=sale, product=ProductFactory(name="لاته"), quantity=2, unit_price=90
+        )
+        SaleItem.objects.create(
+            sale=sale,
+            product=ProductFactory(name="شیر بادام"),
+            parent_item=latte,
+            quantity=1,
+            unit_price=20,
+        )
+        return PrintQueue.objects.create(
+            sale=sale, printer_target=PrintQueue.PrinterTarget.BAR, print_data={}
+        )
+
+    def test_loads_sale_lines_with_extras(self, job):
+        data = ReceiptData.from_sale(job.sale)
+
+        [line] = data.lines
+        assert (line.name, line.total) == ("لاته", 180)
+        assert [e.name for e in line.extras] == ["شیر بادام"]
+
+    def test_cached_per_sale_version(self, job, django_assert_num_queries):
+        first = ReceiptRenderer.render_job(job)
+        with django_assert_num_queries(0):
+            assert ReceiptRenderer.render_job(job) == first
+
+        sale = job.sale
+        sale.note = "بدون شکر"
+        sale.save()
+
+        assert ReceiptRenderer.render_job(job) != first
+
+    def test_item_sync_renders_fresh(self, job):
+        ingredient = ProductFactory(is_stock_traceable=True)
+        StockService.add_to_stock(ingredient, Decimal("10"), Decimal("1"))
+        recipe = RecipeFactory()
+        RecipeComponentFactory(recipe=recipe, consume_product=ingredient, quantity=1)
+        menu = MenuFactory(price=100)
+        menu.name.active_recipe = recipe
+        menu.name.save()
+        first = ReceiptRenderer.render_job(job)
+
+        sale = job.sale
+        ModifySaleService.sync_items(
+            sale=sale,
+            items_payload=[
+                SimpleNamespace(
+                    item_id=None,
+                    menu_id=menu.pk,
+                    quantity=1,
+                    extras=[],
+                )
+            ],
+            performer=AccountFactory(is_superuser=True, is_staff=True),
+        )
+        job.sale = Sale.objects.get(pk=sale.pk)
+
+        assert ReceiptRenderer.render_job(job) != first
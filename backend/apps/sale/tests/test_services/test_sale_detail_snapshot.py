@@ -0,0 +1,153 @@
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from api.endpoints.sale_endpoints import get_sale_detail
+from apps.inventory.tests.factories import ProductFactory
+from apps.menu.tests.factories import MenuFactory
+from apps.sale.models import Sale, SaleDetailSnapshot, SaleItem, SalePayment
+from apps.sale.services.payment.payment_service import PaymentInput, PaymentService
+from apps.sale.services.payment.refund_service import RefundService
+from apps.sale.services.sale.sale_detail import SaleDetailService
+from apps.user.tests.factories import AccountFactory
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+
+@pytest.fixture
+def manager(db):
+    return AccountFactory(is_staff=True, is_superuser=True)
+
+
+@pytest.fixture
+def closed_sale(manager):
+    """Paid sale: one menu line with an extra, then closed."""
+    menu = MenuFactory(price=80)
+    sale = Sale.objects.create(
+        opened_by=manager,
+        sale_type=Sale.SaleType.TAKEAWAY,
+        subtotal_amount=Decimal("100"),
+    )
+    parent = SaleItem.objects.create(
+        sale=sale, product=menu.name, quantity=1, unit_price=80
+    )
+    SaleItem.objects.create(
+        sale=sale,
+        parent_item=parent,
+        product=ProductFactory(),
+        quantity=2,
+        unit_price=10,
+    )
+    PaymentService.add_payments(
+        sale=sale,
+        payments=[
+            PaymentInput(
+                method=SalePayment.PaymentMethod.CASH, amount_applied=Decimal("100")
+            )
+        ],
+        performer=manager,
+    )
+    Sale.objects.filter(pk=sale.pk).update(
+        state=Sale.SaleState.CLOSED, closed_by=manager, closed_at=timezone.now()
+    )
+    sale.refresh_from_db()
+    SaleDetailService.write_snapshot(sale)
+    return SimpleNamespace(sale=sale, menu=menu, parent=parent)
+
+
+def _json(detail):
+    return json.loads(json.dumps(detail, cls=DjangoJSONEncoder))
+
+
+@pytest.mark.django_db
+class TestSaleDetailSnapshot:
+    def test_live_payload(self, closed_sale):
+        sale = SaleDetailService._load(closed_sale.sale.pk)
+        detail = SaleDetailService.build(sale)
+
+        [item] = detail["items"]
+        assert item["menu_id"] == closed_sale.menu.pk
+        assert [e["total"] for e in item["extras"]] == [20]
+        assert item["quantity_paid"] == 1
+        assert detail["total_paid"] == Decimal("100")
+        assert detail["payments"][0]["status"] == SalePayment.PaymentStatus.COMPLETED
+
+    def test_closed_sale_served_in_one_query(
+        self, closed_sale, django_assert_num_queries
+    ):
+        live = SaleDetailService.build(SaleDetailService._load(closed_sale.sale.pk))
+
+        with django_assert_num_queries(1):
+            detail = SaleDetailService.get(closed_sale.sale.pk)
+
+        assert detail == _json(live)
+
+    def test_open_sale_is_built_live(self, manager):
+        sale = Sale.objects.create(opened_by=manager, sale_type=Sale.SaleType.TAKEAWAY)
+
+        assert SaleDetailService.get(sale.pk)["state"] == Sale.SaleState.OPEN
+        assert not SaleDetailSnapshot.objects.exists()
+
+    def test_rejected_void_keeps_snapshot(self, closed_sale, manager):
+        payment = closed_sale.sale.payments.get()
+
+        # A closed sale must stay fully paid: the void rolls back, and so
+        # does the invalidation
+        with pytest.raises(ValidationError):
+            PaymentService.void_payment(payment_id=payment.pk, performer=manager)
+
+        assert SaleDetailSnapshot.objects.filter(sale=closed_sale.sale).exists()
+
+    def test_invalidated_snapshot_is_rebuilt(self, closed_sale):
+        SaleDetailService.invalidate(closed_sale.sale.pk)
+
+        detail = SaleDetailService.get(closed_sale.sale.pk)
+
+        assert detail["id"] == closed_sale.sale.pk
+        assert SaleDetailSnapshot.objects.filter(sale=closed_sale.sale).exists()
+
+    def test_refund_invalidates(self, closed_sale, manager):
+        RefundService.create_refund(
+            payment=closed_sale.sale.payments.get(),
+            amount=Decimal("30"),
+            method=SalePayment.PaymentMethod.CASH,
+            performer=manager,
+        )
+
+        assert not SaleDetailSnapshot.objects.exists()
+
+    def test_edit_of_closed_sale_invalidates(self, closed_sale):
+        SaleDetailService.get(closed_sale.sale.pk)
+
+        # e.g. an admin correcting the note after closing
+        closed_sale.sale.note = "window seat"
+        closed_sale.sale.save()
+
+        assert SaleDetailService.get(closed_sale.sale.pk)["note"] == "window seat"
+
+    def test_stale_layout_is_rebuilt(self, closed_sale):
+        SaleDetailSnapshot.objects.update(version=0, payload={})
+
+        assert SaleDetailService.get(closed_sale.sale.pk)["id"] == closed_sale.sale.pk
+
+
+@pytest.mark.django_db
+class TestSaleDetailEndpoint:
+    def test_revenue_hidden_without_permission(self, closed_sale, monkeypatch):
+        viewer = AccountFactory()
+        monkeypatch.setattr(
+            "api.endpoints.sale_endpoints.can_see_sale_details", lambda user: None
+        )
+        Sale.objects.filter(pk=closed_sale.sale.pk).update(total_cost=Decimal("40"))
+        SaleDetailService.invalidate(closed_sale.sale.pk)
+
+        hidden = get_sale_detail(SimpleNamespace(auth=viewer), closed_sale.sale.pk)
+        shown = get_sale_detail(
+            SimpleNamespace(auth=AccountFactory(is_superuser=True)),
+            closed_sale.sale.pk,
+        )
+
+        assert hidden["total_cost"] is None
+        assert Decimal(shown["total_cost"]) == Decimal("40")
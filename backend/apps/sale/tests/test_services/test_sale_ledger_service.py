@@ -0,0 +1,145 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from apps.sale.models import Sale, SalePayment
+from apps.sale.services.payment.ledger_service import SaleLedgerService
+from apps.sale.services.payment.payment_service import PaymentInput, PaymentService
+from apps.sale.services.payment.refund_service import RefundService
+from apps.sale.services.sale.cancel_sale import CancelSaleService
+from apps.user.tests.factories import AccountFactory
+from django.core.management import CommandError, call_command
+
+
+@pytest.fixture
+def cashier(db):
+    return AccountFactory(is_staff=True)
+
+
+@pytest.fixture
+def sale(cashier):
+    return Sale.objects.create(
+        opened_by=cashier,
+        sale_type=Sale.SaleType.TAKEAWAY,
+        subtotal_amount=Decimal("100"),
+    )
+
+
+def _pay(sale, performer, amount, **extra):
+    return PaymentService.add_payments(
+        sale=sale,
+        payments=[
+            PaymentInput(
+                method=SalePayment.PaymentMethod.CASH, amount_applied=amount, **extra
+            )
+        ],
+        performer=performer,
+    )[0]
+
+
+@pytest.mark.django_db
+class TestSaleLedgerService:
+    def test_payment_updates_ledger_columns(self, sale, cashier):
+        _pay(
+            sale,
+            cashier,
+            Decimal("60"),
+            tax_amount=Decimal("6"),
+            discount_amount=Decimal("5"),
+            tip_amount=Decimal("2"),
+        )
+
+        sale.refresh_from_db()
+        assert sale.paid_subtotal == Decimal("60")
+        assert sale.paid_tax == Decimal("6")
+        assert sale.paid_discount == Decimal("5")
+        assert sale.paid_tip == Decimal("2")
+        assert sale.payment_status == Sale.PaymentStatus.PARTIALLY_PAID
+
+    def test_derived_properties_do_not_query(
+        self, sale, cashier, django_assert_num_queries
+    ):
+        _pay(sale, cashier, Decimal("100"), tax_amount=Decimal("10"))
+        sale = Sale.objects.get(pk=sale.pk)
+
+        with django_assert_num_queries(0):
+            assert sale.subtotal_paid == Decimal("100")
+            assert sale.remaining_subtotal == Decimal("0")
+            assert sale.is_fully_paid
+            assert sale.total_amount == Decimal("110")
+            assert sale.balance_due == Decimal("0")
+
+    def test_void_reverts_ledger(self, sale, cashier):
+        payment = _pay(sale, cashier, Decimal("40"), tax_amount=Decimal("4"))
+
+        PaymentService.void_payment(payment_id=payment.pk, performer=cashier)
+
+        sale.refresh_from_db()
+        assert sale.paid_subtotal == Decimal("0")
+        assert sale.paid_tax == Decimal("0")
+        assert sale.payment_status == Sale.PaymentStatus.UNPAID
+
+    def test_void_twice_rejected(self, sale, cashier):
+        from django.core.exceptions import ValidationError
+
+        payment = _pay(sale, cashier, Decimal("40"))
+        PaymentService.void_payment(payment_id=payment.pk, performer=cashier)
+
+        with pytest.raises(ValidationError):
+            PaymentService.void_payment(payment_id=payment.pk, performer=cashier)
+
+    def test_refund_and_void_refund(self, sale, cashier):
+        payment = _pay(sale, cashier, Decimal("50"))
+
+        refund = RefundService.create_refund(
+            payment=payment,
+            amount=Decimal("20"),
+            method=SalePayment.PaymentMethod.CASH,
+            performer=cashier,
+        )
+        sale.refresh_from_db()
+        assert sale.refunded_amount == Decimal("20")
+
+        RefundService.void_refund(refund=refund, performer=cashier)
+        sale.refresh_from_db()
+        assert sale.refunded_amount == Decimal("0")
+
+    def test_stale_cancel_keeps_ledger(self, sale, cashier):
+        stale = Sale.objects.get(pk=sale.pk)
+        _pay(sale, cashier, Decimal("40"))
+
+        CancelSaleService.cancel_open_sale(
+            sale=stale,
+            performer=AccountFactory(is_superuser=True, is_staff=True),
+            cancel_reason="customer left",
+        )
+
+        sale.refresh_from_db()
+        assert sale.state == Sale.SaleState.CANCELED
+        assert sale.paid_subtotal == Decimal("40")
+
+    def test_rebuild_fixes_drift(self, sale, cashier):
+        _pay(sale, cashier, Decimal("30"))
+        Sale.objects.filter(pk=sale.pk).update(paid_subtotal=Decimal("999"))
+        sale.refresh_from_db()
+
+        assert "paid_subtotal" in SaleLedgerService.verify(sale)
+        assert SaleLedgerService.rebuild(sale) is True
+
+        sale.refresh_from_db()
+        assert sale.paid_subtotal == Decimal("30")
+        assert SaleLedgerService.verify(sale) == {}
+
+    def test_command_reports_and_rebuilds(self, sale, cashier):
+        _pay(sale, cashier, Decimal("30"))
+        Sale.objects.filter(pk=sale.pk).update(paid_tax=Decimal("7"))
+
+        with pytest.raises(CommandError):
+            call_command("sale_ledger", stdout=StringIO())
+
+        out = StringIO()
+        call_command("sale_ledger", "--rebuild", stdout=out)
+        assert "Rebuilt 1 drifted" in out.getvalue()
+
+        sale.refresh_from_db()
+        assert sale.paid_tax == Decimal("0")
@@ -0,0 +1,311 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from apps.inventory.tests.factories import ProductFactory
+from apps.sale.models import (
+    BusinessDayRollup,
+    BusinessHourRollup,
+    Sale,
+    SaleItem,
+    SalePayment,
+)
+from apps.sale.services.payment.payment_service import PaymentInput, PaymentService
+from apps.sale.services.payment.refund_service import RefundService
+from apps.sale.services.report.create_daily_report_service import (
+    CreateDailyReportService,
+)
+from apps.sale.services.report.sales_rollup_service import (
+    SalesRollupService,
+    business_date_of,
+    business_day_range,
+)
+from apps.sale.services.sale.cancel_sale import CancelSaleService
+from apps.sale.services.sale.close_sale import CloseSaleService
+from apps.user.tests.factories import AccountFactory, BankAccountFactory
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+
+@pytest.fixture
+def manager(db):
+    return AccountFactory(is_staff=True, is_superuser=True)
+
+
+@pytest.fixture
+def account(db):
+    return BankAccountFactory()
+
+
+@pytest.fixture
+def today():
+    return business_date_of(timezone.now())
+
+
+@pytest.fixture(autouse=True)
+def no_stock_consumption(monkeypatch):
+    monkeypatch.setattr(CloseSaleService, "_calculate_cogs", lambda sale: Decimal(0))
+
+
+def _sale(manager, subtotal=100):
+    sale = Sale.objects.create(
+        opened_by=manager,
+        sale_type=Sale.SaleType.TAKEAWAY,
+        subtotal_amount=Decimal(subtotal),
+    )
+    SaleItem.objects.create(
+        sale=sale,
+        product=ProductFactory(),
+        quantity=2,
+        unit_price=subtotal // 2,
+        material_cost=15,
+    )
+    return sale
+
+
+def _source_amounts(business_date) -> dict:
+    expected = CreateDailyReportService._calculate_expected_amounts(
+        *business_day_range(business_date)
+    )
+    del expected["expenses"]
+    return expected
+
+
+@pytest.mark.django_db
+class TestIncrementalMaintenance:
+    def test_movements_match_source_rows(self, manager, account, today):
+        day = SalesRollupService.get_day(today)
+        assert day.sales_count == 0
+
+        sale = _sale(manager)
+        cash, card = PaymentService.add_payments(
+            sale=sale,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CASH,
+                    amount_applied=Decimal("60"),
+                    tip_amount=Decimal("5"),
+                ),
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CARD_TRANSFER,
+                    amount_applied=Decimal("40"),
+                    destination_account_id=account.pk,
+                ),
+            ],
+            performer=manager,
+        )
+        PaymentService.set_confirmed(card, True)
+        CloseSaleService.close(sale=sale, performer=manager)
+        RefundService.create_refund(
+            payment=cash,
+            amount=Decimal("10"),
+            method=SalePayment.PaymentMethod.POS,
+            performer=manager,
+        )
+
+        other = _sale(manager, subtotal=50)
+        [voided] = PaymentService.add_payments(
+            sale=other,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.POS,
+                    amount_applied=Decimal("50"),
+                    destination_account_id=account.pk,
+                )
+            ],
+            performer=manager,
+        )
+        PaymentService.void_payment(payment_id=voided.pk, performer=manager)
+
+        day = BusinessDayRollup.objects.get(business_date=today)
+        assert day.sales_count == 1
+        assert day.total_sales == Decimal("100")
+        assert day.cogs == Decimal("30")
+        assert day.tips == Decimal("5")
+        assert day.card_transfer_confirmed == Decimal("40")
+        assert day.net_by_method() == {
+            SalePayment.PaymentMethod.CASH: Decimal("60"),
+            SalePayment.PaymentMethod.POS: Decimal("-10"),
+            SalePayment.PaymentMethod.CARD_TRANSFER: Decimal("40"),
+        }
+        assert day.expected_amounts() == _source_amounts(today)
+        assert SalesRollupService.verify_day(today) == {}
+
+    def test_canceling_a_closed_sale_takes_it_back(self, manager, today):
+        sale = _sale(manager)
+        PaymentService.add_payments(
+            sale=sale,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CASH,
+                    amount_applied=Decimal("100"),
+                )
+            ],
+            performer=manager,
+        )
+        CloseSaleService.close(sale=sale, performer=manager)
+        assert SalesRollupService.get_day(today).sales_count == 1
+
+        CancelSaleService.cancel_close_sale(
+            sale=sale, performer=manager, cancel_reason="wrong table"
+        )
+
+        day = BusinessDayRollup.objects.get(business_date=today)
+        assert (day.sales_count, day.gross_sales, day.cogs) == (0, 0, 0)
+        assert SalesRollupService.verify_day(today) == {}
+
+    def test_unconfirm_takes_transfer_back(self, manager, account, today):
+        sale = _sale(manager)
+        [card] = PaymentService.add_payments(
+            sale=sale,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CARD_TRANSFER,
+                    amount_applied=Decimal("100"),
+                    destination_account_id=account.pk,
+                )
+            ],
+            performer=manager,
+        )
+
+        PaymentService.set_confirmed(card, True)
+        PaymentService.set_confirmed(card, False)
+
+        assert SalesRollupService.get_day(today).card_transfer_confirmed == 0
+        assert SalesRollupService.verify_day(today) == {}
+
+    def test_repeated_confirm_counts_once(self, manager, account, today):
+        sale = _sale(manager)
+        [card] = PaymentService.add_payments(
+            sale=sale,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CARD_TRANSFER,
+                    amount_applied=Decimal("100"),
+                    destination_account_id=account.pk,
+                )
+            ],
+            performer=manager,
+        )
+        # Two requests that both read the transfer as unconfirmed
+        stale = SalePayment.objects.get(pk=card.pk)
+
+        PaymentService.set_confirmed(card, True)
+        PaymentService.set_confirmed(stale, True)
+        PaymentService.set_confirmed(card, True)
+
+        assert SalesRollupService.get_day(today).card_transfer_confirmed == 100
+        assert SalesRollupService.verify_day(today) == {}
+
+    def test_hours_add_up_to_the_day(self, manager, today):
+        sale = _sale(manager)
+        PaymentService.add_payments(
+            sale=sale,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CASH,
+                    amount_applied=Decimal("100"),
+                )
+            ],
+            performer=manager,
+        )
+
+        [hour] = SalesRollupService.get_hours(today)
+
+        assert hour.cash_payments == SalesRollupService.get_day(today).cash_payments
+        assert hour.hour_start == timezone.localtime().replace(
+            minute=0, second=0, microsecond=0
+        )
+
+
+@pytest.mark.django_db
+class TestRebuild:
+    def test_missing_day_is_built_from_source_rows(self, manager, today):
+        sale = _sale(manager)
+        SalePayment.objects.create(
+            sale=sale,
+            method=SalePayment.PaymentMethod.CASH,
+            amount_applied=Decimal("70"),
+            received_by=manager,
+        )
+
+        day = SalesRollupService.get_day(today)
+
+        assert day.cash_payments == Decimal("70")
+        assert day.expected_amounts() == _source_amounts(today)
+        assert BusinessHourRollup.objects.filter(business_date=today).count() == 1
+
+    def test_rebuild_fixes_drift(self, manager, today):
+        sale = _sale(manager)
+        PaymentService.add_payments(
+            sale=sale,
+            payments=[
+                PaymentInput(
+                    method=SalePayment.PaymentMethod.CASH,
+                    amount_applied=Decimal("100"),
+                )
+            ],
+            performer=manager,
+        )
+        BusinessDayRollup.objects.update(cash_payments=Decimal("1"))
+        BusinessHourRollup.objects.all().delete()
+
+        drift = SalesRollupService.verify_day(today)
+        assert drift["cash_payments"] == (Decimal("1"), Decimal("100"))
+        assert any(key.endswith(" cash_payments") for key in drift)
+
+        SalesRollupService.rebuild_day(today)
+
+        assert SalesRollupService.verify_day(today) == {}
+
+    def test_report_reads_the_rollup(self, manager, today):
+        BusinessDayRollup.objects.create(
+            business_date=today, cash_payments=Decimal("500")
+        )
+
+        report = CreateDailyReportService.execute(
+            created_by=manager,
+            report_date=today,
+            closing_cash_counted=500,
+            pos_total_report=Decimal("0"),
+            notes=None,
+        )
+
+        cash = report.payment_methods.get(payment_method=SalePayment.PaymentMethod.CASH)
+        assert cash.expected_amount == Decimal("500")
+
+
+def test_business_date_cutoff():
+    tz = timezone.get_current_timezone()
+
+    assert business_date_of(datetime(2025, 3, 11, 1, 59, tzinfo=tz)).day == 10
+    assert business_date_of(datetime(2025, 3, 11, 2, 0, tzinfo=tz)).day == 11
+
+
+@pytest.mark.django_db
+class TestSalesRollupCommand:
+    def test_backfills_missing_days(self, manager, today):
+        sale = _sale(manager)
+        SalePayment.objects.create(
+            sale=sale,
+            method=SalePayment.PaymentMethod.POS,
+            amount_applied=Decimal("25"),
+            received_by=manager,
+        )
+
+        with pytest.raises(CommandError):
+            call_command("sales_rollup", stdout=StringIO())
+        call_command("sales_rollup", "--rebuild", stdout=StringIO())
+
+        assert BusinessDayRollup.objects.get(business_date=today).pos_payments == 25
+        call_command("sales_rollup", stdout=StringIO())
+
+    def test_rebuild_builds_quiet_days(self, db, today):
+        start = today - timedelta(days=2)
+
+        call_command(
+            "sales_rollup", "--rebuild", "--from", str(start), stdout=StringIO()
+        )
+
+        assert BusinessDayRollup.objects.filter(business_date__gte=start).count() == 3
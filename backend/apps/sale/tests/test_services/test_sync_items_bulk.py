@@ -0,0 +1,133 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from apps.inventory.services import StockService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+)
+from apps.menu.models import MenuCategory
+from apps.menu.tests.factories import MenuCategoryFactory, MenuFactory
+from apps.sale.models import Sale, SaleItem
+from apps.sale.services import ModifySaleService
+from apps.user.tests.factories import AccountFactory
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def cart(db):
+    """Shared ingredient in stock, ten menus, a sale holding one line each."""
+    ingredient = ProductFactory(is_stock_traceable=True)
+    StockService.add_to_stock(ingredient, Decimal("1"), Decimal("1000"))
+    recipe = RecipeFactory()
+    RecipeComponentFactory(recipe=recipe, consume_product=ingredient, quantity=1)
+    category = MenuCategoryFactory(parent_group=MenuCategory.Group.BAR_ITEM)
+
+    menus = []
+    for _ in range(10):
+        menu = MenuFactory(category=category, price=100)
+        menu.name.active_recipe = recipe
+        menu.name.save()
+        menus.append(menu)
+
+    syrup = ProductFactory(is_stock_traceable=True)
+    StockService.add_to_stock(syrup, Decimal("10"), Decimal("100"))
+
+    user = AccountFactory(is_superuser=True, is_staff=True)
+    sale = Sale.objects.create(opened_by=user, sale_type=Sale.SaleType.TAKEAWAY)
+    lines = [
+        SaleItem.objects.create(
+            sale=sale, product=menu.name, quantity=1, unit_price=100
+        )
+        for menu in menus
+    ]
+    return SimpleNamespace(user=user, sale=sale, menus=menus, lines=lines, syrup=syrup)
+
+
+def _line(item=None, *, menu, quantity=1, extras=()):
+    return SimpleNamespace(
+        item_id=item.pk if item else None,
+        menu_id=menu.pk,
+        quantity=quantity,
+        extras=list(extras),
+    )
+
+
+def _sync(cart, payload):
+    return ModifySaleService.sync_items(
+        sale=cart.sale, items_payload=payload, performer=cart.user
+    )
+
+
+def _big_payload(cart, added=12):
+    """Keep 8 lines (5 bumped), drop 2, add ``added`` new ones (half with an extra)."""
+    extra = SimpleNamespace(product_id=cart.syrup.pk, quantity=1)
+    payload = [
+        _line(line, menu=menu, quantity=2 if i < 5 else 1)
+        for i, (line, menu) in enumerate(zip(cart.lines[:8], cart.menus))
+    ]
+    payload += [
+        _line(menu=cart.menus[i % 10], extras=[extra] if i % 2 else [])
+        for i in range(added)
+    ]
+    return payload
+
+
+@pytest.mark.django_db
+class TestSyncItemsBulk:
+    def test_applies_the_change_set(self, cart):
+        sale = _sync(cart, _big_payload(cart))
+
+        parents = SaleItem.objects.filter(sale=sale, parent_item__isnull=True)
+        extras = SaleItem.objects.filter(sale=sale, parent_item__isnull=False)
+        assert parents.count() == 20
+        assert extras.count() == 6
+        assert all(e.parent_item.sale_id == sale.pk for e in extras)
+        assert not SaleItem.objects.filter(pk__in=[line.pk for line in cart.lines[8:]])
+        assert SaleItem.objects.get(pk=cart.lines[0].pk).quantity == 2
+
+        # extras: head cost 10, default margin applied by the pricing service
+        extra_total = sum(e.quantity * e.unit_price for e in extras)
+        assert sale.subtotal_amount == Decimal(13 * 100 + 12 * 100 + extra_total)
+        sale.refresh_from_db()
+        assert sale.subtotal_amount == Decimal(2500 + extra_total)
+
+    @pytest.mark.parametrize("added", [10, 30])
+    def test_sync_is_constant_queries(self, cart, added):
+        payload = _big_payload(cart, added)
+
+        with CaptureQueriesContext(connection) as ctx:
+            _sync(cart, payload)
+
+        item_sql = [q for q in ctx.captured_queries if '"sale_saleitem"' in q["sql"]]
+        # read lines, DELETE (+ its two cascade reads), UPDATE, two INSERTs
+        assert len(item_sql) == 7
+        inventory_sql = [
+            q
+            for q in ctx.captured_queries
+            if '"inventory_inventoryposition"' in q["sql"]
+        ]
+        # one position read serves both the stock check and pricing, plus
+        # the INSERT of the positions built from Stock (cold)
+        assert len(inventory_sql) == 2
+        # one recipe read serves the BOM, the leaf products and pricing
+        recipe_sql = [
+            q for q in ctx.captured_queries if '"inventory_recipecomponent"' in q["sql"]
+        ]
+        assert len(recipe_sql) == 1
+        # plus lock, menus, extras, Stock (cold), Sale UPDATE, history, edit
+        # ticket and the savepoint pair; no FK re-checks on the partial save
+        assert len(ctx) == 19
+        assert not [q for q in ctx.captured_queries if '"user_account"' in q["sql"]]
+
+    def test_below_paid_writes_nothing(self, cart):
+        Sale.objects.filter(pk=cart.sale.pk).update(paid_subtotal=Decimal("900"))
+
+        with pytest.raises(ValidationError):
+            _sync(cart, [_line(cart.lines[0], menu=cart.menus[0])])
+
+        assert SaleItem.objects.filter(sale=cart.sale).count() == 10
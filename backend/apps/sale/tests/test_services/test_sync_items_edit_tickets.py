@@ -0,0 +1,188 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from apps.inventory.services import StockService
+from apps.inventory.tests.factories import (
+    ProductFactory,
+    RecipeComponentFactory,
+    RecipeFactory,
+    TableFactory,
+)
+from apps.menu.models import MenuCategory
+from apps.menu.tests.factories import MenuCategoryFactory, MenuFactory
+from apps.sale.models import PrintQueue, Sale, SaleItem
+from apps.sale.services import ModifySaleService
+from apps.user.tests.factories import AccountFactory
+
+BAR = PrintQueue.PrinterTarget.BAR
+KITCHEN = PrintQueue.PrinterTarget.KITCHEN
+
+
+def _menu(group):
+    """Menu item whose recipe is fully in stock."""
+    ingredient = ProductFactory(is_stock_traceable=True)
+    StockService.add_to_stock(ingredient, Decimal("100"), Decimal("1"))
+    recipe = RecipeFactory()
+    RecipeComponentFactory(recipe=recipe, consume_product=ingredient, quantity=1)
+    menu = MenuFactory(category=MenuCategoryFactory(parent_group=group), price=100)
+    menu.name.active_recipe = recipe
+    menu.name.save()
+    return menu
+
+
+def _line(item=None, *, menu, quantity=1, extras=()):
+    return SimpleNamespace(
+        item_id=item.pk if item else None,
+        menu_id=menu.pk,
+        quantity=quantity,
+        extras=list(extras),
+    )
+
+
+@pytest.fixture
+def setup(db):
+    user = AccountFactory(is_superuser=True, is_staff=True)
+    espresso = _menu(MenuCategory.Group.BAR_ITEM)
+    burger = _menu(MenuCategory.Group.FOOD)
+    sale = Sale.objects.create(opened_by=user, sale_type=Sale.SaleType.TAKEAWAY)
+    items = {
+        "espresso": SaleItem.objects.create(
+            sale=sale, product=espresso.name, quantity=2, unit_price=100
+        ),
+        "burger": SaleItem.objects.create(
+            sale=sale, product=burger.name, quantity=1, unit_price=100
+        ),
+    }
+    return SimpleNamespace(
+        user=user, sale=sale, items=items, espresso=espresso, burger=burger
+    )
+
+
+def _deltas():
+    return {
+        job.printer_target: job.print_data["delta"]
+        for job in PrintQueue.objects.filter(print_type=PrintQueue.PrintType.EDIT_DIFF)
+    }
+
+
+def _sync(setup, lines, **kwargs):
+    return ModifySaleService.sync_items(
+        sale=setup.sale, items_payload=lines, performer=setup.user, **kwargs
+    )
+
+
+@pytest.mark.django_db
+class TestSyncItemsEditTickets:
+    def test_changed_and_removed_lines_per_printer(self, setup):
+        _sync(setup, [_line(setup.items["espresso"], menu=setup.espresso, quantity=3)])
+
+        deltas = _deltas()
+        assert deltas[BAR]["lines"] == [
+            {
+                "product_id": setup.espresso.name_id,
+                "name": setup.espresso.name.name,
+                "old": 2,
+                "new": 3,
+            }
+        ]
+        assert [(line["old"], line["new"]) for line in deltas[KITCHEN]["lines"]] == [
+            (1, 0)
+        ]
+        assert deltas[BAR]["table"] is None
+
+    def test_untouched_printer_gets_no_ticket(self, setup):
+        _sync(
+            setup,
+            [
+                _line(setup.items["espresso"], menu=setup.espresso, quantity=1),
+                _line(setup.items["burger"], menu=setup.burger, quantity=1),
+            ],
+        )
+
+        assert set(_deltas()) == {BAR}
+
+    def test_no_change_no_ticket(self, setup):
+        _sync(
+            setup,
+            [
+                _line(setup.items["espresso"], menu=setup.espresso, quantity=2),
+                _line(setup.items["burger"], menu=setup.burger, quantity=1),
+            ],
+        )
+
+        assert not PrintQueue.objects.exists()
+
+    def test_new_line_with_extra(self, setup):
+        syrup = ProductFactory()
+        StockService.add_to_stock(syrup, Decimal("10"), Decimal("1"))
+        extra = SimpleNamespace(product_id=syrup.pk, quantity=1)
+
+        _sync(
+            setup,
+            [
+                _line(setup.items["espresso"], menu=setup.espresso, quantity=2),
+                _line(setup.items["burger"], menu=setup.burger, quantity=1),
+                _line(menu=setup.espresso, quantity=1, extras=[extra]),
+            ],
+        )
+
+        lines = _deltas()[BAR]["lines"]
+        assert [(line["product_id"], line["old"], line["new"]) for line in lines] == [
+            (setup.espresso.name_id, 2, 3),
+            (syrup.pk, 0, 1),
+        ]
+
+    def test_removed_line_takes_its_extras(self, setup):
+        syrup = ProductFactory()
+        SaleItem.objects.create(
+            sale=setup.sale,
+            product=syrup,
+            parent_item=setup.items["espresso"],
+            quantity=1,
+            unit_price=10,
+        )
+
+        _sync(setup, [_line(setup.items["burger"], menu=setup.burger, quantity=1)])
+
+        lines = _deltas()[BAR]["lines"]
+        assert [(line["product_id"], line["old"], line["new"]) for line in lines] == [
+            (setup.espresso.name_id, 2, 0),
+            (syrup.pk, 1, 0),
+        ]
+
+    def test_kept_line_keeps_its_extras(self, setup):
+        syrup = ProductFactory()
+        SaleItem.objects.create(
+            sale=setup.sale,
+            product=syrup,
+            parent_item=setup.items["espresso"],
+            quantity=1,
+            unit_price=10,
+        )
+
+        _sync(setup, [_line(setup.items["espresso"], menu=setup.espresso, quantity=2)])
+
+        assert set(_deltas()) == {KITCHEN}
+
+    def test_table_move_reaches_every_printer(self, setup):
+        table = TableFactory()
+        setup.sale.table = table
+        setup.sale.sale_type = Sale.SaleType.DINE_IN
+        setup.sale.save()
+
+        _sync(
+            setup,
+            [
+                _line(setup.items["espresso"], menu=setup.espresso, quantity=2),
+                _line(setup.items["burger"], menu=setup.burger, quantity=1),
+            ],
+            previous_table=None,
+        )
+
+        deltas = _deltas()
+        assert set(deltas) == {BAR, KITCHEN}
+        assert deltas[KITCHEN] == {
+            "lines": [],
+            "table": {"old": None, "new": table.name},
+        }
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from ..models import Account
+from .permission_registry import PermissionRegistry
+
+PRINCIPAL_VERSION_KEY = "user:principal:version"
+PRINCIPAL_TIMEOUT = 60 * 5
+
+# Everything but the password hash, which never leaves the database;
+# ``password`` comes back as a deferred field if something needs it.
+PRINCIPAL_FIELDS = tuple(
+    f.attname for f in Account._meta.concrete_fields if f.attname != "password"
+)
+
+
+class PrincipalService:
+    """
+    Short-lived cache of the authenticated principal.
+
+    An entry holds the account row (flags included) and its resolved
+    permission set, so a request authenticated by ``JWTAuth`` and checked
+    with ``user.has_perm`` costs no query while the entry is warm.
+
+    Keys carry a *permission version* stamp. Account changes drop that
+    user's entry; group or permission changes bump the stamp and so retire
+    every entry at once (see ``user.signals``).
+
+    Off unless the cache is shared between workers
+    (``PRINCIPAL_CACHE_ENABLED``): every call then reads the database.
+    """
+
+    # --------------------------------------------------------------------- #
+    # Public API
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def get(user_id, *, fresh: bool = False) -> Optional[Account]:
+        """
+        Return the account for ``user_id`` (``None`` if it doesn't exist)
+        with its permission cache pre-filled, plus:
+
+            - ``permission_bits``: token bits (see ``PermissionRegistry``)
+            - ``permission_version``: fingerprint of the above and the flags
+
+        ``fresh`` skips the cached entry (and replaces it), e.g. when issuing
+        tokens. The instance is rebuilt per call: it is safe to mutate, but
+        saving it writes the cached values back.
+        """
+        if user_id is None:
+            return None
+
+        if not settings.PRINCIPAL_CACHE_ENABLED:
+            entry = PrincipalService._load(user_id)
+            if entry is None:
+                return None
+            return PrincipalService._build(entry)
+
+        key = PrincipalService._key(user_id)
+        entry = None if fresh else cache.get(key)
+        if entry is None:
+            entry = PrincipalService._load(user_id)
+            if entry is None:
+                return None
+            cache.set(key, entry, PRINCIPAL_TIMEOUT)
+        return PrincipalService._build(entry)
+
+    @staticmethod
+    def invalidate_user(user_id) -> None:
+        """Drop one user's entry (now and again on commit)."""
+
+        def drop():
+            cache.delete(PrincipalService._key(user_id))
+
+        drop()
+        transaction.on_commit(drop)
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Retire every entry by moving to a new permission version.
+
+        Bumped immediately and again on commit: a request that reloads
+        between the two would otherwise cache pre-commit permissions under
+        the new stamp.
+        """
+        PrincipalService._bump()
+        transaction.on_commit(PrincipalService._bump)
+
+    # --------------------------------------------------------------------- #
+    # Private helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _key(user_id) -> str:
+        version = cache.get_or_set(
+            PRINCIPAL_VERSION_KEY, PrincipalService._new_version, None
+        )
+        return f"user:principal:{version}:{user_id}"
+
+    @staticmethod
+    def _new_version() -> str:
+        # Never reuse a stamp: an evicted counter restarting at 1 could
+        # revive entries cached under the old 1
+        return uuid4().hex
+
+    @staticmethod
+    def _bump() -> None:
+        cache.set(PRINCIPAL_VERSION_KEY, PrincipalService._new_version(), None)
+
+    @staticmethod
+    def _build(entry) -> Account:
+        values, perms, bits, version = entry
+        user = Account.from_db(DEFAULT_DB_ALIAS, PRINCIPAL_FIELDS, values)
+        if perms is not None:
+            # Same caches ``ModelBackend`` fills on first ``has_perm``
+            user._perm_cache = set(perms)
+        user.permission_bits = bits
+        user.permission_version = version
+        return user
+
+    @staticmethod
+    def _load(user_id):
+        user = Account.objects.only(*PRINCIPAL_FIELDS).filter(pk=user_id).first()
+        if user is None:
+            return None
+
+        values = tuple(getattr(user, name) for name in PRINCIPAL_FIELDS)
+        # Active superusers pass ``has_perm`` before any backend is asked
+        perms = None
+        if user.is_active and not user.is_superuser:
+            perms = frozenset(user.get_all_permissions())
+
+        bits = PermissionRegistry.encode(perms or ())
+        version = PermissionRegistry.version(
+            is_active=user.is_active, is_superuser=user.is_superuser, bits=bits
+        )
+        return values, perms, bits, version
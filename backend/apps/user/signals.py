@@ -0,0 +1,41 @@
+"""
+Invalidation for the cached authentication principal.
+
+Account edits only concern that account; group and permission edits may
+concern anyone, so they retire the whole cache.
+"""
+
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Account
+from .services.principal_service import PrincipalService
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_account_principal(sender, instance, **kwargs):
+    PrincipalService.invalidate_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=Account.groups.through)
+@receiver(m2m_changed, sender=Account.user_permissions.through)
+def invalidate_account_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        PrincipalService.invalidate_user(instance.pk)
+    else:
+        # Edited from the group/permission side: members unknown on clear
+        PrincipalService.invalidate()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_all_principals(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        PrincipalService.invalidate()
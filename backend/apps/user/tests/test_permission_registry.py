@@ -0,0 +1,101 @@
+import jwt
+import pytest
+from api.security.auth import TokenService, jwt_auth
+from apps.sale.policies import can_view_daily_report
+from apps.user.services.permission_registry import (
+    TOKEN_PERMISSIONS,
+    PermissionRegistry,
+    TokenPermissions,
+    has_perm,
+)
+from apps.user.tests.factories import AccountFactory
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.exceptions import PermissionDenied
+
+VIEW_REPORT = "sale.view_dailyreport"
+
+
+@pytest.fixture
+def cashier(db):
+    user = AccountFactory()
+    user.user_permissions.add(
+        Permission.objects.get(
+            content_type__app_label="sale", codename="view_dailyreport"
+        )
+    )
+    return user
+
+
+def _claims(token):
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+
+
+class TestPermissionRegistry:
+    def test_round_trip_ignores_unregistered(self):
+        bits = PermissionRegistry.encode([VIEW_REPORT, "sale.unknown"])
+
+        assert PermissionRegistry.decode(bits) == {VIEW_REPORT}
+        assert bits == 1 << TOKEN_PERMISSIONS.index(VIEW_REPORT)
+
+    def test_grants(self):
+        snapshot = TokenPermissions(bits=PermissionRegistry.encode([VIEW_REPORT]))
+
+        assert snapshot.grants(VIEW_REPORT) is True
+        assert snapshot.grants("sale.close_sale") is False
+        assert snapshot.grants("sale.unknown") is None
+        assert TokenPermissions(bits=0, superuser=True).grants("sale.unknown")
+
+
+@pytest.mark.django_db
+class TestTokenPermissions:
+    def test_token_carries_snapshot(self, cashier):
+        claims = _claims(TokenService.generate_access_token(cashier))
+
+        assert PermissionRegistry.decode(int(claims["perms"], 16)) == {VIEW_REPORT}
+        assert claims["su"] is False
+        assert claims["pv"]
+
+    def test_policies_use_claims(self, cashier, django_assert_num_queries):
+        user = jwt_auth.authenticate(None, TokenService.generate_access_token(cashier))
+        user._perm_cache = set()  # prove the token, not Django, answers
+
+        with django_assert_num_queries(0):
+            can_view_daily_report(user)
+
+        user.token_permissions = TokenPermissions(bits=0)
+        with pytest.raises(PermissionDenied):
+            can_view_daily_report(user)
+
+    def test_role_change_forces_refresh(self, cashier):
+        token = TokenService.generate_access_token(cashier)
+        cashier.user_permissions.clear()
+
+        assert jwt_auth.authenticate(None, token) is None
+
+        user = jwt_auth.authenticate(None, TokenService.generate_access_token(cashier))
+        assert not has_perm(user, VIEW_REPORT)
+
+    def test_unrelated_account_edit_keeps_token(self, cashier):
+        token = TokenService.generate_access_token(cashier)
+        cashier.name = "renamed"
+        cashier.save()
+
+        assert jwt_auth.authenticate(None, token).name == "renamed"
+
+    def test_unregistered_permission_falls_back(self, cashier):
+        cashier.user_permissions.add(
+            Permission.objects.get(content_type__app_label="sale", codename="view_sale")
+        )
+        user = jwt_auth.authenticate(None, TokenService.generate_access_token(cashier))
+
+        assert has_perm(user, "sale.view_sale")
+        assert not has_perm(user, "sale.delete_sale")
+
+    def test_token_without_snapshot(self, cashier):
+        token = TokenService.generate_access_token(cashier, with_permissions=False)
+        user = jwt_auth.authenticate(None, token)
+
+        assert "pv" not in _claims(token)
+        assert getattr(user, "token_permissions", None) is None
+        assert has_perm(user, VIEW_REPORT)
@@ -0,0 +1,102 @@
+import pytest
+from api.security.auth import TokenService, jwt_auth
+from apps.user.models import Account
+from apps.user.services.principal_service import PrincipalService
+from apps.user.tests.factories import AccountFactory
+from django.contrib.auth.models import Group, Permission
+
+PERM = "sale.add_sale"
+
+
+@pytest.fixture
+def waiter(db):
+    return AccountFactory()
+
+
+@pytest.fixture
+def add_sale_perm(db):
+    return Permission.objects.get(content_type__app_label="sale", codename="add_sale")
+
+
+def _auth(user):
+    return jwt_auth.authenticate(None, TokenService.generate_access_token(user))
+
+
+@pytest.mark.django_db
+class TestPrincipalService:
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings):
+        # The test process is the only worker, so its cache is "shared"
+        settings.PRINCIPAL_CACHE_ENABLED = True
+
+    def test_warm_request_hits_no_database(
+        self, waiter, add_sale_perm, django_assert_num_queries
+    ):
+        waiter.user_permissions.add(add_sale_perm)
+        token = TokenService.generate_access_token(waiter)
+        _auth(waiter)
+
+        with django_assert_num_queries(0):
+            user = jwt_auth.authenticate(None, token)
+            assert user.pk == waiter.pk
+            assert user.name == waiter.name
+            assert user.has_perm(PERM)
+            assert not user.has_perm("sale.delete_sale")
+
+    def test_superuser_warm_request(self, db, django_assert_num_queries):
+        admin = AccountFactory(is_superuser=True, is_staff=True)
+        token = TokenService.generate_access_token(admin)
+
+        with django_assert_num_queries(0):
+            assert jwt_auth.authenticate(None, token).has_perm(PERM)
+
+    def test_password_hash_is_not_cached(self, waiter):
+        user = PrincipalService.get(waiter.pk)
+
+        assert user.get_deferred_fields() == {"password"}
+        assert user.check_password("wrong") is False
+
+    def test_group_permission_change_applies(self, waiter, add_sale_perm):
+        group = Group.objects.create(name="waiters")
+        waiter.groups.add(group)
+        assert not _auth(waiter).has_perm(PERM)
+
+        group.permissions.add(add_sale_perm)
+
+        assert _auth(waiter).has_perm(PERM)
+
+    def test_membership_removed_from_group_side(self, waiter, add_sale_perm):
+        group = Group.objects.create(name="waiters")
+        group.permissions.add(add_sale_perm)
+        waiter.groups.add(group)
+        assert _auth(waiter).has_perm(PERM)
+
+        group.user_set.clear()
+
+        assert not _auth(waiter).has_perm(PERM)
+
+    def test_deactivated_user_is_rejected(self, waiter):
+        assert _auth(waiter) is not None
+
+        waiter.is_active = False
+        waiter.save()
+
+        assert _auth(waiter) is None
+
+    def test_unknown_user(self, db):
+        assert PrincipalService.get(999999) is None
+
+
+@pytest.mark.django_db
+class TestPerProcessCache:
+    @pytest.fixture(autouse=True)
+    def local_cache(self, settings):
+        settings.PRINCIPAL_CACHE_ENABLED = False
+
+    def test_deactivated_elsewhere_is_rejected(self, waiter):
+        assert _auth(waiter) is not None
+
+        # Another worker's change: no invalidation reaches this process
+        Account.objects.filter(pk=waiter.pk).update(is_active=False)
+
+        assert _auth(waiter) is None
@@ -4,21 +4,27 @@ from django.contrib.admin import SimpleListFilter
 from django.utils.translation import gettext_lazy as _
 from persiantools.jdatetime import JalaliDate
 
+from .jalali_period import jalali_month_bounds, to_jalali
+
 
 class JalaliDateFieldListFilter(SimpleListFilter):
     """
     A Jalali version of Django's DateFieldListFilter.
     Provides common options like today, yesterday, this week, last week, this month, last month, last 30 days.
     Works with DateField (stored in DB as Gregorian).
+
+    Filters ``issue_date`` by default; use ``for_field`` for other columns.
     """
 
     title = _("Jalali date")
     parameter_name = "jalali_date"
+    date_field = "issue_date"
 
-    def lookups(self, request, model_admin):
-        # today = JalaliDate.today()
-        # year, month, day = today.year, today.month, today.day
+    @classmethod
+    def for_field(cls, field_name: str):
+        return type(f"{cls.__name__}_{field_name}", (cls,), {"date_field": field_name})
 
+    def lookups(self, request, model_admin):
         lookups = [
             ("today", _("Today")),
             ("yesterday", _("Yesterday")),
@@ -36,41 +42,35 @@ class JalaliDateFieldListFilter(SimpleListFilter):
             return queryset
 
         today = JalaliDate.today()
+        gregorian_today = today.to_gregorian()
+        year, month, _day = to_jalali(gregorian_today)
         if value == "today":
-            start = today.to_gregorian()
+            start = gregorian_today
             end = start + timedelta(days=1)
         elif value == "yesterday":
-            start = (today - timedelta(days=1)).to_gregorian()
+            start = gregorian_today - timedelta(days=1)
             end = start + timedelta(days=1)
         elif value == "this_week":
-            weekday = today.weekday()  # 0=Monday
-            start = (today - timedelta(days=weekday)).to_gregorian()
+            weekday = today.weekday()  # 0=Saturday
+            start = gregorian_today - timedelta(days=weekday)
             end = start + timedelta(days=7)
         elif value == "last_week":
             weekday = today.weekday()
-            start = (today - timedelta(days=weekday + 7)).to_gregorian()
+            start = gregorian_today - timedelta(days=weekday + 7)
             end = start + timedelta(days=7)
         elif value == "this_month":
-            start = JalaliDate(today.year, today.month, 1).to_gregorian()
-            if today.month == 12:
-                end = JalaliDate(today.year + 1, 1, 1).to_gregorian()
-            else:
-                end = JalaliDate(today.year, today.month + 1, 1).to_gregorian()
+            start, end = jalali_month_bounds(year, month)
         elif value == "last_month":
-            month = today.month - 1
-            year = today.year
-            if month <= 0:
-                month = 12
-                year -= 1
-            start = JalaliDate(year, month, 1).to_gregorian()
-            if month == 12:
-                end = JalaliDate(year + 1, 1, 1).to_gregorian()
+            if month == 1:
+                start, end = jalali_month_bounds(year - 1, 12)
             else:
-                end = JalaliDate(year, month + 1, 1).to_gregorian()
+                start, end = jalali_month_bounds(year, month - 1)
         elif value == "last_year":
-            start = (today - timedelta(days=365)).to_gregorian()
-            end = today.to_gregorian() + timedelta(days=1)
+            start = gregorian_today - timedelta(days=365)
+            end = gregorian_today + timedelta(days=1)
         else:
             return queryset
 
-        return queryset.filter(issue_date__gte=start, issue_date__lt=end)
+        return queryset.filter(
+            **{f"{self.date_field}__gte": start, f"{self.date_field}__lt": end}
+        )
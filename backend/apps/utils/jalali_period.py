@@ -0,0 +1,168 @@
+"""
+Jalali calendar periods as Gregorian date ranges.
+
+Dates are stored Gregorian, so filtering by a Jalali day, month or year
+is a ``[start, end)`` range scan once the boundaries are known. The
+Gregorian start of every month of a Jalali year is computed once per
+year and cached; days, months, years and Gregorian-to-Jalali lookups are
+then arithmetic and a bisect on that table instead of fresh
+``JalaliDate`` conversions.
+
+Usage:
+    Sale.objects.in_jalali_month(1403, 12)
+    start, end = jalali_month_bounds(1403, 12)
+    parse_jalali_period("1403/12")   # admin search terms
+"""
+
+import re
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from django.db import models
+from django.utils import timezone
+from persiantools.jdatetime import JalaliDate
+
+# Years kept in the boundary table (one entry is 13 dates)
+YEAR_CACHE_SIZE = 256
+
+# Distinct dates kept for display formatting
+FORMAT_CACHE_SIZE = 4096
+
+# Gregorian year minus this is the Jalali year from Nowruz onwards
+_YEAR_OFFSET = 621
+
+_TERM = re.compile(r"^(\d{4})(?:[\/-](\d{1,2})(?:[\/-](\d{1,2}))?)?$")
+
+DateRange = Tuple[date, date]
+
+
+@lru_cache(maxsize=YEAR_CACHE_SIZE)
+def month_starts(year: int) -> Tuple[date, ...]:
+    """
+    Gregorian first day of each month of a Jalali year, plus the first day
+    of the next year (13 dates, so month ``m`` is ``[starts[m-1], starts[m])``).
+    """
+    first = JalaliDate(year, 1, 1).to_gregorian()
+    starts = [first]
+    for month in range(1, 13):
+        starts.append(
+            starts[-1] + timedelta(days=JalaliDate.days_in_month(month, year))
+        )
+    return tuple(starts)
+
+
+def jalali_year_bounds(year: int) -> DateRange:
+    starts = month_starts(year)
+    return starts[0], starts[12]
+
+
+def jalali_month_bounds(year: int, month: int) -> DateRange:
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid Jalali month: {month}")
+    starts = month_starts(year)
+    return starts[month - 1], starts[month]
+
+
+def jalali_day_bounds(year: int, month: int, day: int) -> DateRange:
+    start, end = jalali_month_bounds(year, month)
+    if not 1 <= day <= (end - start).days:
+        raise ValueError(f"Invalid Jalali day: {year}/{month}/{day}")
+    start += timedelta(days=day - 1)
+    return start, start + timedelta(days=1)
+
+
+def to_jalali(value: date) -> Tuple[int, int, int]:
+    """``(year, month, day)`` of a Gregorian date, read from the table."""
+    year = value.year - _YEAR_OFFSET
+    starts = month_starts(year)
+    if value < starts[0]:
+        year -= 1
+        starts = month_starts(year)
+    month = bisect_right(starts, value)
+    return year, month, (value - starts[month - 1]).days + 1
+
+
+def parse_jalali_period(term: str) -> Optional[DateRange]:
+    """
+    ``[start, end)`` of a ``YYYY``, ``YYYY/MM`` or ``YYYY/MM/DD`` Jalali term.
+
+    Returns ``None`` when the term is not a valid Jalali period, so admin
+    search can fall back to plain text search.
+    """
+    match = _TERM.match(term.strip())
+    if not match:
+        return None
+    year, month, day = (int(g) if g else None for g in match.groups())
+    try:
+        if month is None:
+            return jalali_year_bounds(year)
+        if day is None:
+            return jalali_month_bounds(year, month)
+        return jalali_day_bounds(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_jalali_date(value: date, fmt: str = "%c", locale: str = "fa") -> str:
+    """Cached ``JalaliDate(value).strftime``; meant for date (not datetime) fields."""
+    return JalaliDate(value).strftime(fmt, locale=locale)
+
+
+def clear_jalali_caches() -> None:
+    month_starts.cache_clear()
+    format_jalali_date.cache_clear()
+
+
+class JalaliQuerySetMixin:
+    """
+    ``in_jalali_*`` filters for querysets with a date or datetime column.
+
+    Subclasses set ``jalali_date_field``. Datetime columns are bounded at
+    local midnight, so every filter stays a range on the indexed column.
+    """
+
+    jalali_date_field: str = ""
+
+    def in_date_range(self, start: date, end: date):
+        """Rows on ``[start, end)`` Gregorian days."""
+        field = self.model._meta.get_field(self.jalali_date_field)
+        if isinstance(field, models.DateTimeField):
+            start, end = _local_midnight(start), _local_midnight(end)
+        return self.filter(
+            **{
+                f"{self.jalali_date_field}__gte": start,
+                f"{self.jalali_date_field}__lt": end,
+            }
+        )
+
+    def in_jalali_day(self, year: int, month: int, day: int):
+        return self.in_date_range(*jalali_day_bounds(year, month, day))
+
+    def in_jalali_month(self, year: int, month: int):
+        return self.in_date_range(*jalali_month_bounds(year, month))
+
+    def in_jalali_year(self, year: int):
+        return self.in_date_range(*jalali_year_bounds(year))
+
+
+class JalaliManagerMixin:
+    """Manager proxies for the ``JalaliQuerySetMixin`` filters."""
+
+    def in_date_range(self, start: date, end: date):
+        return self.get_queryset().in_date_range(start, end)
+
+    def in_jalali_day(self, year: int, month: int, day: int):
+        return self.get_queryset().in_jalali_day(year, month, day)
+
+    def in_jalali_month(self, year: int, month: int):
+        return self.get_queryset().in_jalali_month(year, month)
+
+    def in_jalali_year(self, year: int):
+        return self.get_queryset().in_jalali_year(year)
+
+
+def _local_midnight(value: date) -> datetime:
+    return timezone.make_aware(datetime.combine(value, time.min))
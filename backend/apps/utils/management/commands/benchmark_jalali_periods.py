@@ -0,0 +1,137 @@
+"""
+Compare per-call JalaliDate conversions with the cached period table.
+
+Usage:
+    python manage.py benchmark_jalali_periods
+    python manage.py benchmark_jalali_periods --years 5 --repeat 20
+    python manage.py benchmark_jalali_periods --explain   # show the query plan
+"""
+
+from datetime import date, timedelta
+from time import perf_counter
+
+from apps.inventory.models import PurchaseInvoice
+from apps.utils import jalali_period
+from django.core.management.base import BaseCommand
+from persiantools.jdatetime import JalaliDate
+
+
+def _legacy_bounds(year, month=None, day=None):
+    """Boundaries as the admin search computed them before the table."""
+    if month is None:
+        return (
+            JalaliDate(year, 1, 1).to_gregorian(),
+            JalaliDate(year + 1, 1, 1).to_gregorian(),
+        )
+    if day is None:
+        start = JalaliDate(year, month, 1).to_gregorian()
+        if month == 12:
+            return start, JalaliDate(year + 1, 1, 1).to_gregorian()
+        return start, JalaliDate(year, month + 1, 1).to_gregorian()
+    start = JalaliDate(year, month, day).to_gregorian()
+    return start, start + timedelta(days=1)
+
+
+def _legacy_to_jalali(value):
+    jalali = JalaliDate(value)
+    return jalali.year, jalali.month, jalali.day
+
+
+def _legacy_format(value):
+    return JalaliDate(value).strftime("%c", locale="fa")
+
+
+def _table_bounds(year, month=None, day=None):
+    if month is None:
+        return jalali_period.jalali_year_bounds(year)
+    if day is None:
+        return jalali_period.jalali_month_bounds(year, month)
+    return jalali_period.jalali_day_bounds(year, month, day)
+
+
+class Command(BaseCommand):
+    help = "Benchmark Jalali period boundaries, conversions and formatting."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--years",
+            type=int,
+            default=3,
+            help="Jalali years of days to convert (ending with the current one).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=10,
+            help="Passes over the data per mode.",
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the query plan of a Jalali month filter.",
+        )
+
+    def handle(self, *args, years, repeat, explain, **options):
+        this_year = JalaliDate.today().year
+        year_list = range(this_year - years + 1, this_year + 1)
+        periods = [(y,) for y in year_list]
+        periods += [(y, m) for y in year_list for m in range(1, 13)]
+        periods += [(y, m, 1 + (m * 7) % 28) for y in year_list for m in range(1, 13)]
+
+        start = jalali_period.jalali_year_bounds(year_list[0])[0]
+        end = jalali_period.jalali_year_bounds(year_list[-1])[1]
+        days = [start + timedelta(days=i) for i in range((end - start).days)]
+
+        assert [_legacy_bounds(*p) for p in periods] == [
+            _table_bounds(*p) for p in periods
+        ]
+        assert [_legacy_to_jalali(d) for d in days] == [
+            jalali_period.to_jalali(d) for d in days
+        ]
+
+        jalali_period.clear_jalali_caches()
+        self._compare(
+            f"period bounds ({len(periods)} periods)",
+            lambda: [_legacy_bounds(*p) for p in periods],
+            lambda: [_table_bounds(*p) for p in periods],
+            repeat,
+        )
+        self._compare(
+            f"gregorian -> jalali ({len(days)} days)",
+            lambda: [_legacy_to_jalali(d) for d in days],
+            lambda: [jalali_period.to_jalali(d) for d in days],
+            repeat,
+        )
+        # A report list page: the same 30 dates rendered on every request
+        page = days[-30:]
+        self._compare(
+            "list page date labels (30 rows)",
+            lambda: [_legacy_format(d) for d in page],
+            lambda: [jalali_period.format_jalali_date(d) for d in page],
+            repeat * 10,
+        )
+
+        info = jalali_period.month_starts.cache_info()
+        self.stdout.write(f"year table: {info.currsize} years cached")
+
+        if explain:
+            year, month, _day = jalali_period.to_jalali(date.today())
+            self.stdout.write(
+                PurchaseInvoice.objects.in_jalali_month(year, month).explain()
+            )
+
+    def _compare(self, label, legacy, cached, repeat):
+        before = self._time(legacy, repeat)
+        after = self._time(cached, repeat)
+        self.stdout.write(
+            f"{label}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms per pass"
+        )
+        if after:
+            self.stdout.write(self.style.SUCCESS(f"  speedup: {before / after:.1f}x"))
+
+    @staticmethod
+    def _time(func, repeat) -> float:
+        started = perf_counter()
+        for _ in range(repeat):
+            func()
+        return (perf_counter() - started) / repeat
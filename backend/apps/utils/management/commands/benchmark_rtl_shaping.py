@@ -0,0 +1,69 @@
+"""
+Measure RTL shaping cost per menu render, with and without the cache.
+
+Usage:
+    python manage.py benchmark_rtl_shaping               # current menu strings
+    python manage.py benchmark_rtl_shaping --renders 500
+"""
+
+from time import perf_counter
+
+from apps.menu.services.menu_pdf import MenuPdfService
+from apps.utils import rtl
+from django.core.management.base import BaseCommand
+
+# Used when the menu is empty, so the benchmark still means something
+SAMPLE_STRINGS = (
+    "کافه چینو",
+    "قهوه",
+    "اسپرسو دبل",
+    "کاپوچینو با شیر بادام",
+    "کیک شکلاتی خانگی",
+    "چای ماسالا",
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-render RTL shaping cost before and after memoization."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--renders",
+            type=int,
+            default=200,
+            help="Number of simulated renders per mode.",
+        )
+
+    def handle(self, *args, renders, **options):
+        strings = self._menu_strings() or list(SAMPLE_STRINGS)
+
+        uncached = self._per_render(rtl._shape.__wrapped__, strings, renders)
+
+        rtl.clear_shape_rtl_cache()
+        cached = self._per_render(rtl.shape_rtl, strings, renders)
+        info = rtl.shape_rtl_cache_info()
+
+        self.stdout.write(f"{len(strings)} strings per render, {renders} renders")
+        self.stdout.write(f"uncached: {uncached * 1000:.3f} ms/render")
+        self.stdout.write(f"cached:   {cached * 1000:.3f} ms/render")
+        self.stdout.write(
+            f"cache: hits={info.hits} misses={info.misses} "
+            f"size={info.currsize}/{info.maxsize}"
+        )
+        if cached:
+            self.stdout.write(self.style.SUCCESS(f"speedup: {uncached / cached:.1f}x"))
+
+    @staticmethod
+    def _menu_strings():
+        categories, items = MenuPdfService._snapshot()
+        strings = [t for _, title, desc in categories for t in (title, desc)]
+        strings += [t for _, name, desc in items for t in (name, desc)]
+        return [s for s in strings if s]
+
+    @staticmethod
+    def _per_render(shape, strings, renders) -> float:
+        started = perf_counter()
+        for _ in range(renders):
+            for text in strings:
+                shape(text)
+        return (perf_counter() - started) / renders
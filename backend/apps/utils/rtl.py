@@ -0,0 +1,37 @@
+"""
+RTL (Persian) text shaping for ReportLab output.
+
+ReportLab draws glyphs left-to-right without joining, so Persian text has
+to be reshaped into presentation forms and reordered by the bidi algorithm
+before it is drawn. Both steps are pure and relatively slow, while the
+strings (product names, category titles) repeat on every render, so results
+are kept in a bounded per-process LRU cache.
+"""
+
+from functools import lru_cache
+
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+SHAPE_CACHE_SIZE = 4096
+
+
+def shape_rtl(text: str) -> str:
+    """Return ``text`` ready to draw right-to-left; ``""`` for empty input."""
+    if not text:
+        return ""
+    return _shape(text)
+
+
+def shape_rtl_cache_info():
+    """``functools`` cache statistics: hits, misses, maxsize, currsize."""
+    return _shape.cache_info()
+
+
+def clear_shape_rtl_cache() -> None:
+    _shape.cache_clear()
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def _shape(text: str) -> str:
+    return get_display(arabic_reshaper.reshape(text))
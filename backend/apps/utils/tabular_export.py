@@ -0,0 +1,166 @@
+"""
+Streaming CSV / XLSX writers for tabular exports.
+
+Both take a header and an iterable of rows and yield the file piece by
+piece, so a ``StreamingHttpResponse`` can send a year of report rows
+without holding the whole file in memory.
+
+XLSX is written with ``zipfile`` directly (inline strings, no styles):
+a zip written to an unseekable sink puts sizes in data descriptors, so
+every compressed chunk can be sent as soon as it is produced.
+"""
+
+import csv
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+# Rows buffered before a chunk is handed to the response
+ROWS_PER_CHUNK = 200
+
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """CSV lines; starts with a BOM so Excel reads Persian text as UTF-8."""
+    buffer = _Sink()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield "\ufeff" + buffer.drain_text()
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % ROWS_PER_CHUNK == 0:
+            yield buffer.drain_text()
+    tail = buffer.drain_text()
+    if tail:
+        yield tail
+
+
+def stream_xlsx(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    sheet_name: str = "Report",
+) -> Iterator[bytes]:
+    """A single-sheet workbook; numbers stay numeric, everything else is text."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as xlsx:
+        for name, content in _static_parts(sheet_name):
+            xlsx.writestr(name, content)
+        yield sink.drain()
+
+        with xlsx.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD)
+            sheet.write(_row_xml(1, header))
+            for index, row in enumerate(rows, start=2):
+                sheet.write(_row_xml(index, row))
+                if index % ROWS_PER_CHUNK == 0:
+                    yield sink.drain()
+            sheet.write(_SHEET_TAIL)
+    yield sink.drain()
+
+
+# ---------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------
+
+
+class _Sink:
+    """Write-only, unseekable buffer that hands out what was written so far."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+    def drain_text(self) -> str:
+        data = "".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+_SHEET_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    b"<sheetData>"
+)
+_SHEET_TAIL = b"</sheetData></worksheet>"
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell_xml(ref: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = str(value)
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return f'<c r="{ref}" t="inlineStr"><is><t>{escape(str(value))}</t></is></c>'
+
+
+def _row_xml(number: int, values: Sequence[Any]) -> bytes:
+    cells = "".join(
+        _cell_xml(f"{_column_letter(column)}{number}", value)
+        for column, value in enumerate(values)
+    )
+    return f'<row r="{number}">{cells}</row>'.encode()
+
+
+def _static_parts(sheet_name: str):
+    yield "[Content_Types].xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    )
+    yield "_rels/.rels", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        "openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+        '" Target="xl/workbook.xml"/></Relationships>'
+    )
+    yield "xl/workbook.xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships"><sheets>'
+        f'<sheet name="{escape(sheet_name[:31])}" sheetId="1" r:id="rId1"/>'
+        "</sheets></workbook>"
+    )
+    yield "xl/_rels/workbook.xml.rels", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        "openxmlformats.org/officeDocument/2006/relationships/worksheet"
+        '" Target="worksheets/sheet1.xml"/></Relationships>'
+    )
@@ -0,0 +1,132 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+from apps.inventory.models import PurchaseInvoice
+from apps.inventory.tests.factories import PurchaseInvoiceFactory
+from apps.sale.models import DailyReport, Sale
+from apps.user.tests.factories import AccountFactory
+from apps.utils.jalali_date_list_filter import JalaliDateFieldListFilter
+from apps.utils.jalali_period import (
+    clear_jalali_caches,
+    format_jalali_date,
+    jalali_day_bounds,
+    jalali_month_bounds,
+    jalali_year_bounds,
+    month_starts,
+    parse_jalali_period,
+    to_jalali,
+)
+from django.utils import timezone
+from persiantools.jdatetime import JalaliDate
+
+
+class TestBoundaries:
+    def setup_method(self):
+        clear_jalali_caches()
+
+    def test_esfand_length_follows_leap_years(self):
+        assert jalali_month_bounds(1403, 12) == (date(2025, 2, 19), date(2025, 3, 21))
+        assert jalali_month_bounds(1402, 12) == (date(2024, 2, 20), date(2024, 3, 20))
+
+    def test_year_and_day(self):
+        assert jalali_year_bounds(1403) == (date(2024, 3, 20), date(2025, 3, 21))
+        assert jalali_day_bounds(1403, 12, 30) == (date(2025, 3, 20), date(2025, 3, 21))
+
+    def test_invalid_periods(self):
+        with pytest.raises(ValueError):
+            jalali_month_bounds(1403, 13)
+        with pytest.raises(ValueError):
+            jalali_day_bounds(1404, 12, 30)
+
+    def test_to_jalali_matches_persiantools(self):
+        day = date(2023, 1, 1)
+        while day < date(2026, 1, 1):
+            jalali = JalaliDate(day)
+            assert to_jalali(day) == (jalali.year, jalali.month, jalali.day)
+            day += timedelta(days=1)
+
+    def test_years_are_computed_once(self):
+        for month in range(1, 13):
+            jalali_month_bounds(1403, month)
+
+        info = month_starts.cache_info()
+        assert (info.misses, info.hits) == (1, 11)
+
+    @pytest.mark.parametrize(
+        "term, expected",
+        [
+            ("1403", (date(2024, 3, 20), date(2025, 3, 21))),
+            (" 1403/12 ", (date(2025, 2, 19), date(2025, 3, 21))),
+            ("1403-1-1", (date(2024, 3, 20), date(2024, 3, 21))),
+            ("1403/13", None),
+            ("1404/12/30", None),
+            ("coffee", None),
+        ],
+    )
+    def test_parse_search_terms(self, term, expected):
+        assert parse_jalali_period(term) == expected
+
+    def test_format_matches_persiantools(self):
+        day = date(2025, 3, 10)
+
+        assert format_jalali_date(day) == JalaliDate(day).strftime("%c", locale="fa")
+        format_jalali_date(day)
+        assert format_jalali_date.cache_info().hits == 1
+
+
+@pytest.mark.django_db
+class TestJalaliQuerySets:
+    def test_date_column(self):
+        inside = PurchaseInvoiceFactory(issue_date=date(2025, 2, 19))
+        PurchaseInvoiceFactory(issue_date=date(2025, 2, 18))
+        PurchaseInvoiceFactory(issue_date=date(2025, 3, 21))
+
+        assert list(PurchaseInvoice.objects.in_jalali_month(1403, 12)) == [inside]
+
+    def test_datetime_column_uses_local_midnight(self):
+        staff = AccountFactory(is_staff=True)
+
+        def sale_at(day, hour):
+            return Sale.objects.create(
+                opened_by=staff,
+                sale_type=Sale.SaleType.TAKEAWAY,
+                subtotal_amount=Decimal("10"),
+                opened_at=timezone.make_aware(datetime.combine(day, time(hour))),
+            )
+
+        first = sale_at(date(2025, 3, 20), 0)
+        last = sale_at(date(2025, 3, 20), 23)
+        sale_at(date(2025, 3, 21), 0)
+
+        assert set(Sale.objects.in_jalali_day(1403, 12, 30)) == {first, last}
+        open_sales = Sale.objects.filter(state=Sale.SaleState.OPEN)
+        assert open_sales.in_jalali_year(1403).count() == 2
+
+    def test_list_filter_for_field(self):
+        year, month, _day = to_jalali(date.today())
+        start, _end = jalali_month_bounds(year, month)
+        report = DailyReport.objects.create(
+            report_date=start,
+            created_by=AccountFactory(is_staff=True),
+            expected_total_sales=0,
+            expected_total_discounts=0,
+            expected_total_tax=0,
+            cost_of_goods_sold=0,
+            total_expenses=0,
+        )
+        DailyReport.objects.create(
+            report_date=start - timedelta(days=1),
+            created_by=report.created_by,
+            expected_total_sales=0,
+            expected_total_discounts=0,
+            expected_total_tax=0,
+            cost_of_goods_sold=0,
+            total_expenses=0,
+        )
+        list_filter = JalaliDateFieldListFilter.for_field("report_date")(
+            None, {"jalali_date": ["this_month"]}, DailyReport, None
+        )
+
+        assert list(list_filter.queryset(None, DailyReport.objects.all())) == [report]
+        assert list(DailyReport.objects.in_jalali_month(year, month)) == [report]
@@ -0,0 +1,25 @@
+import arabic_reshaper
+from apps.utils.rtl import clear_shape_rtl_cache, shape_rtl, shape_rtl_cache_info
+from bidi.algorithm import get_display
+
+
+class TestShapeRtl:
+    def setup_method(self):
+        clear_shape_rtl_cache()
+
+    def test_matches_uncached_shaping(self):
+        text = "کاپوچینو با شیر بادام"
+
+        assert shape_rtl(text) == get_display(arabic_reshaper.reshape(text))
+
+    def test_repeated_strings_hit_cache(self):
+        for _ in range(3):
+            shape_rtl("قهوه")
+
+        info = shape_rtl_cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+    def test_empty_input_skips_cache(self):
+        assert shape_rtl("") == ""
+        assert shape_rtl(None) == ""
+        assert shape_rtl_cache_info().misses == 0
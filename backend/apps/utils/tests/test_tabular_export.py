@@ -0,0 +1,70 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+from xml.etree import ElementTree
+
+from apps.utils import tabular_export
+from apps.utils.tabular_export import stream_csv, stream_xlsx
+
+NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _rows(count):
+    return ([i, f"قهوه <{i}> & شیر", Decimal("1.25") * i, None] for i in range(count))
+
+
+class TestStreamCsv:
+    def test_round_trip(self):
+        content = "".join(stream_csv(["n", "name"], [[1, "a,b"], [2, 'say "hi"']]))
+
+        assert content.startswith("﻿")
+        assert list(csv.reader(io.StringIO(content.lstrip("﻿")))) == [
+            ["n", "name"],
+            ["1", "a,b"],
+            ["2", 'say "hi"'],
+        ]
+
+    def test_yields_in_chunks(self, monkeypatch):
+        monkeypatch.setattr(tabular_export, "ROWS_PER_CHUNK", 10)
+
+        chunks = list(stream_csv(["n"], ([i] for i in range(25))))
+
+        assert len(chunks) == 4
+
+
+class TestStreamXlsx:
+    def _sheet(self, data):
+        workbook = zipfile.ZipFile(io.BytesIO(data))
+        assert workbook.testzip() is None
+        return ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+
+    def test_cells(self):
+        data = b"".join(
+            stream_xlsx(["n", "name", "amount", "empty"], _rows(3), sheet_name="Mar")
+        )
+
+        rows = self._sheet(data).findall("x:sheetData/x:row", NS)
+        assert len(rows) == 4
+        number, text, amount = rows[2].findall("x:c", NS)
+        assert (number.get("r"), number.find("x:v", NS).text) == ("A3", "1")
+        assert text.get("t") == "inlineStr"
+        assert text.find("x:is/x:t", NS).text == "قهوه <1> & شیر"
+        assert amount.find("x:v", NS).text == "1.25"
+
+    def test_streams_large_sheets(self, monkeypatch):
+        monkeypatch.setattr(tabular_export, "ROWS_PER_CHUNK", 100)
+
+        chunks = list(stream_xlsx(["n", "name", "amount", "empty"], _rows(1000)))
+
+        assert len(chunks) > 10
+        assert len(self._sheet(b"".join(chunks)).findall("x:sheetData/x:row", NS)) == (
+            1001
+        )
+
+    def test_dates_are_text(self):
+        data = b"".join(stream_xlsx(["day"], [[date(2025, 3, 10)]]))
+
+        cell = self._sheet(data).find("x:sheetData/x:row[2]/x:c", NS)
+        assert cell.find("x:is/x:t", NS).text == "2025-03-10"
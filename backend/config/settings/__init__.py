@@ -1,5 +1,6 @@
 from .apps import *  # noqa: F403
 from .base import *  # noqa: F403
+from .cache import *  # noqa: F403
 from .database import *  # noqa: F403
 from .i18n import *  # noqa: F403
 from .jalali import *  # noqa: F403
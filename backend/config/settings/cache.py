@@ -0,0 +1,15 @@
+from .base import env
+
+# Defaults to per-process memory; set CACHE_URL (e.g. redis://redis:6379/1)
+# so every worker shares derived data and its invalidation stamps.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+# Whether every worker sees the same entries and invalidation stamps
+SHARED_CACHE = not CACHES["default"]["BACKEND"].endswith(("LocMemCache", "DummyCache"))
+
+# Caching the authenticated principal is only safe when every worker sees
+# the same invalidations; a per-process cache would keep a deactivated
+# user signed in on the workers that did not handle the change.
+PRINCIPAL_CACHE_ENABLED = env.bool("PRINCIPAL_CACHE_ENABLED", default=SHARED_CACHE)
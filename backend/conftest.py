@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Cached derived data must not leak between tests."""
+    cache.clear()
+    yield
+    cache.clear()
@@ -12,6 +12,7 @@ import { CS_API_URL } from '@/libs/constants';
 
 export interface PrintJobCreateRequest {
   sale_id?: number;
+  printer_target: 'BAR' | 'KITCHEN';
   print_type: 'STANDARD' | 'EDIT_DIFF';
   print_data: any; // PrintSaleData or PrintEditData
 }
@@ -734,6 +734,7 @@ export async function queueReceipt(data: PrintSaleData, saleId?: number): Promis
 
     await addPrintJob({
       sale_id: saleId,
+      printer_target: 'BAR',
       print_type: 'STANDARD',
       print_data: data,
     });
@@ -756,6 +757,7 @@ export async function queueEditReceipt(data: PrintEditData, saleId?: number): Pr
 
     await addPrintJob({
       sale_id: saleId,
+      printer_target: 'BAR',
       print_type: 'EDIT_DIFF',
       print_data: data,
     });